@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2013-2016, Sebastian Linke
+
+# Released under the Simplified BSD license
+# (see LICENSE file for details).
+
+"""
+Benchmarks for `shcol`. Each module in this package can be run on its own via
+``python -m benchmarks.<name>`` and writes its results as JSON to stdout.
+"""
+
+import gc
+import json
+import sys
+import time
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+def measure(func, *args, **kwargs):
+    """
+    Call `func` with given arguments and return a 3-element tuple consisting of
+    the call's result, the elapsed wall time in seconds and the peak number of
+    bytes that were allocated during the call (or `None` if `tracemalloc` is
+    not available).
+
+    Note that tracing memory allocations slows down the call. Use `timed()` if
+    you only need the elapsed time.
+    """
+    if tracemalloc is None:
+        result, elapsed = timed(func, *args, **kwargs)
+        return result, elapsed, None
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result, elapsed = timed(func, *args, **kwargs)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+def timed(func, *args, **kwargs):
+    """
+    Call `func` with given arguments and return a tuple of the call's result
+    and the elapsed wall time in seconds.
+    """
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+def get_median(values):
+    """
+    Return the median of the numbers in `values`.
+    """
+    values = sorted(values)
+    middle = len(values) // 2
+    if len(values) % 2:
+        return values[middle]
+    return (values[middle - 1] + values[middle]) / 2.0
+
+def emit(results, stream=sys.stdout):
+    """
+    Write `results` as JSON to `stream`.
+    """
+    json.dump(results, stream, indent=2, sort_keys=True)
+    stream.write('\n')
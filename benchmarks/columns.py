@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2013-2016, Sebastian Linke
+
+# Released under the Simplified BSD license
+# (see LICENSE file for details).
+
+"""
+Compare extracting several columns from wide log lines with one pass per
+column (`helpers.get_column()`) to extracting them in a single pass
+(`helpers.get_columns()`).
+
+Usage: python -m benchmarks.columns [NUM_LINES]
+"""
+
+import sys
+
+from shcol import helpers
+
+from . import emit, timed
+
+NUM_FIELDS = 30
+INDICES = (0, 7, 19)
+
+def make_lines(num_lines, sep):
+    return [
+        sep.join(
+            'f{}-{:x}'.format(field, line * 2654435761 + field)
+            for field in range(NUM_FIELDS)
+        )
+        for line in range(num_lines)
+    ]
+
+def extract_per_column(lines, sep):
+    columns = [list(helpers.get_column(i, lines, sep)) for i in INDICES]
+    return list(zip(*columns))
+
+def extract_at_once(lines, sep):
+    return list(helpers.get_columns(INDICES, lines, sep))
+
+def run(num_lines, repeat=3):
+    results = []
+    for sep_name, sep in [('whitespace', None), ('comma', ',')]:
+        lines = make_lines(num_lines, sep or ' ')
+        for name, func in [
+            ('per-column', extract_per_column), ('at-once', extract_at_once)
+        ]:
+            timings = [timed(func, lines, sep)[1] for _ in range(repeat)]
+            results.append({
+                'extractor': name,
+                'separator': sep_name,
+                'num_lines': num_lines,
+                'num_columns': len(INDICES),
+                'best_seconds': min(timings),
+            })
+    return results
+
+def main(args=None):
+    args = sys.argv[1:] if args is None else args
+    num_lines = helpers.num(args[0]) if args else 200000
+    emit(run(num_lines))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2013-2016, Sebastian Linke
+
+# Released under the Simplified BSD license
+# (see LICENSE file for details).
+
+"""
+Reproducible synthetic inputs for the benchmarks. Each corpus is generated by
+a seeded random number generator, so the same name, size and seed always give
+the same items.
+"""
+
+import collections
+import random
+import string
+import uuid
+
+PROGRAM_STEMS = [
+    'git', 'python', 'gcc', 'ls', 'grep', 'ssh', 'tar', 'x86_64-linux-gnu',
+    'perl', 'systemd', 'lib', 'dpkg', 'apt', 'gpg', 'node', 'vim', 'zip',
+]
+PROGRAM_SUFFIXES = [
+    '', '', '', '3', '3.11', '-config', '-keygen', '-dump', '-ar', '-nm',
+    '-analyze', '.sh', '-query',
+]
+# Latin with diacritics, Greek, Cyrillic, CJK and Hangul
+UNICODE_ALPHABET = (
+    'äöüßéèêñçåø' 'αβγδεζηθλμπσω' 'абвгдежзийклмн' '日本語漢字中文表示幅'
+    '가나다라마바사'
+)
+
+def make_usr_bin(rng, size):
+    # Short names with common stems, much like the contents of /usr/bin
+    return [
+        '{}{}'.format(rng.choice(PROGRAM_STEMS), rng.choice(PROGRAM_SUFFIXES))
+        + ('' if rng.random() < .7 else '-{}'.format(rng.randrange(100)))
+        for _ in range(size)
+    ]
+
+def make_uuids(rng, size):
+    # Items of equal width
+    return [str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(size)]
+
+def make_long_tail(rng, size):
+    # Mostly short items and a few very long ones
+    alphabet = string.ascii_lowercase
+    return [
+        ''.join(
+            rng.choice(alphabet)
+            for _ in range(min(100, int(rng.paretovariate(1.2) * 4)))
+        )
+        for _ in range(size)
+    ]
+
+def make_unicode(rng, size):
+    return [
+        ''.join(
+            rng.choice(UNICODE_ALPHABET) for _ in range(rng.randint(1, 12))
+        )
+        for _ in range(size)
+    ]
+
+def make_wide_mapping(rng, size):
+    # Short keys with long values (like environment variables)
+    items = collections.OrderedDict()
+    for i in range(size):
+        key = 'VAR_{:x}'.format(rng.getrandbits(32) ^ i)
+        items[key] = '/'.join(
+            'dir{}'.format(rng.randrange(1000))
+            for _ in range(rng.randint(3, 15))
+        )
+    return items
+
+CORPORA = collections.OrderedDict([
+    ('usr-bin', make_usr_bin),
+    ('uuids', make_uuids),
+    ('long-tail', make_long_tail),
+    ('unicode', make_unicode),
+    ('wide-mapping', make_wide_mapping),
+])
+
+def make_corpus(name, size, seed=0):
+    """
+    Return `size` items of the corpus `name`. The "wide-mapping"-corpus is
+    returned as a mapping, all others as a list of strings.
+    """
+    return CORPORA[name](random.Random(seed), size)
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2013-2016, Sebastian Linke
+
+# Released under the Simplified BSD license
+# (see LICENSE file for details).
+
+"""
+Compare the latency of a cold ``python -m shcol`` with running ``bin/shcol``
+as a client of a daemon started via ``shcol --serve``. The startup time of a
+bare interpreter is included as the lower bound.
+
+Usage: python -m benchmarks.daemon [NUM_RUNS]
+
+The default is 20 runs per scenario. The median of all runs is reported.
+"""
+
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+from shcol import client, config, helpers
+
+from . import emit, get_median, timed
+
+ITEMS = ['item-{}'.format(i) for i in range(50)]
+
+def time_command(args, env, num_runs):
+    timings = []
+    for _ in range(num_runs):
+        _, elapsed = timed(
+            subprocess.check_call, args, env=env, stdout=subprocess.PIPE
+        )
+        timings.append(elapsed)
+    return get_median(timings)
+
+def wait_for_daemon(socket_path, timeout=10):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        sock = client.connect(socket_path)
+        if sock is not None:
+            sock.close()
+            return
+        time.sleep(.05)
+    raise RuntimeError('daemon did not start')
+
+def run(num_runs):
+    directory = tempfile.mkdtemp(prefix='shcol-bench-')
+    socket_path = os.path.join(directory, 'shcol.sock')
+    env = dict(os.environ, SHCOL_SOCKET=socket_path)
+    args = ['-w80'] + ITEMS
+    results = {
+        'num_runs': num_runs,
+        'python_startup_seconds': time_command(
+            [sys.executable, '-c', 'pass'], env, num_runs
+        ),
+        'cold_module_seconds': time_command(
+            [sys.executable, '-m', 'shcol'] + args, env, num_runs
+        ),
+    }
+    daemon = subprocess.Popen(
+        [sys.executable, '-m', 'shcol', '--serve'], env=env
+    )
+    try:
+        wait_for_daemon(socket_path)
+        results['client_seconds'] = time_command(
+            [sys.executable, config.STARTER] + args, env, num_runs
+        )
+    finally:
+        daemon.send_signal(signal.SIGINT)
+        daemon.wait()
+        shutil.rmtree(directory)
+    return results
+
+def main(args=None):
+    args = sys.argv[1:] if args is None else args
+    num_runs = helpers.num(args[0]) if args else 20
+    emit(run(num_runs))
+
+if __name__ == '__main__':
+    main()
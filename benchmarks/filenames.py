@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2013-2016, Sebastian Linke
+
+# Released under the Simplified BSD license
+# (see LICENSE file for details).
+
+"""
+Compare directory listing via `helpers.get_filenames()` with the former
+`glob`-based implementation.
+
+Usage: python -m benchmarks.filenames [NUM_FILES]
+"""
+
+import glob
+import os
+import shutil
+import sys
+import tempfile
+
+from shcol import helpers
+
+from . import emit, timed
+
+def make_directory(num_files, num_dirs=None):
+    if num_dirs is None:
+        num_dirs = max(1, num_files // 10)
+    path = tempfile.mkdtemp(prefix='shcol-bench-')
+    for i in range(num_files):
+        open(os.path.join(path, 'file-{:08d}.txt'.format(i)), 'w').close()
+    for i in range(num_dirs):
+        os.mkdir(os.path.join(path, 'dir-{:08d}'.format(i)))
+    return path
+
+def glob_filenames(path):
+    pattern = os.path.join(path, '*')
+    return [
+        os.path.basename(fn.rstrip(os.sep)) for fn in glob.iglob(pattern)
+    ]
+
+def run(num_files, repeat=5):
+    path = make_directory(num_files)
+    try:
+        scenarios = [
+            ('glob', lambda: glob_filenames(path)),
+            ('listdir', lambda: list(helpers.get_filenames(path))),
+            ('listdir-hide-dotted', lambda: list(
+                helpers.get_filenames(path, hide_dotted=True)
+            )),
+            ('scandir-dir-suffix', lambda: list(
+                helpers.get_filenames(path, dir_suffix='/')
+            )),
+        ]
+        results = []
+        for name, func in scenarios:
+            timings = [timed(func)[1] for _ in range(repeat)]
+            results.append({
+                'engine': name,
+                'num_entries': len(os.listdir(path)),
+                'best_seconds': min(timings),
+            })
+        return results
+    finally:
+        shutil.rmtree(path)
+
+def main(args=None):
+    args = sys.argv[1:] if args is None else args
+    num_files = helpers.num(args[0]) if args else 100000
+    emit(run(num_files))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2013-2016, Sebastian Linke
+
+# Released under the Simplified BSD license
+# (see LICENSE file for details).
+
+"""
+Compare the scenarios of `benchmarks.suite` with the baseline stored in
+``benchmarks/baseline.json`` and fail if one of them got slower.
+
+Usage: python -m benchmarks.gate [--ops] [--update] [--baseline FILE]
+                                 [--repeat N]
+
+Timings are compared by their median of N runs (7 by default). A scenario
+fails if its median exceeds the baseline by more than the scenario's
+tolerance (see `TOLERANCES`). Timings depend on the machine, so the baseline
+should be updated via ``--update`` on the machine that runs the gate.
+
+With ``--ops``, the number of calls to `get_unchecked_column_config()` and to
+`max()` made by the column calculator are compared instead. These counts do not
+depend on the machine and must not exceed the baseline at all.
+
+The exit code is 1 if a scenario failed and 0 otherwise. The comparison is
+written as JSON to stdout.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+
+from shcol import helpers
+from shcol.core import columncalc
+
+from . import emit, get_median, suite
+from .corpora import make_corpus
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+GATE_SIZES = [1000, 10000]
+OPS_SIZES = [10, 1000, 100000]
+
+DEFAULT_TOLERANCE = .3
+TOLERANCES = {
+    'cli_file': .5,
+    'get_filenames': 1.0,
+}
+# Timings below a millisecond are dominated by noise
+MIN_SLACK_SECONDS = .001
+
+def get_key(scenario_name, corpus_name, size):
+    return '{}/{}/{}'.format(scenario_name, corpus_name, size)
+
+def measure_timings(repeat):
+    timings = {}
+    for scenario, corpus_name, size in suite.iter_cases(sizes=GATE_SIZES):
+        runs = suite.run_case(scenario, corpus_name, size, repeat)
+        key = get_key(scenario.name, corpus_name, size)
+        timings[key] = get_median(runs)
+    return timings
+
+
+class OperationCounter(object):
+    """
+    Count the calls made by `columncalc.ColumnWidthCalculator` to
+    `get_unchecked_column_config()` and to the built-in `max()`-function while
+    the counter is installed.
+    """
+    def __init__(self):
+        self.counts = dict.fromkeys(['get_unchecked_column_config', 'max'], 0)
+
+    def counting_max(self, *args, **kwargs):
+        self.counts['max'] += 1
+        return max(*args, **kwargs)
+
+    @contextlib.contextmanager
+    def installed(self):
+        cls = columncalc.ColumnWidthCalculator
+        get_config = cls.get_unchecked_column_config
+        def counting_get_config(item_widths, max_columns):
+            self.counts['get_unchecked_column_config'] += 1
+            return get_config(item_widths, max_columns)
+        cls.get_unchecked_column_config = staticmethod(counting_get_config)
+        # A module-level name shadows the built-in function
+        columncalc.max = self.counting_max
+        try:
+            yield self
+        finally:
+            cls.get_unchecked_column_config = staticmethod(get_config)
+            del columncalc.max
+
+def count_operations(sizes=OPS_SIZES):
+    """
+    Return the operation counts of the "calculate_columns"-scenario for each
+    corpus and each of the given `sizes`.
+    """
+    operations = {}
+    for scenario, corpus_name, size in suite.iter_cases(
+        ['calculate_columns'], sizes=sizes
+    ):
+        calculator = columncalc.ColumnWidthCalculator(
+            line_width=suite.LINE_WIDTH, allow_exceeding=True
+        )
+        item_widths = helpers.get_item_widths(make_corpus(corpus_name, size))
+        with OperationCounter().installed() as counter:
+            calculator.calculate_columns(item_widths)
+        key = get_key(scenario.name, corpus_name, size)
+        operations[key] = counter.counts
+    return operations
+
+def compare_timings(timings, baseline):
+    results = []
+    for key, median in sorted(timings.items()):
+        expected = baseline.get(key)
+        result = {'key': key, 'median_seconds': median}
+        if expected is None:
+            result['status'] = 'new'
+        else:
+            tolerance = TOLERANCES.get(key.split('/')[0], DEFAULT_TOLERANCE)
+            limit = max(
+                expected * (1 + tolerance), expected + MIN_SLACK_SECONDS
+            )
+            result['baseline_seconds'] = expected
+            result['limit_seconds'] = limit
+            result['status'] = 'ok' if median <= limit else 'regressed'
+        results.append(result)
+    return results
+
+def compare_operations(operations, baseline):
+    results = []
+    for key, counts in sorted(operations.items()):
+        expected = baseline.get(key)
+        result = {'key': key, 'counts': counts}
+        if expected is None:
+            result['status'] = 'new'
+        else:
+            result['baseline_counts'] = expected
+            regressed = any(
+                counts[name] > expected.get(name, 0) for name in counts
+            )
+            result['status'] = 'regressed' if regressed else 'ok'
+        results.append(result)
+    return results
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as stream:
+        return json.load(stream)
+
+def save_baseline(baseline, path):
+    with open(path, 'w') as stream:
+        emit(baseline, stream)
+
+def parse_args(args):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.gate')
+    parser.add_argument('--ops', action='store_true')
+    parser.add_argument('--update', action='store_true')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--repeat', type=helpers.num, default=7)
+    return parser.parse_args(args)
+
+def main(args=None):
+    args = parse_args(sys.argv[1:] if args is None else args)
+    baseline = load_baseline(args.baseline)
+    if args.ops:
+        section, values = 'operations', count_operations()
+        results = compare_operations(values, baseline.get(section, {}))
+    else:
+        section, values = 'timings', measure_timings(args.repeat)
+        results = compare_timings(values, baseline.get(section, {}))
+    if args.update:
+        baseline[section] = values
+        save_baseline(baseline, args.baseline)
+    emit(results)
+    if not args.update:
+        if any(result['status'] == 'regressed' for result in results):
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
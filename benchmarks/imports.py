@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2013-2016, Sebastian Linke
+
+# Released under the Simplified BSD license
+# (see LICENSE file for details).
+
+"""
+Measure the time spent on imports for ``import shcol`` and for a short run of
+the command-line interface via ``python -X importtime`` (Python 3.7 or newer).
+Imports done at interpreter startup are not counted.
+
+Each scenario has a budget in microseconds (see `BUDGETS`). The exit code is 1
+if the median of all runs exceeds a budget.
+
+Usage: python -m benchmarks.imports [NUM_RUNS]
+
+The default is 5 runs per scenario.
+"""
+
+import os
+import subprocess
+import sys
+
+import shcol
+from shcol import helpers
+
+from . import emit, get_median
+
+SCENARIOS = [
+    ('import', 'import shcol'),
+    ('cli_startup', 'import shcol; shcol.cli.main(["-w80", "spam", "ham"])'),
+]
+BUDGETS = {
+    'import': 25000,
+    'cli_startup': 60000,
+}
+
+def get_env():
+    package_dir = os.path.dirname(os.path.dirname(shcol.__file__))
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        [package_dir] + env.get('PYTHONPATH', '').split(os.pathsep)
+    )
+    return env
+
+def get_import_times(code):
+    """
+    Return a list of `(module_name, cumulative_time, is_toplevel)`-tuples for
+    the imports reported by running `code` with ``-X importtime``.
+    """
+    stderr = subprocess.check_output(
+        [sys.executable, '-X', 'importtime', '-c', code], env=get_env(),
+        stderr=subprocess.STDOUT, universal_newlines=True
+    )
+    import_times = []
+    for line in stderr.splitlines():
+        fields = line.split('|')
+        if not line.startswith('import time:') or len(fields) != 3:
+            continue
+        try:
+            cumulative = int(fields[1])
+        except ValueError:
+            # Header line
+            continue
+        is_toplevel = not fields[2][1:].startswith(' ')
+        import_times.append((fields[2].strip(), cumulative, is_toplevel))
+    return import_times
+
+def get_total_time(code, startup_names):
+    """
+    Return the sum of the cumulative times of the top-level imports done by
+    `code` (in microseconds). Modules in `startup_names` are left out.
+    """
+    return sum(
+        cumulative
+        for name, cumulative, is_toplevel in get_import_times(code)
+        if is_toplevel and name not in startup_names
+    )
+
+def run(num_runs):
+    startup_names = set(name for name, _, _ in get_import_times(''))
+    results = []
+    for name, code in SCENARIOS:
+        median = get_median([
+            get_total_time(code, startup_names) for _ in range(num_runs)
+        ])
+        results.append({
+            'scenario': name,
+            'num_runs': num_runs,
+            'median_microseconds': median,
+            'budget_microseconds': BUDGETS[name],
+            'status': 'ok' if median < BUDGETS[name] else 'exceeded',
+        })
+    return results
+
+def main(args=None):
+    args = sys.argv[1:] if args is None else args
+    num_runs = helpers.num(args[0]) if args else 5
+    results = run(num_runs)
+    emit(results)
+    if any(result['status'] != 'ok' for result in results):
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
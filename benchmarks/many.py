@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2013-2016, Sebastian Linke
+
+# Released under the Simplified BSD license
+# (see LICENSE file for details).
+
+"""
+Compare calling `core.columnize()` in a loop with `core.columnize_many()` for
+many small listings (e.g. one process list per host). The latter is also run
+with a thread pool and a process pool.
+
+Usage: python -m benchmarks.many [NUM_LISTINGS]
+"""
+
+import sys
+
+from concurrent import futures
+
+from shcol import core, helpers
+
+from . import emit, timed
+
+LINE_WIDTH = 120
+
+def make_listings(num_listings):
+    return [
+        [
+            'proc-{:x}'.format((listing * 131 + i) * 2654435761 % 4096)
+            for i in range(5 + listing % 60)
+        ]
+        for listing in range(num_listings)
+    ]
+
+def columnize_loop(listings):
+    return [core.columnize(items, line_width=LINE_WIDTH) for items in listings]
+
+def columnize_many(listings, executor=None):
+    return core.columnize_many(
+        listings, line_width=LINE_WIDTH, executor=executor, threshold=0
+    )
+
+def run(num_listings, repeat=3):
+    listings = make_listings(num_listings)
+    expected = columnize_loop(listings)
+    results = []
+    with futures.ThreadPoolExecutor(4) as threads, \
+            futures.ProcessPoolExecutor(4) as processes:
+        for name, executor in [
+            ('loop', None), ('many', None), ('many-threads', threads),
+            ('many-processes', processes)
+        ]:
+            timings = []
+            for _ in range(repeat):
+                if name == 'loop':
+                    result, elapsed = timed(columnize_loop, listings)
+                else:
+                    result, elapsed = timed(columnize_many, listings, executor)
+                assert result == expected
+                timings.append(elapsed)
+            results.append({
+                'variant': name,
+                'num_listings': num_listings,
+                'num_items': sum(map(len, listings)),
+                'best_seconds': min(timings),
+            })
+    return results
+
+def main(args=None):
+    args = sys.argv[1:] if args is None else args
+    num_listings = helpers.num(args[0]) if args else 5000
+    emit(run(num_listings))
+
+if __name__ == '__main__':
+    main()
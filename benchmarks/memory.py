@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2013-2016, Sebastian Linke
+
+# Released under the Simplified BSD license
+# (see LICENSE file for details).
+
+"""
+Measure the peak memory allocated by `tracemalloc` while columnizing a file
+of /usr/bin-like names in different ways. The peak is also reported for each
+stage of processing (see `helpers.StatsCollector`).
+
+Each scenario has an upper bound for its peak in relation to the size of the
+input file (see `MAX_PEAK_RATIOS`). The exit code is 1 if a bound is exceeded.
+The bounds are meant for a million items or more. Smaller inputs fit into a
+few blocks of `helpers.read_lines()`, so even the streaming scenarios hold
+all lines of the input while it is read.
+
+Note that `tracemalloc.reset_peak()` requires Python 3.9 or newer.
+
+Usage: python -m benchmarks.memory [NUM_ITEMS ...]
+
+The default is 1M items. Use "1M 10M" for also running on 10 million items.
+Note that tracing allocations makes the scenarios much slower.
+"""
+
+import gc
+import os
+import sys
+import tempfile
+import tracemalloc
+
+from shcol import cli, config, core, helpers, highlevel
+
+from . import emit, timed
+from .corpora import make_corpus
+from .suite import LINE_WIDTH, NullStream, parse_size
+
+# Peak allocation in relation to the size of the input file. The names have
+# a size of about 10 bytes while a string object needs at least 50 bytes. The
+# measured ratios for 1M items were: 13.2 (columnize, cli), 3.3 (low memory),
+# 3.0 (two-pass) and 9.0 (packed, which builds the whole result as a string).
+MAX_PEAK_RATIOS = {
+    'columnize': 18,
+    'cli': 18,
+    'cli-low-memory': 5,
+    'cli-two-pass': 4,
+    'packed': 12,
+}
+
+
+class MemoryStatsCollector(helpers.StatsCollector):
+    """
+    A `StatsCollector` that also records the peak of traced allocations while
+    each stage was active. The peak is measured in relation to the memory that
+    was allocated when the collector was created. Allocations outside of any
+    stage are recorded as the stage "other".
+    """
+    def __init__(self):
+        super(MemoryStatsCollector, self).__init__()
+        self.base_memory = tracemalloc.get_traced_memory()[0]
+        self.peaks = {}
+
+    def _switch(self):
+        stage = self._stack[-1] if self._stack else 'other'
+        peak = tracemalloc.get_traced_memory()[1] - self.base_memory
+        self.peaks[stage] = max(self.peaks.get(stage, 0), peak)
+        tracemalloc.reset_peak()
+        super(MemoryStatsCollector, self)._switch()
+
+    def stop(self):
+        self._switch()
+        super(MemoryStatsCollector, self).stop()
+
+def make_input(num_items):
+    fd, path = tempfile.mkstemp(prefix='shcol-bench-')
+    with os.fdopen(fd, 'wb') as stream:
+        for item in make_corpus('usr-bin', num_items):
+            stream.write(item.encode('utf-8') + b'\n')
+    return path
+
+def columnize(path):
+    with open(path, 'rb') as stream:
+        items = list(helpers.read_lines(stream, config.ENCODING))
+    core.columnize(items, line_width=LINE_WIDTH)
+
+def run_cli(path, *options):
+    args = ['--input', path, '-w{}'.format(LINE_WIDTH)] + list(options)
+    cli.main(args, output_stream=NullStream())
+
+def print_packed(path):
+    with open(path, 'rb') as stream:
+        items = helpers.read_packed_lines(stream, config.ENCODING)
+    highlevel.print_columnized(
+        items, line_width=LINE_WIDTH, output_stream=NullStream()
+    )
+
+SCENARIOS = [
+    ('columnize', columnize),
+    ('cli', run_cli),
+    ('cli-low-memory', lambda path: run_cli(path, '--low-memory')),
+    ('cli-two-pass', lambda path: run_cli(path, '--two-pass')),
+    ('packed', print_packed),
+]
+
+def run_scenario(func, path):
+    """
+    Run `func` on `path` while tracing allocations. Return a tuple of the
+    elapsed seconds, the overall peak and a dictionary of the peak per stage.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        stats = MemoryStatsCollector()
+        with helpers.collecting_stats(stats):
+            _, elapsed = timed(func, path)
+        stats.stop()
+    finally:
+        tracemalloc.stop()
+    return elapsed, max(stats.peaks.values()), stats.peaks
+
+def run(num_items):
+    path = make_input(num_items)
+    input_bytes = os.path.getsize(path)
+    results = []
+    try:
+        for name, func in SCENARIOS:
+            elapsed, peak, stage_peaks = run_scenario(func, path)
+            max_peak = MAX_PEAK_RATIOS[name] * input_bytes
+            results.append({
+                'scenario': name,
+                'num_items': num_items,
+                'input_bytes': input_bytes,
+                'seconds': elapsed,
+                'peak_bytes': peak,
+                'peak_ratio': float(peak) / input_bytes,
+                'max_peak_bytes': max_peak,
+                'stage_peak_bytes': stage_peaks,
+                'status': 'ok' if peak <= max_peak else 'exceeded',
+            })
+    finally:
+        os.remove(path)
+    return results
+
+def main(args=None):
+    args = sys.argv[1:] if args is None else args
+    sizes = [parse_size(arg) for arg in args] or [10 ** 6]
+    results = []
+    for num_items in sizes:
+        results.extend(run(num_items))
+    emit(results)
+    if any(result['status'] != 'ok' for result in results):
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,306 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2013-2016, Sebastian Linke
+
+# Released under the Simplified BSD license
+# (see LICENSE file for details).
+
+"""
+Differential testing of alternative layout engines. Each registered engine is
+run on randomly generated cases and its outcome is compared with the outcome of
+the reference implementation. A failing case is shrunk to a minimal example
+before it is reported.
+
+Calculators are compared with `columncalc.ColumnWidthCalculator`, including
+the raised exceptions (e.g. `LineTooSmallError`). Renderers are compared with
+`core.columnize()`. Register new engines via `register_calculator()` or
+`register_renderer()`.
+
+Usage: python -m benchmarks.oracle [--cases N] [--seed SEED] [--engine NAME]
+
+N may use suffixes like "k" and "M" (default: 100k cases per engine). The run
+time of each engine and of the reference is reported as well. The exit code
+is 1 if an engine disagreed with the reference.
+"""
+
+import argparse
+import collections
+import random
+import sys
+import time
+
+from shcol import core, helpers
+from shcol.core import columncalc
+
+from . import emit
+from .suite import parse_size
+
+MAX_ITEMS = 60
+MAX_LINE_WIDTH = 120
+
+Engine = collections.namedtuple('Engine', 'kind, func')
+
+ENGINES = collections.OrderedDict()
+
+def register_calculator(name, calculator_class):
+    """
+    Register `calculator_class` under `name`. It must take the same arguments
+    as `columncalc.ColumnWidthCalculator` and provide `.calculate_columns()`.
+    """
+    ENGINES[name] = Engine('calculator', calculator_class)
+
+def register_renderer(name, func):
+    """
+    Register `func` under `name`. It is called as `func(items, spacing,
+    line_width)` and should return the same string as `core.columnize()`.
+    """
+    ENGINES[name] = Engine('renderer', func)
+
+def unregister(name):
+    del ENGINES[name]
+
+
+class SparseTableCalculator(columncalc.ColumnWidthCalculator):
+    """
+    A calculator that answers the range maxima needed for each column from a
+    sparse table. Building the table costs O(n log n) once per calculation,
+    while each tried configuration then costs only O(number of columns). This
+    only pays off for many items of which many configurations are tried.
+    """
+    def calculate_columns(self, item_widths):
+        self.table = build_sparse_table(item_widths)
+        try:
+            return super(SparseTableCalculator, self).calculate_columns(
+                item_widths
+            )
+        finally:
+            self.table = None
+
+    def get_unchecked_column_config(self, item_widths, max_columns):
+        num_items = len(item_widths)
+        max_columns = helpers.num(max_columns)
+        num_lines, remaining = divmod(num_items, max_columns)
+        if remaining:
+            num_lines += 1
+        column_widths = [
+            get_range_max(self.table, i, min(i + num_lines, num_items))
+            for i in range(0, num_items, num_lines)
+        ]
+        return columncalc.ColumnConfig(column_widths, num_lines)
+
+def build_sparse_table(values):
+    """
+    Return a list of rows where row `k` holds the maximum of each range of
+    `2 ** k` consecutive elements of `values`.
+    """
+    table = [list(values)]
+    span = 1
+    while 2 * span <= len(values):
+        row = table[-1]
+        table.append([
+            max(row[i], row[i + span]) for i in range(len(row) - span)
+        ])
+        span *= 2
+    return table
+
+def get_range_max(table, start, stop):
+    """
+    Return the maximum of `values[start:stop]` based on the sparse `table` of
+    `values`. The range must not be empty.
+    """
+    level = (stop - start).bit_length() - 1
+    row = table[level]
+    return max(row[start], row[stop - (1 << level)])
+
+register_calculator('sparse-table', SparseTableCalculator)
+
+def generate_case(rng):
+    """
+    Return a random case as a dictionary of calculator arguments and item
+    widths. Widths are drawn from different distributions, so that narrow and
+    wide items, equal widths and items exceeding the line width all occur.
+    """
+    line_width = rng.randint(1, MAX_LINE_WIDTH)
+    num_items = rng.randint(0, MAX_ITEMS)
+    distribution = rng.choice(['narrow', 'uniform', 'equal', 'long-tail'])
+    if distribution == 'narrow':
+        item_widths = [rng.randint(0, 8) for _ in range(num_items)]
+    elif distribution == 'uniform':
+        item_widths = [
+            rng.randint(0, line_width + 10) for _ in range(num_items)
+        ]
+    elif distribution == 'equal':
+        item_widths = [rng.randint(0, 20)] * num_items
+    else:
+        item_widths = [
+            int(rng.paretovariate(1.5)) - 1 for _ in range(num_items)
+        ]
+    return {
+        'item_widths': item_widths,
+        'spacing': rng.randint(0, 4),
+        'line_width': line_width,
+        'num_columns': rng.choice([None, None, rng.randint(1, 6)]),
+        'allow_exceeding': rng.random() < .5,
+        'min_shrink_width': rng.choice([None, rng.randint(0, 15)]),
+    }
+
+def get_calculator_outcome(calculator_class, case):
+    """
+    Return the result of `calculator_class` for `case` as a tuple of the column
+    widths and the number of lines. If the calculator raises an exception then
+    the name of the exception's type is returned.
+    """
+    options = dict(case)
+    item_widths = options.pop('item_widths')
+    try:
+        calculator = calculator_class(**options)
+        cfg = calculator.calculate_columns(item_widths)
+    except Exception as exc:
+        return type(exc).__name__
+    return list(cfg.column_widths), cfg.num_lines
+
+def make_items(item_widths):
+    # Use distinct characters so that swapped items are noticed
+    return [
+        chr(ord('a') + i % 26) * width for i, width in enumerate(item_widths)
+    ]
+
+def get_renderer_outcome(func, case):
+    """
+    Return the string that `func` renders for `case` or the name of the type
+    of the raised exception.
+    """
+    try:
+        return func(
+            make_items(case['item_widths']), case['spacing'],
+            case['line_width']
+        )
+    except Exception as exc:
+        return type(exc).__name__
+
+def render_reference(items, spacing, line_width):
+    return core.columnize(items, spacing=spacing, line_width=line_width)
+
+def get_outcome(engine, case):
+    if engine.kind == 'calculator':
+        return get_calculator_outcome(engine.func, case)
+    return get_renderer_outcome(engine.func, case)
+
+def get_reference(kind):
+    if kind == 'calculator':
+        return Engine(kind, columncalc.ColumnWidthCalculator)
+    return Engine(kind, render_reference)
+
+def disagrees(engine, case):
+    """
+    Return whether `engine` and the reference give different outcomes for
+    `case`.
+    """
+    reference = get_reference(engine.kind)
+    return get_outcome(engine, case) != get_outcome(reference, case)
+
+def iter_smaller_cases(case):
+    """
+    Yield variants of `case` that are simpler than `case`, starting with the
+    ones that remove the most.
+    """
+    widths = case['item_widths']
+    # Remove chunks of items, from all of them down to single items
+    size = len(widths)
+    while size >= 1:
+        for start in range(0, len(widths), size):
+            yield dict(case, item_widths=widths[:start] + widths[start + size:])
+        size //= 2
+    # Make single items narrower
+    for i, width in enumerate(widths):
+        for smaller in sorted(set([0, width // 2, width - 1])):
+            if smaller < width:
+                yield dict(case, item_widths=(
+                    widths[:i] + [smaller] + widths[i + 1:]
+                ))
+    for smaller in sorted(set([1, max(1, case['line_width'] // 2)])):
+        if smaller < case['line_width']:
+            yield dict(case, line_width=smaller)
+    if case['line_width'] > 1:
+        yield dict(case, line_width=case['line_width'] - 1)
+    if case['spacing'] > 0:
+        yield dict(case, spacing=case['spacing'] - 1)
+    if case['num_columns'] is not None:
+        yield dict(case, num_columns=None)
+        if case['num_columns'] > 1:
+            yield dict(case, num_columns=case['num_columns'] - 1)
+    if case['allow_exceeding']:
+        yield dict(case, allow_exceeding=False)
+    if case['min_shrink_width'] is not None:
+        yield dict(case, min_shrink_width=None)
+        if case['min_shrink_width'] > 0:
+            yield dict(case, min_shrink_width=case['min_shrink_width'] - 1)
+
+def shrink(case, is_failing):
+    """
+    Return a minimal version of the failing `case`. The simplifications of
+    `iter_smaller_cases()` are applied as long as `is_failing(case)` stays
+    `True`.
+    """
+    progress = True
+    while progress:
+        progress = False
+        for smaller in iter_smaller_cases(case):
+            if is_failing(smaller):
+                case = smaller
+                progress = True
+                break
+    return case
+
+def check_engine(name, num_cases, seed):
+    """
+    Compare the engine registered as `name` with the reference on `num_cases`
+    generated cases. Return a dictionary with the result of the comparison.
+    """
+    engine = ENGINES[name]
+    reference = get_reference(engine.kind)
+    rng = random.Random(seed)
+    engine_seconds = reference_seconds = 0.0
+    result = {'engine': name, 'kind': engine.kind, 'seed': seed}
+    for case_number in range(num_cases):
+        case = generate_case(rng)
+        start = time.perf_counter()
+        outcome = get_outcome(engine, case)
+        middle = time.perf_counter()
+        expected = get_outcome(reference, case)
+        reference_seconds += time.perf_counter() - middle
+        engine_seconds += middle - start
+        if outcome != expected:
+            case = shrink(case, lambda smaller: disagrees(engine, smaller))
+            result.update(
+                status='failed', num_cases=case_number + 1,
+                minimal_case=case, outcome=get_outcome(engine, case),
+                expected=get_outcome(reference, case)
+            )
+            break
+    else:
+        result.update(status='ok', num_cases=num_cases)
+    result['engine_seconds'] = engine_seconds
+    result['reference_seconds'] = reference_seconds
+    return result
+
+def run(num_cases, seed=0, names=None):
+    if names is None:
+        names = list(ENGINES)
+    return [check_engine(name, num_cases, seed) for name in names]
+
+def parse_args(args):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.oracle')
+    parser.add_argument('--cases', type=parse_size, default=100000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--engine', action='append', choices=list(ENGINES))
+    return parser.parse_args(args)
+
+def main(args=None):
+    args = parse_args(sys.argv[1:] if args is None else args)
+    results = run(args.cases, args.seed, args.engine)
+    emit(results)
+    if any(result['status'] != 'ok' for result in results):
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2013-2016, Sebastian Linke
+
+# Released under the Simplified BSD license
+# (see LICENSE file for details).
+
+"""
+Compare reading and columnizing a list of strings with doing the same on a
+`helpers.PackedItems`-sequence. Each scenario runs in a fresh interpreter in
+order to measure its peak resident set size.
+
+Usage: python -m benchmarks.packed [NUM_ITEMS]
+
+The default is 1 million items. Use 10M for running on 10 million items.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from shcol import config, core, helpers
+
+from . import emit, timed
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+def make_input(num_items):
+    fd, path = tempfile.mkstemp(prefix='shcol-bench-')
+    with os.fdopen(fd, 'wb') as stream:
+        for start in range(0, num_items, 10000):
+            stop = min(start + 10000, num_items)
+            chunk = ''.join(
+                'item-{:x}\n'.format(i * 2654435761)
+                for i in range(start, stop)
+            )
+            stream.write(chunk.encode('utf-8'))
+    return path
+
+def read_list(stream):
+    return list(helpers.read_lines(stream, config.ENCODING))
+
+def read_packed(stream):
+    return helpers.read_packed_lines(stream, config.ENCODING)
+
+def columnize(items):
+    num_bytes = 0
+    for line in core.columnize_lines(items, line_width=120):
+        num_bytes += len(line)
+    return num_bytes
+
+def get_peak_rss():
+    if resource is None:
+        return None
+    # Linux reports kilobytes, macOS reports bytes
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+def run_scenario(name, path):
+    baseline_rss = get_peak_rss()
+    reader = read_packed if name == 'packed' else read_list
+    with open(path, 'rb') as stream:
+        items, read_seconds = timed(reader, stream)
+    _, columnize_seconds = timed(columnize, items)
+    return {
+        'representation': name,
+        'num_items': len(items),
+        'read_seconds': read_seconds,
+        'columnize_seconds': columnize_seconds,
+        'baseline_rss_bytes': baseline_rss,
+        'peak_rss_bytes': get_peak_rss(),
+    }
+
+def run(num_items):
+    path = make_input(num_items)
+    try:
+        results = []
+        for name in ('list', 'packed'):
+            args = [
+                sys.executable, '-m', 'benchmarks.packed', '--scenario',
+                name, path
+            ]
+            output = subprocess.check_output(args)
+            results.append(json.loads(output.decode('utf-8')))
+        return results
+    finally:
+        os.remove(path)
+
+def main(args=None):
+    args = sys.argv[1:] if args is None else args
+    if args and args[0] == '--scenario':
+        emit(run_scenario(args[1], args[2]))
+        return
+    num_items = helpers.num(args[0]) if args else 1000000
+    emit(run(num_items))
+
+if __name__ == '__main__':
+    main()
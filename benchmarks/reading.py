@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2013-2016, Sebastian Linke
+
+# Released under the Simplified BSD license
+# (see LICENSE file for details).
+
+"""
+Compare reading lines from a binary stream line by line with reading them in
+blocks via `helpers.read_lines()`.
+
+Usage: python -m benchmarks.reading [SIZE_IN_MB]
+
+The default size is 64 MB. Use 1024 for running on a 1 GB input.
+"""
+
+import os
+import sys
+import tempfile
+
+from shcol import config, helpers
+
+from . import emit, timed
+
+LINE_TEMPLATE = 'file-{:08x}-späm.txt\n'
+
+def make_input(size):
+    fd, path = tempfile.mkstemp(prefix='shcol-bench-')
+    chunk = ''.join(LINE_TEMPLATE.format(i) for i in range(10000))
+    chunk = chunk.encode('utf-8')
+    with os.fdopen(fd, 'wb') as stream:
+        written = 0
+        while written < size:
+            stream.write(chunk)
+            written += len(chunk)
+    return path
+
+def read_per_line(stream):
+    lines = helpers.get_lines(stream)
+    return list(helpers.get_strings(lines, config.ENCODING))
+
+def read_in_blocks(stream):
+    return list(helpers.read_lines(stream, config.ENCODING))
+
+def run(size_in_mb):
+    path = make_input(size_in_mb * 1024 * 1024)
+    try:
+        size = os.path.getsize(path)
+        results = []
+        for name, func in [
+            ('per-line', read_per_line), ('blocks', read_in_blocks)
+        ]:
+            with open(path, 'rb') as stream:
+                lines, elapsed = timed(func, stream)
+            results.append({
+                'reader': name,
+                'num_bytes': size,
+                'num_lines': len(lines),
+                'seconds': elapsed,
+                'mb_per_second': size / (1024.0 * 1024) / elapsed,
+            })
+            del lines
+        return results
+    finally:
+        os.remove(path)
+
+def main(args=None):
+    args = sys.argv[1:] if args is None else args
+    size_in_mb = helpers.num(args[0]) if args else 64
+    emit(run(size_in_mb))
+
+if __name__ == '__main__':
+    main()
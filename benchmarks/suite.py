@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2013-2016, Sebastian Linke
+
+# Released under the Simplified BSD license
+# (see LICENSE file for details).
+
+"""
+Time the main building blocks of `shcol` and a run of its command-line
+interface on the synthetic corpora from `benchmarks.corpora`.
+
+Usage: python -m benchmarks.suite [--sizes SIZES] [--repeat N]
+                                  [--scenario NAME] [--corpus NAME]
+
+SIZES is a comma-separated list of item counts. Suffixes like "k" and "M" may
+be used (e.g. "10,1k,10M"). The default is "10,1k,100k". Each measurement is
+repeated N times (5 by default, only once for a million items or more) and its
+median and best time are reported.
+"""
+
+import argparse
+import collections
+import contextlib
+import os
+import shutil
+import sys
+import tempfile
+
+from shcol import cli, helpers
+from shcol.core import columncalc, formatters
+
+from . import emit, get_median, timed
+from .corpora import CORPORA, make_corpus
+
+LINE_WIDTH = 120
+DEFAULT_SIZES = '10,1k,100k'
+SIZE_SUFFIXES = {'k': 10 ** 3, 'M': 10 ** 6}
+
+Scenario = collections.namedtuple(
+    'Scenario', 'name, corpora, prepare, max_size'
+)
+
+
+class NullStream(object):
+    def write(self, text):
+        pass
+
+    def flush(self):
+        pass
+
+def prepare_calculate_columns(items, stack):
+    calculator = columncalc.ColumnWidthCalculator(
+        line_width=LINE_WIDTH, allow_exceeding=True
+    )
+    item_widths = helpers.get_item_widths(items)
+    return lambda: calculator.calculate_columns(item_widths)
+
+def prepare_format(items, stack):
+    formatter = formatters.make_formatter(items, line_width=LINE_WIDTH)
+    return lambda: formatter.format(items)
+
+def prepare_get_sorted(items, stack):
+    return lambda: helpers.get_sorted(items)
+
+def prepare_make_unique(items, stack):
+    return lambda: list(helpers.make_unique(items))
+
+def prepare_get_filenames(items, stack):
+    path = tempfile.mkdtemp(prefix='shcol-bench-')
+    stack.callback(shutil.rmtree, path)
+    for i, name in enumerate(items):
+        # Names must be unique within a directory
+        open(os.path.join(path, '{}-{}'.format(name, i)), 'w').close()
+    return lambda: list(helpers.get_filenames(path))
+
+def prepare_cli_file(items, stack):
+    fd, path = tempfile.mkstemp(prefix='shcol-bench-')
+    stack.callback(os.remove, path)
+    with os.fdopen(fd, 'wb') as stream:
+        for item in items:
+            stream.write(item.encode('utf-8') + b'\n')
+    args = ['--input', path, '-w{}'.format(LINE_WIDTH)]
+    return lambda: cli.main(args, output_stream=NullStream())
+
+LIST_CORPORA = ['usr-bin', 'uuids', 'long-tail', 'unicode']
+
+SCENARIOS = [
+    Scenario(
+        'calculate_columns', LIST_CORPORA, prepare_calculate_columns, None
+    ),
+    Scenario('IterableFormatter.format', LIST_CORPORA, prepare_format, None),
+    Scenario('MappingFormatter.format', ['wide-mapping'], prepare_format, None),
+    Scenario('get_sorted', ['usr-bin', 'unicode'], prepare_get_sorted, None),
+    Scenario('make_unique', ['usr-bin', 'uuids'], prepare_make_unique, None),
+    # Creating millions of files would mostly measure the file system
+    Scenario('get_filenames', ['usr-bin'], prepare_get_filenames, 100000),
+    Scenario('cli_file', ['usr-bin', 'unicode'], prepare_cli_file, None),
+]
+
+def parse_size(value):
+    """
+    Return the number of items given by `value` (e.g. "10", "1k" or "10M").
+    """
+    factor = SIZE_SUFFIXES.get(value[-1:], 1)
+    if factor != 1:
+        value = value[:-1]
+    return helpers.num(value) * factor
+
+def iter_cases(scenario_names=None, corpus_names=None, sizes=None):
+    """
+    Yield a `(scenario, corpus_name, size)`-tuple for each measurement that
+    matches the given names and sizes. `None` selects all of them.
+    """
+    if sizes is None:
+        sizes = [parse_size(size) for size in DEFAULT_SIZES.split(',')]
+    for scenario in SCENARIOS:
+        if scenario_names is not None and scenario.name not in scenario_names:
+            continue
+        for corpus_name in scenario.corpora:
+            if corpus_names is not None and corpus_name not in corpus_names:
+                continue
+            for size in sizes:
+                if scenario.max_size is None or size <= scenario.max_size:
+                    yield scenario, corpus_name, size
+
+def run_case(scenario, corpus_name, size, repeat):
+    """
+    Run `scenario` on `size` items of the corpus `corpus_name` and return a
+    list of `repeat` timings. Preparing the input is not included.
+    """
+    items = make_corpus(corpus_name, size)
+    with contextlib.ExitStack() as stack:
+        func = scenario.prepare(items, stack)
+        return [timed(func)[1] for _ in range(repeat)]
+
+def get_repeat(size, repeat):
+    return 1 if size >= 10 ** 6 else repeat
+
+def run(scenario_names=None, corpus_names=None, sizes=None, repeat=5):
+    results = []
+    for scenario, corpus_name, size in iter_cases(
+        scenario_names, corpus_names, sizes
+    ):
+        num_runs = get_repeat(size, repeat)
+        timings = run_case(scenario, corpus_name, size, num_runs)
+        results.append({
+            'scenario': scenario.name,
+            'corpus': corpus_name,
+            'size': size,
+            'repeat': num_runs,
+            'median_seconds': get_median(timings),
+            'best_seconds': min(timings),
+        })
+    return results
+
+def parse_args(args):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.suite')
+    parser.add_argument(
+        '--sizes', default=DEFAULT_SIZES,
+        type=lambda value: [parse_size(size) for size in value.split(',')]
+    )
+    parser.add_argument('--repeat', type=helpers.num, default=5)
+    parser.add_argument(
+        '--scenario', action='append',
+        choices=[scenario.name for scenario in SCENARIOS]
+    )
+    parser.add_argument('--corpus', action='append', choices=list(CORPORA))
+    return parser.parse_args(args)
+
+def main(args=None):
+    args = parse_args(sys.argv[1:] if args is None else args)
+    emit(run(args.scenario, args.corpus, args.sizes, args.repeat))
+
+if __name__ == '__main__':
+    main()
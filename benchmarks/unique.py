@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2013-2016, Sebastian Linke
+
+# Released under the Simplified BSD license
+# (see LICENSE file for details).
+
+"""
+Compare the containers that `helpers.make_unique()` can use for remembering
+seen items with regard to speed, peak memory and false positive rate.
+
+Usage: python -m benchmarks.unique [NUM_ITEMS]
+"""
+
+import sys
+
+from shcol import helpers
+
+from . import emit, measure, timed
+
+def make_keys(num_items, prefix='item'):
+    return ('{}-{:x}'.format(prefix, i * 2654435761) for i in range(num_items))
+
+def make_items(num_items):
+    # Each key occurs twice, so half of the lookups are hits
+    return (key for key in make_keys(num_items) for _ in range(2))
+
+def run_unique(num_items, factory):
+    seen = factory()
+    num_unique = sum(
+        1 for _ in helpers.make_unique(make_items(num_items), seen=seen)
+    )
+    return num_unique, seen
+
+def run(num_items):
+    containers = [
+        ('set', set),
+        ('digest', lambda: helpers.DigestSet(num_items)),
+        ('bloom-1e-3', lambda: helpers.BloomFilter(num_items, 0.001)),
+        ('bloom-1e-6', lambda: helpers.BloomFilter(num_items, 0.000001)),
+    ]
+    results = []
+    for name, factory in containers:
+        _, _, peak = measure(run_unique, num_items, factory)
+        (num_unique, seen), elapsed = timed(run_unique, num_items, factory)
+        probes = make_keys(num_items, prefix='probe')
+        false_positives = sum(1 for key in probes if key in seen)
+        results.append({
+            'container': name,
+            'num_items': num_items,
+            'num_unique': num_unique,
+            'seconds': elapsed,
+            'peak_bytes': peak,
+            'false_positive_rate': float(false_positives) / num_items,
+        })
+    return results
+
+def main(args=None):
+    args = sys.argv[1:] if args is None else args
+    num_items = helpers.num(args[0]) if args else 100000
+    emit(run(num_items))
+
+if __name__ == '__main__':
+    main()
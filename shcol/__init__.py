@@ -88,9 +88,65 @@ __author__ = 'Sebastian Linke'
 __version__ = '0.4a'
 __license__ = 'Simplified BSD'
 
-from . import cli
-from .core import *
-from .highlevel import *
+from . import config
+
+# Submodules and public names are imported on first access in order to keep
+# `import shcol` (and thus the command-line tool's startup) fast. The same
+# policy applies inside the package: standard modules that take long to import
+# are only imported by the code that needs them. As measured by `-X importtime`
+# on CPython 3.11, these are `logging` and `tempfile` (about 20 ms each),
+# `argparse` and `locale` (about 10 ms each) as well as `hashlib` and `ctypes`
+# (about 3 ms each). `testsuite/test_script.py` checks that they stay unloaded.
+LAZY_ATTRS = {
+    'cli': ('cli', None),
+    'client': ('client', None),
+    'core': ('core', None),
+    'helpers': ('helpers', None),
+    'highlevel': ('highlevel', None),
+    'formatters': ('core', 'formatters'),
+    'columnize': ('core', 'columnize'),
+    'columnize_lines': ('core', 'columnize_lines'),
+    'columnize_file': ('core', 'columnize_file'),
+    'columnize_many': ('core', 'columnize_many'),
+    'columnize_groups': ('core', 'columnize_groups'),
+    'print_columnized': ('highlevel', 'print_columnized'),
+    'print_file': ('highlevel', 'print_file'),
+    'print_records': ('highlevel', 'print_records'),
+    'print_sorted': ('highlevel', 'print_sorted'),
+    'print_filenames': ('highlevel', 'print_filenames'),
+}
+
+__all__ = ['config'] + sorted(LAZY_ATTRS)
+
+def import_submodule(package_name, name):
+    """
+    Import the submodule `name` of the package `package_name` and return it.
+    """
+    import sys
+    # Not using `importlib` since its imports are invisible to `-X importtime`
+    full_name = '{}.{}'.format(package_name, name)
+    __import__(full_name)
+    return sys.modules[full_name]
+
+if config.PY_VERSION >= (3, 7):
+    def __getattr__(name):
+        try:
+            module_name, attr_name = LAZY_ATTRS[name]
+        except KeyError:
+            msg = 'module {!r} has no attribute {!r}'
+            raise AttributeError(msg.format(__name__, name))
+        module = import_submodule(__name__, module_name)
+        value = module if attr_name is None else getattr(module, attr_name)
+        globals()[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(globals()) | set(LAZY_ATTRS))
+else:
+    # No support for module-level `__getattr__()` (PEP 562)
+    from . import cli, client
+    from .core import *
+    from .highlevel import *
 
 if __name__ == '__main__':
     cli.main()
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2013-2016, Sebastian Linke
+
+# Released under the Simplified BSD license
+# (see LICENSE file for details).
+
+"""
+Columnizing for programs based on `asyncio`. Items may be given as an
+asynchronous iterable. Calculating the layout of many items is done by an
+executor so the event loop is not blocked.
+
+Note that this module requires Python 3.7 or newer.
+"""
+
+import asyncio
+import collections.abc
+import functools
+
+from . import config, core
+
+__all__ = ['columnize_async', 'write_columnized']
+
+OFFLOAD_THRESHOLD = 10000
+
+async def collect_items(items):
+    """
+    Return a list of the elements of the asynchronous iterable `items`. Any
+    other object is returned as-is.
+    """
+    if hasattr(items, '__aiter__'):
+        return [item async for item in items]
+    return items
+
+def make_layout(formatter, items, pattern, make_unique, sort_items):
+    """
+    Prepare `items` for `formatter` and calculate their layout. Return a tuple
+    of the prepared items and their `LineProperties`-instance.
+    """
+    items = formatter.prepare_items(items, pattern, sort_items, make_unique)
+    if isinstance(items, collections.abc.Iterator):
+        items = list(items)
+    return items, formatter.get_line_properties(items)
+
+async def run_maybe_offloaded(func, num_items, executor, threshold):
+    """
+    Return the result of calling `func`. The call is made by `executor` if
+    `num_items` reaches `threshold`. Otherwise, it is made directly.
+
+    `executor` may be `None` to use the event loop's default executor.
+    """
+    if num_items is None or num_items < threshold:
+        return func()
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, func)
+
+def get_size(items):
+    """
+    Return the number of elements in `items` or `None` if it has no length.
+    """
+    try:
+        return len(items)
+    except TypeError:
+        return None
+
+async def columnize_async(
+    items, spacing=config.SPACING, line_width=config.LINE_WIDTH,
+    extra_sep=config.EXTRA_SEP, pattern=None, make_unique=config.MAKE_UNIQUE,
+    sort_items=config.SORT_ITEMS, output_stream=config.TERMINAL_STREAM,
+    executor=None, threshold=OFFLOAD_THRESHOLD
+):
+    """
+    Like `core.columnize()` but `items` may also be an asynchronous iterable.
+
+    If the number of items is at least `threshold` then columnizing is done by
+    `executor` (the event loop's default executor if this is `None`). Items
+    from an iterator without a length are always columnized directly.
+
+    See `core.columnize()` for the meaning of the other arguments.
+    """
+    items = await collect_items(items)
+    func = functools.partial(
+        core.columnize, items, spacing, line_width, extra_sep, pattern,
+        make_unique, sort_items, output_stream
+    )
+    return await run_maybe_offloaded(func, get_size(items), executor, threshold)
+
+async def write_columnized(
+    writer, items, spacing=config.SPACING,
+    line_width=config.LINE_WIDTH_FALLBACK, extra_sep=config.EXTRA_SEP,
+    pattern=None, make_unique=config.MAKE_UNIQUE, sort_items=config.SORT_ITEMS,
+    encoding='utf-8', executor=None, threshold=OFFLOAD_THRESHOLD
+):
+    """
+    Write the columnized lines for `items` to the `asyncio.StreamWriter`
+    `writer`. Each line is encoded with `encoding`. The writer is drained
+    after each line, so writing waits for slow readers.
+
+    Note that `line_width` defaults to `config.LINE_WIDTH_FALLBACK`, since a
+    stream writer is not connected to a terminal.
+
+    See `columnize_async()` for the meaning of the other arguments.
+    """
+    items = await collect_items(items)
+    formatter = core.get_formatter(items, spacing, line_width, extra_sep)
+    func = functools.partial(
+        make_layout, formatter, items, pattern, make_unique, sort_items
+    )
+    items, props = await run_maybe_offloaded(
+        func, get_size(items), executor, threshold
+    )
+    for line in formatter.make_lines(items, add_line_breaks=True, props=props):
+        writer.write(line.encode(encoding))
+        await writer.drain()
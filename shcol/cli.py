@@ -9,13 +9,30 @@ The command-line interface for `shcol`.
 """
 
 import argparse
+import collections
+import io
 import sys
-import traceback
 
 from . import __version__, config, helpers, highlevel
 
 __all__ = ['main']
 
+def column_indices(value):
+    """
+    Return the column index defined by the string `value` as an `int`. If
+    `value` contains multiple comma-separated indices then a tuple of them is
+    returned instead.
+    """
+    try:
+        indices = tuple(
+            helpers.num(index, allow_zero=True) for index in value.split(',')
+        )
+    except ValueError:
+        msg = 'invalid num value: {!r}'.format(value)
+        raise argparse.ArgumentTypeError(msg)
+    return indices[0] if len(indices) == 1 else indices
+
+
 class ArgumentParser(argparse.ArgumentParser):
     """
     Implementation for generating help text and command-line parsing.
@@ -108,15 +125,58 @@ class ArgumentParser(argparse.ArgumentParser):
                  .format(config.EXTRA_SEP)
         )
         self.add_argument(
-            '-c', '--column', metavar='N', type=helpers.num, dest='column',
+            '-c', '--column', metavar='N', type=column_indices, dest='column',
             help='choose a specific column per line via an index value\n'
                  '(indices start at 0, column separator is whitespace)\n'
+                 'two indices such as "0,3" columnize pairs of columns\n'
+                 '(the last value of a repeated key is shown)\n'
                  'will only work when items are supplied via stdin'
         )
         self.add_argument(
-            '-F', '--filter', metavar='P', dest='pattern',
+            '-d', '--delimiter', metavar='C',
+            help='use C as the column separator instead of whitespace'
+        )
+        self.add_argument(
+            '--short-lines', choices=helpers.misc.SHORT_LINE_POLICIES,
+            default='error',
+            help='what to do with lines having not enough columns\n'
+                 '(default: error)'
+        )
+        self.add_argument(
+            '--input', metavar='FILE', type=argparse.FileType('rb'),
+            dest='input_file',
+            help='read items from FILE instead of stdin\n'
+                 '(regular files are memory-mapped)'
+        )
+        self.add_argument(
+            '-z', '--null', action='store_true',
+            help='input items are terminated by a NUL-character instead of\n'
+                 'a newline (e.g. as written by `find -print0`)'
+        )
+        self.add_argument(
+            '--print0', action='store_true',
+            help='do not columnize but write each item terminated by a\n'
+                 'NUL-character (e.g. for `xargs -0`)'
+        )
+        self.add_argument(
+            '-F', '--filter', metavar='P', dest='pattern', action='append',
             help='only columnize items which match the pattern P\n'
-                 '(P should include wildcard symbols such as "?" or "*")'
+                 '(P should include wildcard symbols such as "?" or "*")\n'
+                 'may be given multiple times to match any of the patterns'
+        )
+        self.add_argument(
+            '--exclude', metavar='P', action='append',
+            help='do not columnize items which match the pattern P\n'
+                 '(may be given multiple times)'
+        )
+        self.add_argument(
+            '-i', '--ignore-case', action='store_true',
+            help='ignore case distinctions when matching patterns'
+        )
+        self.add_argument(
+            '--regex', action='store_true',
+            help='interpret patterns as regular expressions that may match\n'
+                 'anywhere in an item'
         )
         self.add_argument(
             '-S', '--sort', action='store_true', default=config.SORT_ITEMS,
@@ -127,6 +187,31 @@ class ArgumentParser(argparse.ArgumentParser):
             help='process only the first occurrence of an item\n'
                  '(i.e. doublets are eliminated)'
         )
+        self.add_argument(
+            '--low-memory', action='store_true',
+            help='keep the items in a temporary file instead of memory\n'
+                 '(for huge inputs, can\'t be combined with --sort)'
+        )
+        self.add_argument(
+            '--two-pass', action='store_true',
+            help='measure the lines of a regular file first and read them\n'
+                 'again when writing (for huge files, can\'t be combined\n'
+                 'with --sort, --column or --null)'
+        )
+        self.add_argument(
+            '--stats', action='store_const', const='text', dest='stats_format',
+            help='write the time spent in each stage of processing and some\n'
+                 'counters to stderr'
+        )
+        self.add_argument(
+            '--stats-format', choices=['text', 'json'],
+            help='like --stats but choose the format of the statistics'
+        )
+        self.add_argument(
+            '--serve', action='store_true',
+            help='run as a daemon that keeps shcol loaded for faster\n'
+                 'startup (see `shcol.client` for details)'
+        )
         self.add_argument(
             '-v', '--version', action='version', version=self.version_string
         )
@@ -146,24 +231,186 @@ class ArgumentParser(argparse.ArgumentParser):
         this is a redefined method of `argparse.ArgumentParser`.
         """
         args = argparse.ArgumentParser.parse_args(self, args, namespace)
+        matcher = None
+        if args.pattern or args.exclude:
+            matcher = helpers.get_name_matcher(
+                args.pattern, args.exclude, args.ignore_case, args.regex
+            )
+        if isinstance(args.column, tuple) and len(args.column) > 2:
+            self.error('can\'t use more than two column indices')
+        if args.delimiter is not None and args.column is None:
+            self.error('can\'t use --delimiter without --column')
+        if args.print0 and isinstance(args.column, tuple):
+            self.error('can\'t use --print0 with multiple column indices')
+        if args.low_memory:
+            if args.sort:
+                self.error('can\'t use --sort with --low-memory')
+            if isinstance(args.column, tuple):
+                msg = 'can\'t use --low-memory with multiple column indices'
+                self.error(msg)
+        if args.two_pass:
+            for flag, option in [
+                (args.sort, '--sort'), (args.column is not None, '--column'),
+                (args.null, '--null'), (args.low_memory, '--low-memory'),
+                (args.items, 'item arguments')
+            ]:
+                if flag:
+                    self.error('can\'t use --two-pass with {}'.format(option))
+        if args.serve:
+            if args.items or args.input_file is not None:
+                self.error('can\'t use --serve with items')
+            return args
+        args.stats = None
+        if args.stats_format is not None:
+            args.stats = helpers.StatsCollector()
+            with helpers.collecting_stats(args.stats):
+                return self.read_input(args, matcher)
+        return self.read_input(args, matcher)
+
+    def read_input(self, args, matcher):
+        """
+        Set `args.items` to the items given as arguments or to the items read
+        from the input and return `args`. Also set `args.pattern` to the
+        matcher that still needs to be applied to the items (see
+        `.read_items()`).
+        """
         if args.items:
             if args.column is not None:
                 msg = 'can\'t use --column when items are given as arguments'
                 self.error(msg)
+            if args.input_file is not None:
+                msg = 'can\'t use --input when items are given as arguments'
+                self.error(msg)
             encoding = sys.getfilesystemencoding()
+            args.items = list(helpers.get_strings(args.items, encoding))
         else:
-            input_stream = getattr(self.stdin, 'buffer', self.stdin)
-            args.items = helpers.get_lines(input_stream)
-            if args.column is not None:
-                args.items = helpers.get_column(args.column, args.items)
-            encoding = config.ENCODING
-        args.items = list(helpers.get_strings(args.items, encoding))
+            input_stream = args.input_file
+            if input_stream is None:
+                input_stream = getattr(self.stdin, 'buffer', self.stdin)
+            try:
+                if args.two_pass:
+                    args.items = self.index_lines(
+                        input_stream, matcher, args.unique
+                    )
+                    matcher = None
+                    args.unique = False
+                else:
+                    items, matcher = self.read_items(
+                        input_stream, matcher, args.column, args.delimiter,
+                        args.short_lines, args.null
+                    )
+                    if args.low_memory:
+                        args.items = self.make_store(
+                            items, matcher, args.unique
+                        )
+                        matcher = None
+                        args.unique = False
+                    elif isinstance(items, collections.Mapping):
+                        args.items = items
+                    else:
+                        args.items = list(items)
+            finally:
+                if args.input_file is not None:
+                    args.input_file.close()
+        args.pattern = matcher
         return args
 
+    @staticmethod
+    def read_items(
+        input_stream, matcher=None, column=None, delimiter=None,
+        short_lines='error', null=False
+    ):
+        """
+        Read the items from `input_stream` and return a 2-element tuple of an
+        iterator of the decoded items and the matcher that still needs to be
+        applied to them (or `None` if filtering was already done).
+
+        `matcher` should be a `NameMatcher` or `None`. Non-matching lines are
+        dropped before decoding them if that gives the same result.
+
+        `column` is the index of the column to extract from each line or `None`
+        in order to use whole lines. It may also be a pair of indices. In that
+        case, the items are returned as a mapping of the first column's content
+        to the second column's content. Like with `dict`, the last value of a
+        repeated key wins while the key keeps its first position.
+
+        `delimiter` and `short_lines` are passed to `helpers.get_column()`.
+
+        If `null` is `True` then the input is split at NUL-characters instead
+        of newlines and no whitespace is stripped from the items.
+        """
+        encoding = config.ENCODING
+        is_binary = not isinstance(input_stream, io.TextIOBase)
+        if delimiter is not None and is_binary:
+            if not isinstance(delimiter, bytes):
+                delimiter = delimiter.encode(encoding)
+        read = helpers.read_records if null else helpers.read_lines
+        if isinstance(column, tuple):
+            lines = read(input_stream)
+            pairs = helpers.get_columns(
+                column, lines, delimiter, short_lines
+            )
+            items = collections.OrderedDict(
+                helpers.get_strings(pair, encoding) for pair in pairs
+            )
+            return items, matcher
+        bytes_matcher = None
+        if matcher is not None and is_binary:
+            bytes_matcher = matcher.get_bytes_matcher(encoding)
+        if column is None and bytes_matcher is None:
+            # Decode whole blocks instead of each line on its own
+            return read(input_stream, encoding=encoding), matcher
+        items = read(input_stream)
+        if column is not None:
+            items = helpers.run_stage(
+                'split', helpers.get_column, column, items, delimiter,
+                short_lines
+            )
+        if bytes_matcher is not None:
+            items = helpers.run_stage('filter', bytes_matcher.filter, items)
+            matcher = None
+        items = helpers.run_stage(
+            'decode', helpers.get_strings, items, encoding
+        )
+        return items, matcher
+
+    def index_lines(self, input_stream, matcher=None, make_unique=False):
+        """
+        Return a `helpers.IndexedLines`-instance for the regular file behind
+        `input_stream`. See its documentation for the meaning of `matcher` and
+        `make_unique`.
+        """
+        try:
+            return helpers.run_stage(
+                'read', helpers.IndexedLines, input_stream, config.ENCODING,
+                matcher, make_unique
+            )
+        except (NotImplementedError, ValueError) as exc:
+            self.error('can\'t use --two-pass: {}'.format(exc))
+
+    def make_store(self, items, matcher=None, make_unique=False):
+        """
+        Return a `helpers.ItemStore` holding the elements of `items` that are
+        accepted by `matcher` (if not `None`). If `make_unique` is `True` then
+        only the first occurrence of each item is stored. The seen items are
+        tracked by a `helpers.DigestSet` in order to keep memory usage low.
+        """
+        if matcher is not None:
+            items = helpers.run_stage('filter', matcher.filter, items)
+        try:
+            if make_unique:
+                items = helpers.run_stage(
+                    'dedup', helpers.make_unique, items,
+                    seen=helpers.DigestSet()
+                )
+            return helpers.ItemStore(items, config.ENCODING)
+        except NotImplementedError as exc:
+            self.error('can\'t use --low-memory: {}'.format(exc))
 
 def main(
     args=None, prog_name='shcol', version=__version__,
-    output_stream=config.TERMINAL_STREAM
+    output_stream=config.TERMINAL_STREAM, input_stream=config.INPUT_STREAM,
+    error_stream=config.ERROR_STREAM, line_width=None
 ):
     """
     Parse command-line arguments and invoke `highlevel.print_columnized()`
@@ -177,23 +424,60 @@ def main(
     `version` should be a string containing the program's version.
 
     `output_stream` should be a writable file-like object that is used to print
-    the result of columnizing.
+    the result of columnizing. `input_stream` and `error_stream` are used as
+    standard input and standard error.
+
+    `line_width` is used if no width was given on the command-line. If this is
+    `None` then the width of the terminal is used.
 
     If an exception occurs during running this function then its message (if
     any) will be written to standard error and the interpreter is requested to
     shut down (i.e. it exits with an error code if `SystemExit` is not caught).
     """
-    parser = ArgumentParser(prog_name, version)
+    parser = ArgumentParser(
+        prog_name, version, input_stream, output_stream, error_stream
+    )
     try:
         args = parser.parse_args(args)
-        highlevel.print_columnized(
-            args.items, spacing=args.spacing, line_width=args.width,
-            extra_sep=args.extra_sep, pattern=args.pattern,
-            make_unique=args.unique, sort_items=args.sort,
-            output_stream=output_stream
-        )
+        if args.serve:
+            from . import daemon
+            daemon.serve()
+            return
+        if args.width is None:
+            args.width = line_width
+        if args.stats is None:
+            print_items(args, output_stream)
+        else:
+            with helpers.collecting_stats(args.stats):
+                print_items(args, output_stream)
+            args.stats.stop()
+            if args.stats_format == 'json':
+                error_stream.write(args.stats.to_json() + '\n')
+            else:
+                error_stream.write(args.stats.format() + '\n')
     except KeyboardInterrupt:
         parser.exit(1)
     except Exception as exc:
+        import traceback
         config.LOGGER.error(traceback.format_exc())
         parser.error(exc)
+
+def print_items(args, output_stream):
+    """
+    Print the items of the parsed command-line arguments `args` to
+    `output_stream`.
+    """
+    if args.print0:
+        highlevel.print_records(
+            args.items, pattern=args.pattern, make_unique=args.unique,
+            sort_items=args.sort, output_stream=output_stream
+        )
+        return
+    highlevel.print_columnized(
+        args.items, spacing=args.spacing, line_width=args.width,
+        extra_sep=args.extra_sep, pattern=args.pattern,
+        make_unique=args.unique, sort_items=args.sort,
+        output_stream=output_stream
+    )
+    if isinstance(args.items, (helpers.ItemStore, helpers.IndexedLines)):
+        args.items.close()
@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2013-2016, Sebastian Linke
+
+# Released under the Simplified BSD license
+# (see LICENSE file for details).
+
+"""
+A thin client for the `shcol`-daemon (see `shcol.daemon`).
+
+Running ``shcol`` in a shell pipeline spends most of its time on starting the
+interpreter and importing modules. A daemon started via ``shcol --serve``
+keeps everything loaded. The client only imports a few small modules, sends
+its arguments, standard input and terminal width to the daemon and writes the
+output it receives. If no daemon is reachable then the client runs `shcol`
+in-process as usual.
+
+Messages are exchanged as frames consisting of a one-byte type, the length of
+the payload as a 4-byte big-endian integer and the payload itself.
+"""
+
+import os
+import socket
+import struct
+import sys
+
+from . import __version__, config
+
+__all__ = ['get_socket_path', 'connect', 'run', 'main']
+
+# Sent by the client
+REQUEST = b'A'
+DATA = b'D'
+
+# Sent by the daemon
+STDOUT = b'O'
+STDERR = b'E'
+NEED_INPUT = b'I'
+EXIT = b'X'
+REFUSED = b'R'
+
+HEADER = struct.Struct('>cI')
+CHUNK_SIZE = 65536
+
+# Handles arguments that could not be decoded by the interpreter
+ERRORS = 'surrogateescape' if config.PY_VERSION >= (3, 0) else 'strict'
+
+def get_socket_path():
+    """
+    Return the path of the per-user socket that the daemon listens on.
+
+    The path may be set via the environment variable ``SHCOL_SOCKET``.
+    Otherwise, the socket is placed in ``$XDG_RUNTIME_DIR`` (or in the
+    directory for temporary files if that is not set).
+    """
+    path = os.environ.get('SHCOL_SOCKET')
+    if path:
+        return path
+    directory = (
+        os.environ.get('XDG_RUNTIME_DIR') or os.environ.get('TMPDIR') or '/tmp'
+    )
+    user_id = os.getuid() if hasattr(os, 'getuid') else 0
+    return os.path.join(directory, 'shcol-{}.sock'.format(user_id))
+
+def encode_request(args, cwd, width, encoding):
+    """
+    Return the payload of a request for running `shcol` with the command-line
+    arguments `args` in the working directory `cwd`.
+
+    `width` should be the width of the client's terminal or `None`.
+
+    `encoding` defines the codec used by the client's standard output.
+
+    The fields are separated by NUL-characters, since these cannot be part of
+    the arguments. This is also much faster to import than `json`.
+    """
+    fields = [__version__, cwd, str(width or ''), encoding] + list(args)
+    return b'\0'.join(
+        field if isinstance(field, bytes) else field.encode('utf-8', ERRORS)
+        for field in fields
+    )
+
+def decode_request(payload):
+    """
+    Return a dictionary containing the fields of a request that was encoded
+    by `encode_request()`. Its keys are "version", "cwd", "width", "encoding"
+    and "args".
+    """
+    fields = [field.decode('utf-8', ERRORS) for field in payload.split(b'\0')]
+    version, cwd, width, encoding = fields[:4]
+    return {
+        'version': version,
+        'cwd': cwd,
+        'width': int(width) if width else None,
+        'encoding': encoding,
+        'args': fields[4:],
+    }
+
+def write_frame(stream, kind, payload=b''):
+    """
+    Write a frame of the type `kind` containing the byte string `payload` to
+    the binary file-like object `stream`.
+    """
+    stream.write(HEADER.pack(kind, len(payload)) + payload)
+    stream.flush()
+
+def read_frame(stream):
+    """
+    Read a frame from the binary file-like object `stream` and return a
+    2-element tuple of its type and its payload.
+
+    `EOFError` is raised if the stream ends before a complete frame was read.
+    """
+    header = read_exactly(stream, HEADER.size)
+    kind, size = HEADER.unpack(header)
+    return kind, read_exactly(stream, size)
+
+def read_exactly(stream, size):
+    """
+    Read and return exactly `size` bytes from `stream`.
+    """
+    data = stream.read(size)
+    if len(data) != size:
+        raise EOFError('connection closed unexpectedly')
+    return data
+
+def connect(socket_path=None):
+    """
+    Return a socket that is connected to the daemon or `None` if no daemon is
+    reachable.
+
+    `socket_path` defines the path of the socket. If this is `None` then the
+    result of `get_socket_path()` is used.
+
+    Sockets that are not owned by the current user are ignored.
+    """
+    if not hasattr(socket, 'AF_UNIX') or not hasattr(os, 'getuid'):
+        return None
+    if socket_path is None:
+        socket_path = get_socket_path()
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        if os.stat(socket_path).st_uid != os.getuid():
+            sock.close()
+            return None
+        sock.connect(socket_path)
+    except (OSError, socket.error):
+        sock.close()
+        return None
+    return sock
+
+def get_terminal_width(stream):
+    """
+    Return the width of the terminal connected to `stream` or `None` if it is
+    not connected to a terminal (or if its width could not be detected).
+
+    Python 2 lacks `os.get_terminal_size()`. The width is queried via the
+    ``TIOCGWINSZ``-ioctl in that case, which is much cheaper to import than
+    `shcol.helpers.termwidth`.
+    """
+    try:
+        if not stream.isatty():
+            return None
+        fileno = stream.fileno()
+        if hasattr(os, 'get_terminal_size'):
+            return os.get_terminal_size(fileno).columns or None
+        import fcntl
+        import termios
+        win_size = fcntl.ioctl(fileno, termios.TIOCGWINSZ, b'\0' * 8)
+    except (AttributeError, ImportError, IOError, OSError, ValueError):
+        return None
+    return struct.unpack('hhhh', win_size)[1] or None
+
+def is_terminal(stream):
+    """
+    Return whether `stream` is connected to a terminal.
+    """
+    try:
+        return stream.isatty()
+    except (AttributeError, ValueError):
+        return False
+
+def run(sock, args, stdin=None, stdout=None, stderr=None):
+    """
+    Let the daemon behind the connected socket `sock` process the command-line
+    arguments `args` and return the resulting exit code. `None` is returned
+    if the daemon refused the request (e.g. because it runs another version
+    of `shcol`) or if the connection was lost before the daemon sent anything.
+    This is also done without contacting the daemon if `stdout` is a terminal
+    of unknown width. No output was written in any of these cases. If the
+    connection is lost later on then an error message is written to `stderr`
+    and `SystemExit` is raised.
+
+    `stdin` is read by the daemon when it needs input. `stdout` and `stderr`
+    receive the daemon's output. All of them must be binary file-like objects.
+    If one of them is `None` then the corresponding stream of `sys` is used.
+
+    The socket is closed when the daemon is done.
+    """
+    stdin = stdin or getattr(sys.stdin, 'buffer', sys.stdin)
+    stdout = stdout or getattr(sys.stdout, 'buffer', sys.stdout)
+    stderr = stderr or getattr(sys.stderr, 'buffer', sys.stderr)
+    encoding = getattr(sys.stdout, 'encoding', None) or 'utf-8'
+    width = get_terminal_width(stdout)
+    if width is None and is_terminal(stdout):
+        # The daemon could not detect the width on its own
+        sock.close()
+        return None
+    request = encode_request(args, os.getcwd(), width, encoding)
+    writer = sock.makefile('wb')
+    reader = sock.makefile('rb')
+    is_answered = False
+    try:
+        write_frame(writer, REQUEST, request)
+        while True:
+            kind, payload = read_frame(reader)
+            is_answered = True
+            if kind == STDOUT:
+                stdout.write(payload)
+            elif kind == STDERR:
+                stderr.write(payload)
+            elif kind == NEED_INPUT:
+                send_input(writer, stdin)
+            elif kind == EXIT:
+                stdout.flush()
+                stderr.flush()
+                return int(payload)
+            elif kind == REFUSED:
+                return None
+            else:
+                raise ValueError('unknown frame type: {!r}'.format(kind))
+    except (EOFError, socket.error) as exc:
+        if not is_answered:
+            return None
+        msg = 'shcol: lost connection to daemon: {}\n'.format(exc)
+        stderr.write(msg.encode('utf-8'))
+        stderr.flush()
+        sys.exit(1)
+    finally:
+        writer.close()
+        reader.close()
+        sock.close()
+
+def send_input(writer, stdin):
+    """
+    Send the content of `stdin` to the daemon. An empty frame marks the end
+    of input.
+    """
+    read = getattr(stdin, 'read1', stdin.read)
+    for chunk in iter(lambda: read(CHUNK_SIZE), b''):
+        write_frame(writer, DATA, chunk)
+    write_frame(writer, DATA)
+
+def main(args=None, socket_path=None):
+    """
+    Run `shcol` with the command-line arguments `args` (or `sys.argv[1:]` if
+    this is `None`) via the daemon listening on `socket_path`. See `connect()`
+    for details on `socket_path`.
+
+    If no daemon is reachable (or if it refused the request or went away
+    before answering) then `cli.main()` is invoked instead.
+    """
+    if args is None:
+        args = sys.argv[1:]
+    if '--serve' not in args:
+        sock = connect(socket_path)
+        if sock is not None:
+            exit_code = run(sock, args)
+            if exit_code is not None:
+                sys.exit(exit_code)
+    from . import cli
+    cli.main(args)
@@ -9,7 +9,6 @@ Constants that are used by `shcol` in many places. This is meant to modified (if
 needed) only *before* running `shcol`, since most of these constants are only
 read during initialization of the `shcol`-package.
 """
-import logging
 import os
 import sys
 
@@ -19,8 +18,8 @@ INPUT_STREAM = sys.stdin
 LINE_WIDTH = None
 LINE_WIDTH_FALLBACK = 80
 LINESEP = '\n'
-LOGGER = logging.getLogger('shol')
 MAKE_UNIQUE = False
+MAX_WORKERS = 8
 ON_WINDOWS = 'windows' in os.getenv('os', '').lower()
 PY_VERSION = sys.version_info[:2]
 SORT_ITEMS = False
@@ -30,3 +29,16 @@ TERMINAL_STREAM = sys.stdout
 UNICODE_TYPE = type(u'')
 
 ENCODING = getattr(TERMINAL_STREAM, 'encoding', 'utf-8')
+
+if PY_VERSION >= (3, 7):
+    def __getattr__(name):
+        if name != 'LOGGER':
+            msg = 'module {!r} has no attribute {!r}'
+            raise AttributeError(msg.format(__name__, name))
+        import logging
+        global LOGGER
+        LOGGER = logging.getLogger('shol')
+        return LOGGER
+else:
+    import logging
+    LOGGER = logging.getLogger('shol')
@@ -9,11 +9,18 @@ Classes and functions providing the core functionality of `shcol`.
 """
 
 import collections
+import copy
 
 from .. import config, helpers
 from . import formatters
 
-__all__ = ['formatters', 'columnize']
+__all__ = [
+    'formatters', 'columnize', 'columnize_lines', 'columnize_file',
+    'columnize_many', 'columnize_groups'
+]
+
+PARALLEL_THRESHOLD = 100000
+CHUNK_SIZE = 64
 
 def columnize(
     items, spacing=config.SPACING, line_width=config.LINE_WIDTH,
@@ -40,7 +47,10 @@ def columnize(
 
     If `pattern` is not `None` then it is meant to be an expression that is
     free to make use of shell-like file matching mechanisms for matching a
-    subset of `items` (e.g. "x*" to match all items starting with "x").
+    subset of `items` (e.g. "x*" to match all items starting with "x"). It may
+    also be a sequence of such expressions (an item then needs to match at
+    least one of them) or a `helpers.NameMatcher`-instance, which supports
+    exclude patterns, case-insensitive matching and regular expressions.
 
     If `make_unique` is `True` then only the first occurrence of an item is
     processed and any other occurrences of that item are ignored.
@@ -53,17 +63,199 @@ def columnize(
      `output_stream` defines the stream where the result should be written to.
     """
     if make_unique and not isinstance(items, collections.Mapping):
-        items = helpers.make_unique(items)
+        items = helpers.run_stage('dedup', helpers.make_unique, items)
+    formatter = get_formatter(
+        items, spacing, line_width, extra_sep, output_stream
+    )
+    return formatter.format(items, pattern=pattern, sort_items=sort_items)
+
+def columnize_lines(
+    items, spacing=config.SPACING, line_width=config.LINE_WIDTH,
+    extra_sep=config.EXTRA_SEP, pattern=None, make_unique=config.MAKE_UNIQUE,
+    sort_items=config.SORT_ITEMS, output_stream=config.TERMINAL_STREAM
+):
+    """
+    Like `columnize()` but return an iterator that yields the columnized lines
+    including their line breaks. A line is not formatted before it is
+    requested. This is useful for writing the result of huge inputs (e.g. a
+    `helpers.ItemStore`) piece by piece.
+
+    See `columnize()` for the meaning of the arguments.
+    """
+    if make_unique and not isinstance(items, collections.Mapping):
+        items = helpers.run_stage('dedup', helpers.make_unique, items)
+    formatter = get_formatter(
+        items, spacing, line_width, extra_sep, output_stream
+    )
+    return formatter.iter_lines(items, pattern=pattern, sort_items=sort_items)
+
+def columnize_file(
+    source, spacing=config.SPACING, line_width=config.LINE_WIDTH,
+    extra_sep=config.EXTRA_SEP, pattern=None, make_unique=config.MAKE_UNIQUE,
+    output_stream=config.TERMINAL_STREAM, encoding=config.ENCODING
+):
+    """
+    Return an iterator that yields the columnized lines (including their line
+    breaks) for the lines of the regular file `source`. `source` may be a path
+    or a binary file object.
+
+    The file is processed in two passes: The first pass only measures the
+    lines and the second pass reads the lines of each row again when that row
+    is written. Hence, memory usage depends on the number of lines but not on
+    their length. Sorting is not supported in this mode.
+
+    `encoding` defines the file's encoding. It must be ASCII-compatible. See
+    `columnize()` for the meaning of the other arguments.
+    """
+    if isinstance(source, (config.UNICODE_TYPE, str)):
+        with open(source, 'rb') as stream:
+            items = helpers.IndexedLines(
+                stream, encoding, pattern, make_unique
+            )
+    else:
+        items = helpers.IndexedLines(source, encoding, pattern, make_unique)
+    lines = columnize_lines(
+        items, spacing, line_width, extra_sep, make_unique=False,
+        output_stream=output_stream
+    )
+    return iter_and_close(lines, items)
+
+def iter_and_close(iterable, resource):
+    """
+    Yield the elements of `iterable` and close `resource` afterwards.
+    """
+    try:
+        for element in iterable:
+            yield element
+    finally:
+        resource.close()
+
+def get_formatter(
+    items, spacing=config.SPACING, line_width=config.LINE_WIDTH,
+    extra_sep=config.EXTRA_SEP, output_stream=config.TERMINAL_STREAM
+):
+    """
+    Return a formatter instance that is suitable for `items`. See `columnize()`
+    for the meaning of the other arguments.
+    """
     formatter_class = formatters.find_formatter(items)
+    return make_formatter(
+        formatter_class, spacing, line_width, extra_sep, output_stream
+    )
+
+def make_formatter(
+    formatter_class, spacing=config.SPACING, line_width=config.LINE_WIDTH,
+    extra_sep=config.EXTRA_SEP, output_stream=config.TERMINAL_STREAM
+):
+    """
+    Return an instance of `formatter_class`. See `columnize()` for the meaning
+    of the other arguments.
+    """
     if line_width is None:
         try:
-            formatter = formatter_class.for_terminal(
+            return formatter_class.for_terminal(
                 output_stream, spacing, extra_sep
             )
         except (IOError, OSError):
             raise OSError('unable to detect line width')
-    else:
-        formatter = formatter_class.for_line_config(
-            spacing, line_width, extra_sep
+    return formatter_class.for_line_config(spacing, line_width, extra_sep)
+
+def columnize_many(
+    item_lists, spacing=config.SPACING, line_width=config.LINE_WIDTH,
+    extra_sep=config.EXTRA_SEP, pattern=None, make_unique=config.MAKE_UNIQUE,
+    sort_items=config.SORT_ITEMS, output_stream=config.TERMINAL_STREAM,
+    executor=None, threshold=PARALLEL_THRESHOLD, chunk_size=CHUNK_SIZE
+):
+    """
+    Return a list of columnized strings, one for each element of `item_lists`
+    in the same order. Each element may be a sequence or a dictionary. It is
+    columnized in the same way as `columnize()` would do it.
+
+    Calling this function is faster than calling `columnize()` for each
+    element, since the arguments are validated only once and formatters (and
+    their cached line templates) are shared.
+
+    `executor` may be a `concurrent.futures.Executor`-instance. If it is given
+    and if the elements of `item_lists` hold at least `threshold` items in
+    total, then the elements are columnized by the executor in chunks of
+    `chunk_size` elements. A process pool requires the items to be picklable.
+
+    See `columnize()` for the meaning of the other arguments.
+    """
+    item_lists = list(item_lists)
+    prototypes = dict(
+        (formatter_class, make_formatter(
+            formatter_class, spacing, line_width, extra_sep, output_stream
+        ))
+        for formatter_class in (
+            formatters.IterableFormatter, formatters.MappingFormatter
         )
-    return formatter.format(items, pattern=pattern, sort_items=sort_items)
+    )
+    options = (pattern, make_unique, sort_items)
+    num_items = sum(
+        len(items) for items in item_lists if hasattr(items, '__len__')
+    )
+    if executor is None or num_items < threshold:
+        return columnize_chunk(item_lists, prototypes, *options)
+    chunk_size = helpers.num(chunk_size)
+    futures = [
+        executor.submit(
+            columnize_chunk, item_lists[start:start + chunk_size],
+            # Formatters are not thread-safe
+            copy.deepcopy(prototypes), *options
+        )
+        for start in range(0, len(item_lists), chunk_size)
+    ]
+    return [result for future in futures for result in future.result()]
+
+def columnize_chunk(item_lists, prototypes, pattern, make_unique, sort_items):
+    """
+    Return a list of columnized strings for the elements of `item_lists`.
+
+    `prototypes` should be a dictionary that maps each formatter class to the
+    formatter instance to be used for the elements needing such a formatter.
+    """
+    results = []
+    for items in item_lists:
+        formatter = prototypes[formatters.find_formatter(items)]
+        if make_unique and not isinstance(items, collections.Mapping):
+            items = helpers.make_unique(items)
+        results.append(
+            formatter.format(items, pattern=pattern, sort_items=sort_items)
+        )
+    return results
+
+def columnize_groups(
+    item_groups, spacing=config.SPACING, line_width=config.LINE_WIDTH,
+    extra_sep=config.EXTRA_SEP, pattern=None, make_unique=config.MAKE_UNIQUE,
+    sort_items=config.SORT_ITEMS, output_stream=config.TERMINAL_STREAM
+):
+    """
+    Return a list of columnized strings, one for each sequence of items in
+    `item_groups`. In contrast to calling `columnize()` for each sequence, the
+    resulting strings share the same column widths. Hence, their columns will
+    line up when the strings are printed one after another.
+
+    The groups must not be mappings. `TypeError` is raised otherwise.
+
+    See `columnize()` for the meaning of the other arguments.
+    """
+    groups = []
+    formatter = make_formatter(
+        formatters.IterableFormatter, spacing, line_width, extra_sep,
+        output_stream
+    )
+    for items in item_groups:
+        if isinstance(items, collections.Mapping):
+            raise TypeError('columnize_groups() does not support mappings')
+        items = formatter.prepare_items(
+            items, pattern, sort_items, make_unique
+        )
+        groups.append(list(items))
+    all_props = formatter.get_shared_line_properties(groups)
+    return [
+        ''.join(
+            formatter.make_lines(items, add_line_breaks=True, props=props)
+        ).rstrip(formatter.linesep)
+        for items, props in zip(groups, all_props)
+    ]
@@ -84,7 +84,11 @@ class ColumnWidthCalculator(object):
 
         The members of the tuple are: `column_widths`, `spacing`, `num_lines`.
         """
-        item_widths = [len(item) for item in items]
+        item_widths = helpers.get_item_widths(items)
+        stats = helpers.get_stats_collector()
+        if stats is not None:
+            stats.count('items', len(item_widths))
+            stats.count('characters', sum(item_widths))
         cfg = self.calculate_columns(item_widths)
         return LineProperties(cfg.column_widths, self.spacing, cfg.num_lines)
 
@@ -111,6 +115,67 @@ class ColumnWidthCalculator(object):
             else:
                 raise
 
+    def calculate_shared_columns(self, item_widths_groups):
+        """
+        Calculate one column configuration for each sequence of item widths in
+        `item_widths_groups` so that all configurations use the same column
+        widths. This is useful when multiple groups of items are columnized
+        one after another and their columns should line up.
+
+        The result is returned as a list of named tuples as described for
+        `calculate_columns()`. The number of lines may differ per group.
+        """
+        item_widths_groups = list(item_widths_groups)
+        if not any(item_widths_groups):
+            return [ColumnConfig([], 0) for _ in item_widths_groups]
+        if self.num_columns is not None:
+            max_columns = self.num_columns
+        else:
+            max_columns = max(
+                self.calculate_max_columns(item_widths)
+                for item_widths in item_widths_groups
+            )
+        while max_columns > 0:
+            configs = [
+                self.get_unchecked_column_config(item_widths, max_columns)
+                if item_widths else ColumnConfig([], 0)
+                for item_widths in item_widths_groups
+            ]
+            column_widths = self.merge_column_widths(
+                cfg.column_widths for cfg in configs
+            )
+            if self.fits_in_line(column_widths):
+                break
+            if self.num_columns is not None:
+                if self.min_shrink_width is None:
+                    raise LineTooSmallError
+                column_widths = self.shrink_column_widths(column_widths)
+                break
+            max_columns = len(column_widths) - 1
+        else:
+            if not (self.allow_exceeding and self.num_columns in (None, 1)):
+                raise LineTooSmallError
+            return [
+                ColumnConfig([self.line_width], len(item_widths))
+                for item_widths in item_widths_groups
+            ]
+        return [ColumnConfig(column_widths, cfg.num_lines) for cfg in configs]
+
+    @staticmethod
+    def merge_column_widths(column_widths_seq):
+        """
+        Return a list that holds the maximal width for each column position of
+        the column widths in `column_widths_seq`.
+        """
+        merged = []
+        for column_widths in column_widths_seq:
+            for i, width in enumerate(column_widths):
+                if i < len(merged):
+                    merged[i] = max(merged[i], width)
+                else:
+                    merged.append(width)
+        return merged
+
     def get_column_config(self, item_widths):
         """
         Return a column configuration based on `item_widths`.
@@ -134,11 +199,23 @@ class ColumnWidthCalculator(object):
         Return a column configuration for given `item_widths` that fits into the
         maximal line width of this instance. Raise `LineTooSmallError` if no
         fitting configuration was found.
+
+        The number of tried configurations is counted as "layout_candidates"
+        if statistics are collected (see `helpers.collecting_stats()`). Each
+        configuration is also reported to the tracer if one is installed (see
+        `helpers.set_tracer()`).
         """
+        stats = helpers.get_stats_collector()
+        tracer = helpers.get_tracer()
         max_columns = self.calculate_max_columns(item_widths)
         while max_columns > 0:
             cfg = self.get_unchecked_column_config(item_widths, max_columns)
-            if self.fits_in_line(cfg.column_widths):
+            fits = self.fits_in_line(cfg.column_widths)
+            if stats is not None:
+                stats.count('layout_candidates')
+            if tracer is not None:
+                tracer.layout_candidate(cfg.column_widths, cfg.num_lines, fits)
+            if fits:
                 return cfg
             max_columns = len(cfg.column_widths) - 1
         raise LineTooSmallError
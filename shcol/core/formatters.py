@@ -14,6 +14,8 @@ __all__ = [
     'find_formatter', 'make_formatter', 'IterableFormatter', 'MappingFormatter'
 ]
 
+TEMPLATE_CACHE_SIZE = 1024
+
 def find_formatter(items):
     """
     Return an appropriated formatter class based on the type of `items`.
@@ -75,6 +77,7 @@ class IterableFormatter(object):
         self.linesep = linesep
         self.encoding = encoding
         self.wrapsep = linesep if wrap_lines else ''
+        self.template_cache = {}
 
     def __repr__(self):
         attrs = ['calculator', 'extra_sep', 'linesep', 'encoding', 'wrapsep']
@@ -178,22 +181,59 @@ class IterableFormatter(object):
 
         If `pattern` is not `None` then it is meant to be an expression that is
         free to make use of shell-like file matching mechanisms for matching a
-        subset of `items` (e.g. "x*" to match all items starting with "x").
+        subset of `items` (e.g. "x*" to match all items starting with "x"). See
+        `helpers.filter_names()` for other supported kinds of patterns.
 
         `sort_items` should be a boolean defining whether `items` should be
         sorted before they are columnized.
         """
+        lines = self.iter_lines(items, pattern, sort_items)
+        return ''.join(lines).rstrip(self.linesep)
+
+    def iter_lines(self, items, pattern=None, sort_items=config.SORT_ITEMS):
+        """
+        Like `.format()` but return an iterator that yields the columnized
+        lines including their line breaks. Lines are formatted on demand. This
+        avoids holding the whole result in memory.
+        """
+        items = self.prepare_items(items, pattern, sort_items)
+        return helpers.run_stage(
+            'render', self.make_lines, items, add_line_breaks=True
+        )
+
+    def prepare_items(
+        self, items, pattern=None, sort_items=config.SORT_ITEMS,
+        make_unique=False
+    ):
+        """
+        Return `items` in the form that is passed to `.make_lines()`, i.e.
+        filtered by `pattern` (if not `None`), sorted (if `sort_items` is
+        `True`) and converted to Unicode strings.
+
+        If `make_unique` is `True` then only the first occurrence of an item
+        is kept. This does not apply to mappings.
+        """
+        if make_unique and not isinstance(items, collections.Mapping):
+            items = helpers.run_stage('dedup', helpers.make_unique, items)
         if pattern is not None:
-            items = self.filter_names(items, pattern)
+            items = helpers.run_stage(
+                'filter', self.filter_names, items, pattern
+            )
         if sort_items:
-            items = self.get_sorted(items)
-        lines = self.make_lines(self.get_strings(items), add_line_breaks=True)
-        return ''.join(lines).rstrip(self.linesep)
+            items = helpers.run_stage('sort', self.get_sorted, items)
+        return helpers.run_stage('decode', self.get_strings, items)
 
     def get_strings(self, items):
         """
         Return a Unicode version of `items`.
+
+        Note that `items` is returned as-is if it provides an `.item_widths`-
+        attribute (like `MeasuredItems`, `ItemStore`, `PackedItems` and
+        `IndexedLines` do), since such sequences already consist of Unicode
+        strings.
         """
+        if getattr(items, 'item_widths', None) is not None:
+            return items
         return helpers.get_strings(items, self.encoding)
 
     @staticmethod
@@ -215,16 +255,20 @@ class IterableFormatter(object):
         """
         return helpers.get_sorted(items)
 
-    def make_lines(self, items, add_line_breaks=False):
+    def make_lines(self, items, add_line_breaks=False, props=None):
         """
         Return columnized lines for `items` yielded by an iterator.
 
         If `add_line_breaks` is `True` then extra newline characters will be
         appended to the end of the resulting lines.
+
+        `props` may be a `LineProperties`-instance to be used for `items`. If
+        this is `None` then the line properties are calculated for `items`.
         """
         if isinstance(items, collections.Iterator):
             items = list(items)
-        props = self.get_line_properties(items)
+        if props is None:
+            props = self.get_line_properties(items)
         line_chunks = self.make_line_chunks(items, props)
         lines = self.iter_formatted_lines(line_chunks, props)
         if add_line_breaks:
@@ -238,18 +282,23 @@ class IterableFormatter(object):
         If the `.autowrap`-attribute of this formatter is set to `True` then
         lines, which exactly match the formatter's line width, will *not* get
         a line break. This avoids an undesired empty line after those lines.
-        """
-        template = 'adding line breaks (linesep: {!r}, wrapsep: {!r})'
-        config.LOGGER.debug(template.format(self.linesep, self.wrapsep))
+
+        The lines are reported to the tracer if one is installed (see
+        `helpers.set_tracer()`).
+        """
+        line_width = self.calculator.line_width
+        linesep, wrapsep = self.linesep, self.wrapsep
+        tracer = helpers.get_tracer()
+        if tracer is None:
+            for line in lines:
+                yield line + (wrapsep if len(line) == line_width else linesep)
+            return
+        tracer.rendering_started(linesep, wrapsep)
         for lineno, line in enumerate(lines, 1):
-            if len(line) == self.calculator.line_width:
-                msg = 'adding wrapsep to line {}'.format(lineno)
-                line += self.wrapsep
-            else:
-                msg = 'adding linesep to line {}'.format(lineno)
-                line += self.linesep
-            config.LOGGER.debug(msg)
-            yield line
+            tracer.row_rendered(lineno, line)
+            wrapped = len(line) == line_width
+            tracer.line_break_added(lineno, wrapped)
+            yield line + (wrapsep if wrapped else linesep)
 
     def get_line_properties(self, items):
         """
@@ -260,11 +309,37 @@ class IterableFormatter(object):
         if self.extra_sep is not None and self.calculator.spacing % 2 == 0:
             self.calculator.spacing += 1
             increased_spacing = True
-        props = self.calculator.get_line_properties(items)
+        props = helpers.run_stage(
+            'layout', self.calculator.get_line_properties, items
+        )
         if increased_spacing:
             self.calculator.spacing -= 1
         return props
 
+    def get_shared_line_properties(self, item_groups):
+        """
+        Return a list of `LineProperties`-instances, one for each group of
+        items in `item_groups`. All of them will share the same column widths.
+        Hence, the columns of the groups line up when they are written one
+        after another. Each group should be a sequence of strings.
+        """
+        increased_spacing = False
+        if self.extra_sep is not None and self.calculator.spacing % 2 == 0:
+            self.calculator.spacing += 1
+            increased_spacing = True
+        spacing = self.calculator.spacing
+        try:
+            configs = self.calculator.calculate_shared_columns(
+                helpers.get_item_widths(items) for items in item_groups
+            )
+        finally:
+            if increased_spacing:
+                self.calculator.spacing -= 1
+        return [
+            columncalc.LineProperties(cfg.column_widths, spacing, cfg.num_lines)
+            for cfg in configs
+        ]
+
     @staticmethod
     def make_line_chunks(items, props):
         """
@@ -272,10 +347,13 @@ class IterableFormatter(object):
         each line meant to be used in a formatted string. Note that the result
         depends on the value of `props.num_lines` where `props` should be a
         `LineProperties`-instance.
+
+        The tuples are created on demand. Hence, only the items of the line
+        that is currently being formatted are accessed.
         """
-        return [
+        return (
             tuple(items[i::props.num_lines]) for i in range(props.num_lines)
-        ]
+        )
 
     def iter_formatted_lines(self, line_chunks, props):
         """
@@ -334,10 +412,18 @@ class IterableFormatter(object):
         should cover. If `None` is used then all items of `props.columns_widths`
         are taken into account. Otherwise, the resulting format string will only
         hold specifiers for the first `num_columns`.
+
+        Templates are cached by the formatter. Hence, formatting many inputs
+        with the same column widths only builds their template once.
         """
-        widths = props.column_widths[:num_columns]
+        widths = tuple(props.column_widths[:num_columns])
         if not widths:
             return ''
+        key = (widths, props.spacing, self.extra_sep)
+        try:
+            return self.template_cache[key]
+        except KeyError:
+            pass
         parts = [self.get_padded_template(width) for width in widths[:-1]]
         parts.append(self.get_unpadded_template(widths[-1]))
         if self.extra_sep is not None:
@@ -345,7 +431,10 @@ class IterableFormatter(object):
             sep = spacer + self.extra_sep + spacer
         else:
             sep = props.spacing * ' '
-        return sep.join(parts)
+        if len(self.template_cache) >= TEMPLATE_CACHE_SIZE:
+            self.template_cache.clear()
+        template = self.template_cache[key] = sep.join(parts)
+        return template
 
     @staticmethod
     def get_padded_template(width):
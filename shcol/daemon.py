@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2013-2016, Sebastian Linke
+
+# Released under the Simplified BSD license
+# (see LICENSE file for details).
+
+"""
+A daemon that keeps `shcol` loaded and runs its command-line interface on
+behalf of clients. Start it via ``shcol --serve``. See `shcol.client` for the
+client side.
+
+The daemon listens on a Unix domain socket that is only accessible by the
+current user. Each request is handled in a forked child process, so requests
+do not share any state and may even change the working directory.
+"""
+
+import io
+import os
+import stat
+
+try:
+    import socketserver
+except ImportError:
+    import SocketServer as socketserver
+
+from . import __version__, cli, client, config, core, helpers
+
+__all__ = ['Daemon', 'serve']
+
+class ClientInput(io.RawIOBase):
+    """
+    A binary stream reading the standard input of a client. The input is
+    requested from the client when the stream is read for the first time.
+    """
+    def __init__(self, reader, writer):
+        """
+        `reader` and `writer` should be binary file-like objects connected to
+        the client.
+        """
+        self.reader = reader
+        self.writer = writer
+        self.is_requested = False
+        self.at_eof = False
+        self.pending = b''
+
+    def readable(self):
+        return True
+
+    def readinto(self, buf):
+        if not self.is_requested:
+            client.write_frame(self.writer, client.NEED_INPUT)
+            self.is_requested = True
+        while not self.pending and not self.at_eof:
+            kind, payload = client.read_frame(self.reader)
+            if kind != client.DATA:
+                raise ValueError('unexpected frame type: {!r}'.format(kind))
+            self.pending = payload
+            self.at_eof = not payload
+        size = min(len(buf), len(self.pending))
+        buf[:size] = self.pending[:size]
+        self.pending = self.pending[size:]
+        return size
+
+
+class ClientOutput(object):
+    """
+    A text stream that sends written strings to a client. Output is buffered
+    and sent in frames of (at least) `client.CHUNK_SIZE` bytes.
+    """
+    def __init__(self, writer, kind, encoding):
+        """
+        `writer` should be a binary file-like object connected to the client.
+
+        `kind` defines the frame type (`client.STDOUT` or `client.STDERR`).
+
+        `encoding` defines the codec used to encode written strings.
+        """
+        self.writer = writer
+        self.kind = kind
+        self.encoding = encoding
+        self.chunks = []
+        self.size = 0
+
+    def write(self, text):
+        if not isinstance(text, bytes):
+            text = text.encode(self.encoding)
+        self.chunks.append(text)
+        self.size += len(text)
+        if self.size >= client.CHUNK_SIZE:
+            self.flush()
+
+    def flush(self):
+        if self.chunks:
+            client.write_frame(self.writer, self.kind, b''.join(self.chunks))
+            self.chunks = []
+            self.size = 0
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    """
+    Run the command-line interface for a client's request.
+    """
+    def handle(self):
+        try:
+            kind, payload = client.read_frame(self.rfile)
+        except EOFError:
+            # Connected only to check whether the daemon is running
+            return
+        request = None
+        if kind == client.REQUEST:
+            request = client.decode_request(payload)
+        if (
+            request is None or request['version'] != __version__
+            or '--serve' in request['args']
+        ):
+            client.write_frame(self.wfile, client.REFUSED)
+            return
+        os.chdir(request['cwd'])
+        encoding = request['encoding']
+        stdout = ClientOutput(self.wfile, client.STDOUT, encoding)
+        stderr = ClientOutput(self.wfile, client.STDERR, encoding)
+        stdin = io.BufferedReader(ClientInput(self.rfile, self.wfile))
+        exit_code = 0
+        try:
+            cli.main(
+                request['args'], output_stream=stdout, input_stream=stdin,
+                error_stream=stderr, line_width=request['width']
+            )
+        except SystemExit as exc:
+            exit_code = get_exit_code(exc.code, stderr)
+        stdout.flush()
+        stderr.flush()
+        exit_code = str(exit_code).encode('ascii')
+        client.write_frame(self.wfile, client.EXIT, exit_code)
+
+def get_exit_code(code, stderr):
+    """
+    Return the exit code for the `code` of a `SystemExit`-exception. A message
+    given as `code` is written to `stderr`.
+    """
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    stderr.write('{}\n'.format(code))
+    return 1
+
+
+class Daemon(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+    """
+    A server that listens on a Unix domain socket and handles each client in a
+    forked child process.
+    """
+    def __init__(self, socket_path=None):
+        """
+        Create the socket at `socket_path`. If this is `None` then the result
+        of `client.get_socket_path()` is used.
+
+        A left-over socket file is replaced if it is a socket owned by the
+        current user. `IOError` is raised if another daemon is already
+        listening on the socket or if some other file exists at `socket_path`.
+        """
+        if socket_path is None:
+            socket_path = client.get_socket_path()
+        sock = client.connect(socket_path)
+        if sock is not None:
+            sock.close()
+            msg = 'a daemon is already listening on {}'
+            raise IOError(msg.format(socket_path))
+        if os.path.lexists(socket_path):
+            if not is_own_socket(socket_path):
+                msg = 'refusing to replace {}: not a socket of the current user'
+                raise IOError(msg.format(socket_path))
+            os.remove(socket_path)
+        # Only the current user may connect
+        old_umask = os.umask(0o177)
+        try:
+            socketserver.UnixStreamServer.__init__(
+                self, socket_path, RequestHandler
+            )
+        finally:
+            os.umask(old_umask)
+
+    def server_close(self):
+        socketserver.UnixStreamServer.server_close(self)
+        if is_own_socket(self.server_address):
+            os.remove(self.server_address)
+
+def is_own_socket(path):
+    """
+    Return whether `path` is a socket that is owned by the current user.
+    Symbolic links are not followed.
+    """
+    try:
+        stat_result = os.lstat(path)
+    except OSError:
+        return False
+    return (
+        stat.S_ISSOCK(stat_result.st_mode)
+        and stat_result.st_uid == os.getuid()
+    )
+
+def preload():
+    """
+    Import all modules that may be needed when handling a request. Otherwise,
+    each child process would import them on its own.
+    """
+    for module_name in helpers.LAZY_NAMES:
+        getattr(helpers, module_name)
+    # Some modules are only imported when they are used
+    helpers.get_sorted(['spam', 'ham'])
+    core.columnize(['spam', 'ham'], line_width=config.LINE_WIDTH_FALLBACK)
+
+def serve(socket_path=None):
+    """
+    Run a daemon listening on `socket_path` until it is interrupted. See
+    `Daemon` for details.
+    """
+    daemon = Daemon(socket_path)
+    preload()
+    try:
+        daemon.serve_forever()
+    finally:
+        daemon.server_close()
@@ -8,5 +8,68 @@
 Various helpers used by the `shcol`-package and in its testsuite.
 """
 
-from .misc import *
-from .termwidth import *
+from .. import config, import_submodule
+
+# The submodules are imported on first access of one of their names (see
+# `shcol.LAZY_ATTRS` for the reasoning).
+LAZY_NAMES = {
+    'dedup': ['DigestSet', 'BloomFilter'],
+    'listing': [
+        'get_filenames', 'scan_filenames', 'get_listings', 'ListingCache',
+        'get_file_infos', 'sort_file_infos', 'format_size'
+    ],
+    'matching': ['NameMatcher', 'get_name_matcher', 'filter_names'],
+    'misc': [
+        'StringIO', 'get_strings', 'get_sorted', 'make_unique', 'num',
+        'get_lines', 'get_column', 'get_columns', 'make_object_repr',
+        'MeasuredItems', 'get_item_widths'
+    ],
+    'stats': [
+        'StatsCollector', 'get_stats_collector', 'collecting_stats',
+        'run_stage'
+    ],
+    'reading': [
+        'read_lines', 'read_packed_lines', 'read_records', 'map_file',
+        'IndexedLines'
+    ],
+    'store': ['ItemStore', 'PackedItems'],
+    'termwidth': [
+        'get_terminal_width_info', 'clear_terminal_width_cache',
+        'install_sigwinch_handler'
+    ],
+    'tracing': [
+        'Tracer', 'LoggingTracer', 'get_tracer', 'set_tracer', 'using_tracer'
+    ],
+}
+
+NAME_MODULES = dict(
+    (name, module_name)
+    for module_name, names in LAZY_NAMES.items() for name in names
+)
+
+if config.PY_VERSION >= (3, 7):
+    def __getattr__(name):
+        if name in LAZY_NAMES:
+            return import_submodule(__name__, name)
+        try:
+            module_name = NAME_MODULES[name]
+        except KeyError:
+            msg = 'module {!r} has no attribute {!r}'
+            raise AttributeError(msg.format(__name__, name))
+        value = getattr(import_submodule(__name__, module_name), name)
+        globals()[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(globals()) | set(LAZY_NAMES) | set(NAME_MODULES))
+else:
+    # No support for module-level `__getattr__()` (PEP 562)
+    from .dedup import *
+    from .listing import *
+    from .matching import *
+    from .misc import *
+    from .reading import *
+    from .stats import *
+    from .store import *
+    from .termwidth import *
+    from .tracing import *
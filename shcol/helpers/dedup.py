@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2013-2016, Sebastian Linke
+
+# Released under the Simplified BSD license
+# (see LICENSE file for details).
+
+"""
+Compact containers for remembering items that have already been seen. These
+are meant to be used as the `seen`-argument of `make_unique()` when the input
+is too large for keeping a `set()` of all distinct items in memory.
+"""
+
+import hashlib
+import math
+import struct
+
+from .. import config
+from .misc import make_object_repr, make_uint64_array
+
+__all__ = ['DigestSet', 'BloomFilter']
+
+if hasattr(hashlib, 'blake2b'):
+    def get_digest(key, size):
+        return hashlib.blake2b(key, digest_size=size).digest()
+else:
+    def get_digest(key, size):
+        return hashlib.sha1(key).digest()[:size]
+
+def get_key_bytes(key, encoding='utf-8'):
+    """
+    Return a byte string representation of `key` that is used for hashing.
+    """
+    if isinstance(key, bytes):
+        return key
+    return config.UNICODE_TYPE(key).encode(encoding, 'surrogatepass')
+
+
+class DigestSet(object):
+    """
+    A set-like container that only stores an 8-byte digest of each added key.
+
+    The digests live in an open-addressing hash table that is backed by an
+    `array.array`. This costs about 16 bytes per distinct key, no matter how
+    long the keys are. Two different keys will only be mistaken for each other
+    if their 64-bit digests collide, which is negligible even for hundreds of
+    millions of keys.
+
+    Keys are compared by their string representation (byte strings are used
+    as-is). This matches what `shcol` does with its items anyway.
+    """
+    def __init__(self, capacity=1024):
+        """
+        Initialize the set.
+
+        `capacity` defines the number of keys that fit into the set before its
+        table needs to grow for the first time.
+
+        `NotImplementedError` is raised on platforms without arrays of 64-bit
+        integers (e.g. Python 2 on a 32-bit system).
+        """
+        size = 8
+        while size < 2 * capacity:
+            size *= 2
+        self._table = make_uint64_array([0]) * size
+        self._mask = size - 1
+        self._num_keys = 0
+
+    def __repr__(self):
+        return '{}(<{} keys>)'.format(type(self).__name__, self._num_keys)
+
+    def __len__(self):
+        return self._num_keys
+
+    def __contains__(self, key):
+        digest = self.get_digest(key)
+        table, mask = self._table, self._mask
+        index = digest & mask
+        while True:
+            slot = table[index]
+            if slot == digest:
+                return True
+            if slot == 0:
+                return False
+            index = (index + 1) & mask
+
+    def add(self, key):
+        """
+        Add `key` to the set.
+        """
+        if self._insert(self.get_digest(key)):
+            self._num_keys += 1
+            if 2 * self._num_keys > len(self._table):
+                self._grow()
+
+    @staticmethod
+    def get_digest(key):
+        """
+        Return the non-zero 64-bit digest that represents `key` in the table.
+        """
+        digest, = struct.unpack('<Q', get_digest(get_key_bytes(key), 8))
+        # Zero marks an empty slot
+        return digest or 1
+
+    def _insert(self, digest):
+        table, mask = self._table, self._mask
+        index = digest & mask
+        while True:
+            slot = table[index]
+            if slot == digest:
+                return False
+            if slot == 0:
+                table[index] = digest
+                return True
+            index = (index + 1) & mask
+
+    def _grow(self):
+        old_table = self._table
+        self._table = make_uint64_array([0]) * (2 * len(old_table))
+        self._mask = len(self._table) - 1
+        for digest in old_table:
+            if digest:
+                self._insert(digest)
+
+    @property
+    def nbytes(self):
+        """
+        Return the number of bytes used by the underlying table.
+        """
+        return len(self._table) * self._table.itemsize
+
+
+class BloomFilter(object):
+    """
+    A probabilistic set-like container with a fixed memory footprint.
+
+    Membership tests never miss a key that has been added. However, a key that
+    was never added is reported as being present with a probability of about
+    `error_rate` (once `capacity` keys have been added). When used for making
+    items unique, this means that some items which occur only once might get
+    lost. Use this only if that is acceptable for your use case.
+    """
+    def __init__(self, capacity, error_rate=0.001):
+        """
+        Initialize the filter.
+
+        `capacity` defines the number of keys that the filter is sized for.
+        Adding more keys than that will increase the false positive rate.
+
+        `error_rate` is the desired false positive rate for `capacity` keys.
+        It must be a number between 0 and 1.
+        """
+        capacity = max(1, capacity)
+        if not 0 < error_rate < 1:
+            raise ValueError('error_rate must be between 0 and 1')
+        num_bits = -capacity * math.log(error_rate) / math.log(2) ** 2
+        self.num_bits = max(8, int(math.ceil(num_bits)))
+        self.num_hashes = max(
+            1, int(round(float(self.num_bits) / capacity * math.log(2)))
+        )
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._num_keys = 0
+
+    def __repr__(self):
+        attrs = ['capacity', 'error_rate', 'num_bits', 'num_hashes']
+        return make_object_repr(self, attrs)
+
+    def __len__(self):
+        """
+        Return the number of distinct keys that were added. A key that was
+        reported as present (maybe falsely) when it was added is not counted.
+        """
+        return self._num_keys
+
+    def __contains__(self, key):
+        bits = self._bits
+        return all(
+            bits[pos >> 3] & (1 << (pos & 7)) for pos in self.get_positions(key)
+        )
+
+    def add(self, key):
+        """
+        Add `key` to the filter. Nothing is done if `key` is already present.
+        """
+        bits = self._bits
+        is_new = False
+        for pos in self.get_positions(key):
+            mask = 1 << (pos & 7)
+            if not bits[pos >> 3] & mask:
+                bits[pos >> 3] |= mask
+                is_new = True
+        if is_new:
+            self._num_keys += 1
+
+    def get_positions(self, key):
+        """
+        Return the bit positions that represent `key` in the filter.
+        """
+        digest = get_digest(get_key_bytes(key), 16)
+        first, second = struct.unpack('<QQ', digest)
+        return [
+            (first + i * second) % self.num_bits
+            for i in range(self.num_hashes)
+        ]
+
+    @property
+    def nbytes(self):
+        """
+        Return the number of bytes used by the underlying bit array.
+        """
+        return len(self._bits)
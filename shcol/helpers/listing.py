@@ -0,0 +1,481 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2013-2016, Sebastian Linke
+
+# Released under the Simplified BSD license
+# (see LICENSE file for details).
+
+"""
+Retrieve the names of files and directories.
+"""
+
+import collections
+import glob
+import os
+import stat
+import threading
+
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:
+    ThreadPoolExecutor = None
+
+try:
+    from os import scandir
+except ImportError:
+    scandir = None
+
+from .. import config
+from .misc import MeasuredItems, get_sorted
+
+__all__ = [
+    'get_filenames', 'scan_filenames', 'get_listings', 'ListingCache',
+    'get_file_infos', 'sort_file_infos', 'format_size'
+]
+
+DirectoryListing = collections.namedtuple('DirectoryListing', 'path, names')
+FileInfo = collections.namedtuple('FileInfo', 'name, size, mtime, is_dir')
+
+SORT_KEYS = {
+    'name': None,
+    'size': lambda info: info.size,
+    'mtime': lambda info: info.mtime,
+}
+
+def get_filenames(path=os.curdir, hide_dotted=False, dir_suffix=None):
+    """
+    Return an iterable of the filenames in `path`. If this function could not
+    retrieve any filename due to access errors then the iterable will be empty
+    (i.e. yielding no items).
+
+    Note that shell-like globbing is performed if `path` contains wildcard
+    symbols such as "*" or "?". The function will then return all names that
+    match the given pattern instead of their directory contents. If you need the
+    contents then you should put the platform's path separator at the end of
+    your pattern. In other words (on Windows):
+
+    r'Python27'   => Content of "Python27"-folder
+    r'Py*'        => Names starting with "Py" (e.g. "Python27", "Python34", ...)
+    r'Py*\\'      => Contents of directories starting with "Py"
+    r'Py*\*.txt'  => E.g. all text files in all Python folders
+
+    To make life easier, you are free to use alternative path separators if
+    they are supported by your platform (e.g. "/" instead of "\" on Windows).
+    Additionally, the "~"-symbol will be expanded to the user's home directory.
+
+    If `hide_dotted` is `True` then names starting with a dot are left out.
+    Note that globbing always hides those names unless the pattern explicitly
+    starts with a dot.
+
+    If `dir_suffix` is not `None` then it is appended to each name that refers
+    to a directory (e.g. "/" to get a result similar to ``ls -p``).
+    """
+    path = os.path.expanduser(os.path.expandvars(path))
+    if os.altsep is not None:
+        path = path.replace(os.altsep, os.sep)
+    if not glob.has_magic(path):
+        return scan_filenames(path or os.curdir, hide_dotted, dir_suffix)
+    if path.endswith(os.sep):
+        path = os.path.join(path, '*')
+    strip_dirname = not glob.has_magic(os.path.dirname(path))
+    return iter_glob_names(path, strip_dirname, hide_dotted, dir_suffix)
+
+def iter_glob_names(
+    pattern, strip_dirname=True, hide_dotted=False, dir_suffix=None
+):
+    """
+    Return an iterator of the names that match the shell-like `pattern`.
+
+    If `strip_dirname` is `True` then only the last component of each path is
+    yielded.
+
+    If `hide_dotted` is `True` then paths whose last component starts with a
+    dot are left out.
+
+    If `dir_suffix` is not `None` then it is appended to names of directories.
+    """
+    for filename in glob.iglob(pattern):
+        filename = filename.rstrip(os.sep)
+        basename = os.path.basename(filename)
+        if hide_dotted and basename.startswith('.'):
+            continue
+        name = basename if strip_dirname else filename
+        if dir_suffix is not None and os.path.isdir(filename):
+            name += dir_suffix
+        yield name
+
+def scan_filenames(path=os.curdir, hide_dotted=False, dir_suffix=None):
+    """
+    Return a list of the names inside the directory `path`. The list will be
+    empty if `path` is not a directory or if it could not be read.
+
+    Unlike `get_filenames()`, this function does not do any path expansion or
+    globbing. See `get_filenames()` for the meaning of `hide_dotted` and of
+    `dir_suffix`.
+
+    Note that the directory is read with a single `os.listdir()`-call if
+    `dir_suffix` is `None`. Otherwise, `os.scandir()` is used in order to get
+    the file type of each entry without an extra `stat()`-call on most systems.
+    """
+    try:
+        if dir_suffix is None:
+            names = os.listdir(path)
+        elif scandir is not None:
+            names = [
+                entry.name + dir_suffix if entry.is_dir() else entry.name
+                for entry in scandir(path)
+            ]
+        else:
+            names = [
+                name + dir_suffix
+                if os.path.isdir(os.path.join(path, name)) else name
+                for name in os.listdir(path)
+            ]
+    except OSError:
+        return []
+    if hide_dotted:
+        names = [name for name in names if not name.startswith('.')]
+    return names
+
+
+class SerialExecutor(object):
+    """
+    Drop-in replacement for a thread pool that runs everything in the calling
+    thread. This is used when only one worker is requested or when the
+    `concurrent.futures`-module is not available.
+    """
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    @staticmethod
+    def map(func, *iterables):
+        return map(func, *iterables)
+
+
+def make_executor(max_workers=config.MAX_WORKERS):
+    """
+    Return a thread pool executor that uses at most `max_workers` threads.
+    """
+    if max_workers <= 1 or ThreadPoolExecutor is None:
+        return SerialExecutor()
+    return ThreadPoolExecutor(max_workers)
+
+def scan_directory(path, hide_dotted=False, dir_suffix=None):
+    """
+    Return a tuple of the names inside the directory `path` and the names of
+    its subdirectories. Symbolic links to directories are not included in the
+    latter, since following them might lead to endless recursion. If
+    `hide_dotted` is `True` then hidden subdirectories are not included, too.
+
+    See `get_filenames()` for the meaning of `hide_dotted` and of `dir_suffix`.
+    """
+    names, subdirs = [], []
+    try:
+        if scandir is not None:
+            entries = [
+                (entry.name, entry.is_dir(),
+                 entry.is_dir(follow_symlinks=False))
+                for entry in scandir(path)
+            ]
+        else:
+            entries = []
+            for name in os.listdir(path):
+                filename = os.path.join(path, name)
+                is_dir = os.path.isdir(filename)
+                entries.append(
+                    (name, is_dir, is_dir and not os.path.islink(filename))
+                )
+    except OSError:
+        return names, subdirs
+    for name, is_dir, is_real_dir in entries:
+        if hide_dotted and name.startswith('.'):
+            continue
+        if is_real_dir:
+            subdirs.append(name)
+        if dir_suffix is not None and is_dir:
+            name += dir_suffix
+        names.append(name)
+    return names, subdirs
+
+def get_file_infos(
+    path=os.curdir, hide_dotted=False, dir_suffix=None,
+    max_workers=config.MAX_WORKERS
+):
+    """
+    Return a list of `FileInfo`-tuples for the files in `path`. Each tuple
+    consists of the name, the size in bytes, the modification time and a flag
+    that tells whether the file is a directory. See `get_filenames()` for the
+    meaning of the other arguments.
+
+    The `stat()`-calls that are needed for retrieving this information are
+    spread over a pool of at most `max_workers` threads, since they are bound
+    by latency on network filesystems. On Windows, where `os.scandir()` already
+    provides the metadata, no additional calls are made at all.
+    """
+    expanded = os.path.expanduser(os.path.expandvars(path))
+    if os.altsep is not None:
+        expanded = expanded.replace(os.altsep, os.sep)
+    if glob.has_magic(expanded):
+        if expanded.endswith(os.sep):
+            expanded = os.path.join(expanded, '*')
+        strip_dirname = not glob.has_magic(os.path.dirname(expanded))
+        targets = []
+        for filename in glob.iglob(expanded):
+            filename = filename.rstrip(os.sep)
+            name = os.path.basename(filename) if strip_dirname else filename
+            targets.append((name, filename, None))
+    else:
+        try:
+            if scandir is not None:
+                targets = [
+                    (entry.name, entry.path, entry)
+                    for entry in scandir(expanded)
+                ]
+            else:
+                targets = [
+                    (name, os.path.join(expanded, name), None)
+                    for name in os.listdir(expanded)
+                ]
+        except OSError:
+            return []
+    if hide_dotted:
+        targets = [
+            target for target in targets
+            if not os.path.basename(target[0]).startswith('.')
+        ]
+
+    def get_info(target):
+        name, filename, entry = target
+        try:
+            stat_result = os.stat(filename) if entry is None else entry.stat()
+        except OSError:
+            # Probably a broken symbolic link
+            try:
+                stat_result = os.lstat(filename)
+            except OSError:
+                # Removed after the directory was read
+                return None
+        is_dir = stat.S_ISDIR(stat_result.st_mode)
+        if dir_suffix is not None and is_dir:
+            name += dir_suffix
+        return FileInfo(
+            name, stat_result.st_size, stat_result.st_mtime, is_dir
+        )
+
+    if os.name == 'nt' and scandir is not None:
+        max_workers = 1
+    with make_executor(min(max_workers, len(targets))) as executor:
+        return [
+            info for info in executor.map(get_info, targets)
+            if info is not None
+        ]
+
+def sort_file_infos(file_infos, sort_by='name'):
+    """
+    Return a sorted list of the `FileInfo`-tuples in `file_infos`.
+
+    `sort_by` may be "name" for sorting by name (based on the locale), "size"
+    for sorting by size (largest first) or "mtime" for sorting by modification
+    time (newest first). Files having the same size or modification time are
+    sorted by name.
+    """
+    if sort_by not in SORT_KEYS:
+        raise ValueError('invalid sort key: {!r}'.format(sort_by))
+    infos_by_name = dict((info.name, info) for info in file_infos)
+    sorted_infos = [
+        infos_by_name[name] for name in get_sorted(list(infos_by_name))
+    ]
+    sort_key = SORT_KEYS[sort_by]
+    if sort_key is not None:
+        sorted_infos.sort(key=sort_key, reverse=True)
+    return sorted_infos
+
+def format_size(num_bytes):
+    """
+    Return a human-readable string for a size of `num_bytes` bytes, similar to
+    what ``ls -h`` does (e.g. "512", "3.5K", "12M").
+    """
+    size = float(num_bytes)
+    for unit in ('', 'K', 'M', 'G', 'T'):
+        if size < 1024:
+            break
+        size /= 1024
+    else:
+        unit = 'P'
+    if not unit:
+        return '{:d}'.format(int(num_bytes))
+    if size < 10:
+        return '{:.1f}{}'.format(size, unit)
+    return '{:.0f}{}'.format(size, unit)
+
+def get_listings(
+    paths, recursive=False, hide_dotted=False, dir_suffix=None,
+    max_workers=config.MAX_WORKERS, cache=None
+):
+    """
+    Return a list of `DirectoryListing`-tuples for the given `paths`. Each
+    tuple consists of a path and of the names that `get_filenames()` returns
+    for that path. The order of the result matches the order of `paths`.
+
+    If `recursive` is `True` then each listing is followed by the listings of
+    its subdirectories, similar to what ``ls -R`` does. Subdirectories are
+    visited in sorted order. Symbolic links to directories are not followed.
+    Note that paths which contain wildcards are not processed recursively.
+
+    Directories are read concurrently by a pool of at most `max_workers`
+    threads. This speeds up listing on network filesystems. The result is
+    deterministic nevertheless. See `get_filenames()` for the meaning of
+    `hide_dotted` and of `dir_suffix`.
+
+    `cache` may be a `ListingCache`-instance that is used for non-recursive
+    listings.
+    """
+    def read(path):
+        expanded = os.path.expanduser(os.path.expandvars(path))
+        if recursive and not glob.has_magic(expanded):
+            names, subdirs = scan_directory(expanded, hide_dotted, dir_suffix)
+        elif cache is not None:
+            names = cache.get_filenames(path, hide_dotted, dir_suffix)
+            subdirs = []
+        else:
+            names = list(get_filenames(path, hide_dotted, dir_suffix))
+            subdirs = []
+        return names, subdirs
+
+    # Read the tree level by level, each level being distributed over the
+    # thread pool, and put the results into depth-first order afterwards
+    nodes = [[path, None, None] for path in paths]
+    level = nodes
+    num_workers = max_workers if recursive else min(max_workers, len(paths))
+    with make_executor(num_workers) as executor:
+        while level:
+            results = executor.map(read, [node[0] for node in level])
+            next_level = []
+            for node, (names, subdirs) in zip(level, results):
+                # Sorting is not thread-safe (see `get_sorted()`)
+                node[1] = names
+                node[2] = [
+                    [os.path.join(node[0], subdir), None, None]
+                    for subdir in get_sorted(subdirs)
+                ]
+                next_level.extend(node[2])
+            level = next_level
+    listings = []
+    stack = list(reversed(nodes))
+    while stack:
+        path, names, children = stack.pop()
+        listings.append(DirectoryListing(path, names))
+        stack.extend(reversed(children))
+    return listings
+
+
+CachedListing = collections.namedtuple(
+    'CachedListing', 'key, signature, names, sorted_names'
+)
+
+
+class ListingCache(object):
+    """
+    A cache for directory listings. Each listing is validated against the
+    modification time (in nanoseconds, if available), the device and the inode
+    number of its directory before it is reused. An unchanged directory then
+    costs a single `stat()`-call instead of reading all of its entries.
+
+    The least recently used listing is evicted when the cache is full. The
+    cache is safe to be used from multiple threads.
+
+    Note that changes which happen within the timestamp resolution of the
+    filesystem right after a directory has been read may remain unnoticed.
+    """
+    def __init__(self, max_entries=128):
+        """
+        Initialize the cache.
+
+        `max_entries` defines the maximal number of listings in the cache.
+        """
+        self.max_entries = max_entries
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return '{}(max_entries={!r}, <{} listings>)'.format(
+            type(self).__name__, self.max_entries, len(self)
+        )
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        """
+        Remove all listings from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def get_filenames(self, path=os.curdir, hide_dotted=False, dir_suffix=None):
+        """
+        Return a list of the filenames in `path`. The result is retrieved from
+        the cache if possible. See `helpers.get_filenames()` for details.
+
+        Note that paths containing wildcards are never cached.
+        """
+        entry = self.get_entry(path, hide_dotted, dir_suffix)
+        if entry is None:
+            return list(get_filenames(path, hide_dotted, dir_suffix))
+        return list(entry.names)
+
+    def get_sorted_filenames(
+        self, path=os.curdir, hide_dotted=False, dir_suffix=None
+    ):
+        """
+        Like `.get_filenames()` but return the names in sorted order as a
+        `MeasuredItems`-sequence. Hence, neither sorting nor measuring the
+        names has to be repeated for an unchanged directory.
+        """
+        entry = self.get_entry(path, hide_dotted, dir_suffix)
+        if entry is None:
+            filenames = get_filenames(path, hide_dotted, dir_suffix)
+            return MeasuredItems(get_sorted(filenames))
+        if entry.sorted_names is None:
+            # Sorting is not done under the lock, so it might happen twice
+            sorted_names = MeasuredItems(get_sorted(entry.names))
+            entry = entry._replace(sorted_names=sorted_names)
+            with self._lock:
+                self._store(entry.key, entry)
+        return entry.sorted_names
+
+    def get_entry(self, path, hide_dotted=False, dir_suffix=None):
+        """
+        Return a valid `CachedListing` for the given arguments. The directory
+        is read if the cache holds no listing for it or if the listing is
+        outdated. Return `None` if `path` contains wildcards.
+        """
+        expanded = os.path.expanduser(os.path.expandvars(path))
+        if glob.has_magic(expanded):
+            return None
+        key = (os.path.abspath(expanded), hide_dotted, dir_suffix)
+        try:
+            stat_result = os.stat(key[0])
+        except OSError:
+            return None
+        signature = (stat_result.st_dev, stat_result.st_ino, getattr(
+            stat_result, 'st_mtime_ns', stat_result.st_mtime
+        ))
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None and entry.signature == signature:
+                self._entries[key] = entry
+                return entry
+        names = tuple(scan_filenames(key[0], hide_dotted, dir_suffix))
+        entry = CachedListing(key, signature, names, None)
+        with self._lock:
+            self._store(key, entry)
+        return entry
+
+    def _store(self, key, entry):
+        self._entries.pop(key, None)
+        self._entries[key] = entry
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2013-2016, Sebastian Linke
+
+# Released under the Simplified BSD license
+# (see LICENSE file for details).
+
+"""
+Matching of names against include and exclude patterns.
+"""
+
+import codecs
+import fnmatch
+import re
+
+from .. import config
+from .misc import make_object_repr
+
+__all__ = ['NameMatcher', 'get_name_matcher', 'filter_names']
+
+MAGIC_CHARS = re.compile('[*?[]')
+MAX_CACHED_MATCHERS = 64
+SINGLE_BYTE_CODECS = ('ascii', 'iso8859-1')
+
+def get_patterns(patterns):
+    """
+    Return `patterns` as a tuple of strings. `patterns` may be `None`, a single
+    string or an iterable of strings.
+    """
+    if patterns is None:
+        return ()
+    if isinstance(patterns, (config.UNICODE_TYPE, str)):
+        return (patterns,)
+    return tuple(patterns)
+
+
+class PatternGroup(object):
+    """
+    Matches names against a group of patterns. A name matches the group if it
+    matches at least one of its patterns.
+
+    Shell-like patterns which are plain literals or which only have a single
+    "*" at their start or end are checked with string operations. All other
+    patterns are combined into one compiled regular expression.
+    """
+    def __init__(
+        self, patterns, ignore_case=False, use_regex=False, encoding=None
+    ):
+        """
+        Initialize the group.
+
+        `patterns` should be a sequence of strings.
+
+        If `ignore_case` is `True` then matching is case-insensitive.
+
+        If `use_regex` is `True` then the patterns are interpreted as regular
+        expressions that may match anywhere in a name. Otherwise, they are
+        shell-like patterns that must match the whole name.
+
+        If `encoding` is not `None` then the group will match byte strings
+        instead of Unicode strings. The patterns are encoded accordingly.
+        """
+        self.ignore_case = ignore_case
+        literals, prefixes, suffixes, expressions = set(), [], [], []
+        for pattern in patterns:
+            if use_regex:
+                expressions.append(pattern)
+                continue
+            if ignore_case:
+                pattern = pattern.lower()
+            if not MAGIC_CHARS.search(pattern):
+                literals.add(pattern)
+            elif self.is_literal(pattern[:-1]) and pattern.endswith('*'):
+                prefixes.append(pattern[:-1])
+            elif self.is_literal(pattern[1:]) and pattern.startswith('*'):
+                suffixes.append(pattern[1:])
+            else:
+                expressions.append(fnmatch.translate(pattern))
+        if encoding is not None:
+            literals = [lit.encode(encoding) for lit in literals]
+            prefixes = [prefix.encode(encoding) for prefix in prefixes]
+            suffixes = [suffix.encode(encoding) for suffix in suffixes]
+            expressions = [expr.encode(encoding) for expr in expressions]
+        self.literals = frozenset(literals)
+        self.prefixes = tuple(prefixes)
+        self.suffixes = tuple(suffixes)
+        self.regex = None
+        if expressions:
+            flags = re.IGNORECASE if ignore_case else 0
+            if encoding is None:
+                combined = '|'.join(
+                    '(?:{})'.format(expr) for expr in expressions
+                )
+            else:
+                combined = b'|'.join(
+                    b'(?:' + expr + b')' for expr in expressions
+                )
+            regex = re.compile(combined, flags)
+            self.regex = regex.search if use_regex else regex.match
+
+    @staticmethod
+    def is_literal(pattern):
+        """
+        Return `True` if `pattern` does not contain any wildcard symbols.
+        """
+        return MAGIC_CHARS.search(pattern) is None
+
+    def __bool__(self):
+        return bool(
+            self.literals or self.prefixes or self.suffixes or self.regex
+        )
+
+    __nonzero__ = __bool__
+
+    def match(self, name):
+        """
+        Return `True` if `name` matches one of the patterns in this group.
+        """
+        if self.regex is not None and self.regex(name):
+            return True
+        if self.ignore_case:
+            name = name.lower()
+        return (
+            name in self.literals
+            or bool(self.prefixes) and name.startswith(self.prefixes)
+            or bool(self.suffixes) and name.endswith(self.suffixes)
+        )
+
+
+class NameMatcher(object):
+    """
+    Decides whether a name should be processed based on a set of include
+    patterns and a set of exclude patterns.
+    """
+    def __init__(
+        self, include=None, exclude=None, ignore_case=False, use_regex=False,
+        encoding=None
+    ):
+        """
+        Initialize the matcher.
+
+        `include` and `exclude` may be a single pattern or an iterable of
+        patterns. A name is accepted if it matches at least one of the include
+        patterns (or if no include patterns were given) and if it does not
+        match any of the exclude patterns.
+
+        If `ignore_case` is `True` then matching is case-insensitive.
+
+        If `use_regex` is `True` then the patterns are interpreted as regular
+        expressions that may match anywhere in a name. Otherwise, they are
+        shell-like patterns (e.g. "x*" to match all names starting with "x").
+
+        If `encoding` is not `None` then the matcher expects byte strings that
+        are encoded with that codec instead of Unicode strings. Note that this
+        is not safe for all kinds of patterns. Use `.get_bytes_matcher()` on a
+        Unicode matcher in order to get a byte string matcher that is known to
+        give the same results.
+        """
+        self.include = get_patterns(include)
+        self.exclude = get_patterns(exclude)
+        self.ignore_case = ignore_case
+        self.use_regex = use_regex
+        self.encoding = encoding
+        self._include = PatternGroup(
+            self.include, ignore_case, use_regex, encoding
+        )
+        self._exclude = PatternGroup(
+            self.exclude, ignore_case, use_regex, encoding
+        )
+
+    def __repr__(self):
+        attrs = ['include', 'exclude', 'ignore_case', 'use_regex', 'encoding']
+        return make_object_repr(self, attrs)
+
+    def __call__(self, name):
+        """
+        Return `True` if `name` is accepted by this matcher.
+        """
+        if self._include and not self._include.match(name):
+            return False
+        return not (self._exclude and self._exclude.match(name))
+
+    def filter(self, names):
+        """
+        Return an iterator that yields all names from `names` that are accepted
+        by this matcher.
+        """
+        if not self._exclude:
+            include = self._include
+            if not include:
+                return iter(names)
+            if not (include.literals or include.prefixes or include.suffixes):
+                # Only a regex: let the C-implementation do the loop
+                return filter(include.regex, names)
+        return (name for name in names if self(name))
+
+    def get_bytes_matcher(self, encoding):
+        """
+        Return a matcher that works on byte strings encoded with `encoding` and
+        that accepts exactly the same names as this matcher would accept after
+        decoding them. This makes it possible to drop names before spending
+        time on decoding them.
+
+        `None` is returned if matching on byte strings would not be safe. This
+        is the case for regular expressions, case-insensitive matching and
+        encodings other than ASCII, Latin-1 and UTF-8. For UTF-8, the patterns
+        may not contain "?" or "[...]", since these would match single bytes
+        instead of whole characters.
+        """
+        if self.encoding is not None:
+            return self
+        if encoding is None or self.use_regex or self.ignore_case:
+            return None
+        try:
+            codec_name = codecs.lookup(encoding).name
+        except LookupError:
+            return None
+        patterns = self.include + self.exclude
+        if codec_name == 'utf-8':
+            if any('?' in pattern or '[' in pattern for pattern in patterns):
+                return None
+        elif codec_name not in SINGLE_BYTE_CODECS:
+            return None
+        try:
+            for pattern in patterns:
+                pattern.encode(encoding)
+        except UnicodeError:
+            return None
+        return get_name_matcher(
+            self.include, self.exclude, encoding=codec_name
+        )
+
+
+_matcher_cache = {}
+
+def get_name_matcher(
+    include=None, exclude=None, ignore_case=False, use_regex=False,
+    encoding=None
+):
+    """
+    Return a `NameMatcher` for the given arguments. See the documentation of
+    `NameMatcher` for their meaning.
+
+    Matchers are cached. Hence, using the same patterns again will not cause
+    them to be compiled again.
+    """
+    key = (
+        get_patterns(include), get_patterns(exclude), ignore_case, use_regex,
+        encoding
+    )
+    try:
+        return _matcher_cache[key]
+    except KeyError:
+        pass
+    if len(_matcher_cache) >= MAX_CACHED_MATCHERS:
+        _matcher_cache.clear()
+    matcher = _matcher_cache[key] = NameMatcher(*key)
+    return matcher
+
+def filter_names(source, pattern):
+    """
+    Return all names that match the given pattern.
+
+    `source` should be an iterator with the names to be processed.
+
+    `pattern` is meant to be an expression that is free to make use of
+    shell-like file matching mechanisms (e.g. "x*" to match all names
+    starting with "x"). It may also be a sequence of such expressions (a name
+    then needs to match at least one of them) or a `NameMatcher`-instance.
+    """
+    if not isinstance(pattern, NameMatcher):
+        pattern = get_name_matcher(pattern)
+    return pattern.filter(source)
@@ -4,12 +4,9 @@
 # Released under the Simplified BSD license
 # (see LICENSE file for details).
 
-import fnmatch
+import array
 import functools
-import glob
-import locale
-import os
-import re
+import operator
 
 import collections
 
@@ -21,10 +18,31 @@ except ImportError:
 from .. import config
 
 __all__ = [
-    'StringIO', 'get_strings', 'get_sorted', 'make_unique', 'get_filenames',
-    'filter_names', 'num', 'get_lines', 'get_column', 'make_object_repr'
+    'StringIO', 'get_strings', 'get_sorted', 'make_unique', 'num',
+    'get_lines', 'get_column', 'get_columns', 'make_object_repr',
+    'MeasuredItems', 'get_item_widths'
 ]
 
+# Python 2 lacks the "Q"-typecode. Its "L"-typecode is 64 bits wide on most
+# 64-bit platforms (but not on Windows).
+try:
+    array.array('Q')
+    UINT64_TYPECODE = 'Q'
+except ValueError:
+    UINT64_TYPECODE = 'L' if array.array('L').itemsize >= 8 else None
+
+def make_uint64_array(values=()):
+    """
+    Return an `array.array` of unsigned 64-bit integers holding `values`.
+
+    `NotImplementedError` is raised if the platform does not provide such
+    arrays (e.g. Python 2 on a 32-bit system).
+    """
+    if UINT64_TYPECODE is None:
+        msg = 'arrays of 64-bit integers are not supported on this platform'
+        raise NotImplementedError(msg)
+    return array.array(UINT64_TYPECODE, values)
+
 def get_strings(items, encoding=config.ENCODING):
     """
     Convert `items` to Unicode strings and return the result as an iterator.
@@ -52,6 +70,7 @@ def get_sorted(items):
         items = list(items)
     if len(items) <= 1:
         return items
+    import locale
     unset_locale = (None, None)
     old_locale = locale.getlocale(locale.LC_COLLATE)
     if old_locale == unset_locale:
@@ -73,63 +92,31 @@ def get_sorted(items):
         locale.setlocale(locale.LC_COLLATE, unset_locale)
     return sorted_items
 
-def make_unique(items):
+def make_unique(items, unique_key=None, seen=None):
     """
     Return an iterator based on `items` that only yields the first occurrence of
     an item. Any further occurrences of an item are ignored.
 
     Note that in contrast to a `set()` this function will preserve the original
     order of the given items.
-    """
-    seen = set()
-    for item in items:
-        if item not in seen:
-            seen.add(item)
-            yield item
 
-def get_filenames(path=os.curdir):
-    """
-    Return an iterator of the filenames in `path`. If this function could not
-    retrieve any filename due to access errors then the iterator will be empty
-    (i.e. yielding no items).
+    `unique_key` may be a function that is called with each item. Its result is
+    then used to decide whether two items are equal (e.g. `str.lower` for case-
+    insensitive processing). If this is `None` then the items are compared as
+    they are.
 
-    Note that shell-like globbing is performed if `path` contains wildcard
-    symbols such as "*" or "?". The function will then return all names that
-    match the given pattern instead of their directory contents. If you need the
-    contents then you should put the platform's path separator at the end of
-    your pattern. In other words (on Windows):
-
-    r'Python27'   => Content of "Python27"-folder
-    r'Py*'        => Names starting with "Py" (e.g. "Python27", "Python34", ...)
-    r'Py*\\'      => Contents of directories starting with "Py"
-    r'Py*\*.txt'  => E.g. all text files in all Python folders
-
-    To make life easier, you are free to use alternative path separators if
-    they are supported by your platform (e.g. "/" instead of "\" on Windows).
-    Additionally, the "~"-symbol will be expanded to the user's home directory.
+    `seen` defines the container that remembers the keys which were processed.
+    It must support the `in`-operator and an `.add()`-method. If this is `None`
+    then a new `set()` is used. For huge inputs, a `DigestSet` or a (lossy)
+    `BloomFilter` will use much less memory.
     """
-    path = os.path.expanduser(os.path.expandvars(path))
-    if os.altsep is not None:
-        path = path.replace(os.altsep, os.sep)
-    if not glob.has_magic(path) or path.endswith(os.sep):
-        path = os.path.join(path, '*')
-    filenames = (fn.rstrip(os.sep) for fn in glob.iglob(path))
-    if not glob.has_magic(os.path.dirname(path)):
-        filenames = (os.path.basename(fn) for fn in filenames)
-    return filenames
-
-def filter_names(source, pattern):
-    """
-    Return all names that match the given pattern.
-
-    `source` should be an iterator with the names to be processed.
-
-    `pattern` is meant to be an expression that is free to make use of
-    shell-like file matching mechanisms (e.g. "x*" to match all names
-    starting with "x").
-    """
-    pattern = re.compile(fnmatch.translate(pattern))
-    return (name for name in source if pattern.match(name))
+    if seen is None:
+        seen = set()
+    for item in items:
+        key = item if unique_key is None else unique_key(item)
+        if key not in seen:
+            seen.add(key)
+            yield item
 
 def num(value, allow_none=False, allow_zero=False):
     """
@@ -172,7 +159,11 @@ def get_lines(source, chars=None, skip_emtpy=True):
         if line or not skip_emtpy:
             yield line
 
-def get_column(column_index, source, sep=None):
+SHORT_LINE_POLICIES = ('error', 'skip', 'pad')
+
+def get_column(
+    column_index, source, sep=None, short_lines='error', fill_value=''
+):
     """
     Return the content of a specific column.
 
@@ -185,17 +176,60 @@ def get_column(column_index, source, sep=None):
     `sep` should be a string that defines the separator between each column. If
     `None` is used instead then the separator is whitespace.
 
-    If this function encounters a line having not enough columns to fulfill the
-    given column index then it will fail by throwing `IndexError`.
+    `short_lines` defines what happens with lines having not enough columns to
+    fulfill the given column index. Using "error" will fail by throwing
+    `IndexError`, "skip" will ignore such lines and "pad" will use
+    `fill_value` for the missing column.
     """
     column_index = num(column_index, allow_zero=True)
-    maxsplit = column_index + 1
+    return iter_fields(
+        operator.itemgetter(column_index), column_index, source, sep,
+        short_lines, fill_value
+    )
+
+def get_columns(
+    column_indices, source, sep=None, short_lines='error', fill_value=''
+):
+    """
+    Like `get_column()` but extract the columns for all indices in the sequence
+    `column_indices` at once. The result is an iterator that yields a tuple of
+    the extracted columns per line.
+
+    Each line is split only once, no matter how many columns are requested.
+    """
+    column_indices = tuple(
+        num(index, allow_zero=True) for index in column_indices
+    )
+    if not column_indices:
+        raise ValueError('at least one column index is required')
+    if len(column_indices) > 1:
+        getter = operator.itemgetter(*column_indices)
+    else:
+        index = column_indices[0]
+        getter = lambda columns: (columns[index],)
+    return iter_fields(
+        getter, max(column_indices), source, sep, short_lines, fill_value
+    )
+
+def iter_fields(getter, max_index, source, sep, short_lines, fill_value):
+    """
+    Split each line of `source` and yield the result of calling `getter` with
+    the resulting list of columns. See `get_column()` for the details.
+    """
+    if short_lines not in SHORT_LINE_POLICIES:
+        msg = 'short_lines must be one of {}'
+        raise ValueError(msg.format(', '.join(SHORT_LINE_POLICIES)))
+    maxsplit = max_index + 1
     for num_line, line in enumerate(source):
         columns = line.split(sep, maxsplit)
-        if column_index >= len(columns):
-            msg = 'no data for column index {} at line index {}'
-            raise IndexError(msg.format(column_index, num_line))
-        yield columns[column_index]
+        if len(columns) <= max_index:
+            if short_lines == 'skip':
+                continue
+            if short_lines == 'error':
+                msg = 'no data for column index {} at line index {}'
+                raise IndexError(msg.format(max_index, num_line))
+            columns.extend([fill_value] * (maxsplit - len(columns)))
+        yield getter(columns)
 
 def make_object_repr(obj, attr_names):
     """
@@ -207,3 +241,39 @@ def make_object_repr(obj, attr_names):
         '{}={!r}'.format(name, getattr(obj, name)) for name in attr_names
     )
     return '{}({})'.format(type(obj).__name__, attr_string)
+
+
+class MeasuredItems(tuple):
+    """
+    An immutable sequence of Unicode strings that knows the width of each of
+    its strings. Formatters use these widths instead of measuring the strings
+    again, which saves time when the same items are columnized repeatedly.
+    """
+    def __new__(cls, items=(), item_widths=None):
+        """
+        Create the sequence.
+
+        `items` should be an iterable of Unicode strings.
+
+        `item_widths` should be a sequence with the width of each item. If this
+        is `None` then the widths are measured.
+        """
+        self = tuple.__new__(cls, items)
+        if item_widths is None:
+            item_widths = [len(item) for item in self]
+        elif len(item_widths) != len(self):
+            raise ValueError('number of widths does not match number of items')
+        self.item_widths = item_widths
+        return self
+
+def get_item_widths(items):
+    """
+    Return a sequence that contains the width of each string in `items`.
+
+    If `items` provides an `.item_widths`-attribute (like `MeasuredItems`)
+    then that attribute is returned instead of measuring the strings.
+    """
+    item_widths = getattr(items, 'item_widths', None)
+    if item_widths is None:
+        item_widths = [len(item) for item in items]
+    return item_widths
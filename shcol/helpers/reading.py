@@ -0,0 +1,402 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2013-2016, Sebastian Linke
+
+# Released under the Simplified BSD license
+# (see LICENSE file for details).
+
+"""
+Fast reading of line-based input.
+"""
+
+import array
+import codecs
+import io
+import itertools
+import os
+import stat
+
+try:
+    import mmap
+except ImportError:
+    mmap = None
+
+from .. import config
+from .matching import NameMatcher, get_name_matcher
+from .misc import make_uint64_array
+from .stats import run_stage
+from .store import PackedItems, accumulate
+
+__all__ = [
+    'read_lines', 'read_packed_lines', 'read_records', 'map_file',
+    'IndexedLines'
+]
+
+BLOCK_SIZE = 1 << 20
+
+# Stripped from lines by default. Unicode whitespace such as NO-BREAK SPACE is
+# kept, since it may be part of an item.
+WHITESPACE = ' \t\n\r\x0b\x0c'
+
+def iter_blocks(source, block_size=BLOCK_SIZE):
+    """
+    Return an iterator that yields the content of the file-like object
+    `source` in blocks of (at most) `block_size` bytes or characters.
+    """
+    read = source.read
+    while True:
+        block = read(block_size)
+        if not block:
+            break
+        yield block
+
+def map_file(source):
+    """
+    Return a 2-element tuple consisting of a read-only memory map of the file
+    behind the file-like object `source` and the current position of `source`.
+
+    `None` is returned if `source` does not refer to a non-empty regular file
+    (e.g. if it is a pipe), if it is a text stream or if the file could not be
+    mapped.
+    """
+    if mmap is None or isinstance(source, io.TextIOBase):
+        return None
+    try:
+        fileno = source.fileno()
+        offset = source.tell()
+        stat_result = os.fstat(fileno)
+        if not stat.S_ISREG(stat_result.st_mode):
+            return None
+        if stat_result.st_size <= offset:
+            return None
+        mapping = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+    except (AttributeError, EnvironmentError, ValueError):
+        return None
+    return mapping, offset
+
+def iter_mapped_blocks(mapping, offset=0, block_size=BLOCK_SIZE, sep=b'\n'):
+    """
+    Return an iterator that yields the content of the memory map `mapping` in
+    blocks of about `block_size` bytes starting at `offset`. A block is cut
+    after the last separator `sep` that fits into it, so records will only
+    straddle block boundaries if they are longer than `block_size`. The map is
+    closed when the iterator is exhausted.
+    """
+    try:
+        size = len(mapping)
+        while offset < size:
+            end = min(offset + block_size, size)
+            if end < size:
+                boundary = mapping.rfind(sep, offset, end)
+                if boundary >= 0:
+                    end = boundary + len(sep)
+            yield mapping[offset:end]
+            offset = end
+    finally:
+        mapping.close()
+
+def iter_decoded(blocks, encoding):
+    """
+    Return an iterator that yields the decoded version of each byte string in
+    `blocks`. Multi-byte sequences that straddle block boundaries are handled
+    correctly.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    for block in blocks:
+        yield decoder.decode(block)
+    yield decoder.decode(b'', final=True)
+
+def split_blocks(blocks, sep):
+    """
+    Return an iterator that yields a list of records for each block of
+    `blocks`. Records are separated by `sep`. A record that straddles a block
+    boundary is included in the list of the block where it ends. Blocks that
+    do not contain `sep` yield no list.
+    """
+    # Pieces of a record that has not ended yet. They are only joined once the
+    # record ends, which keeps a very long record from being copied per block.
+    tail = []
+    for block in blocks:
+        if sep not in block:
+            tail.append(block)
+            continue
+        if tail:
+            tail.append(block)
+            block = block[:0].join(tail)
+        records = block.split(sep)
+        last = records.pop()
+        tail = [last] if last else []
+        yield records
+    if tail:
+        yield [tail[0][:0].join(tail)]
+
+def iter_record_lists(source, sep, encoding=None, block_size=BLOCK_SIZE):
+    """
+    Return an iterator that yields a list of records for each block that is
+    read from the file-like object `source`. Records are separated by `sep`,
+    which should be a Unicode string consisting of ASCII characters. See
+    `read_lines()` for the meaning of the other arguments.
+    """
+    byte_sep = sep.encode('ascii')
+    mapped = map_file(source)
+    if mapped is not None:
+        blocks = run_stage(
+            'read', iter_mapped_blocks, mapped[0], mapped[1], block_size,
+            byte_sep
+        )
+    else:
+        blocks = run_stage('read', iter_blocks, source, block_size)
+    first_block = next(blocks, None)
+    if first_block is None:
+        return iter([])
+    blocks = itertools.chain([first_block], blocks)
+    is_binary = isinstance(first_block, bytes)
+    if is_binary and encoding is not None:
+        blocks = run_stage('decode', iter_decoded, blocks, encoding)
+        is_binary = False
+    if is_binary:
+        sep = byte_sep
+    return run_stage('split', split_blocks, blocks, sep)
+
+def read_lines(
+    source, encoding=None, chars=None, skip_empty=True, block_size=BLOCK_SIZE
+):
+    """
+    Return an iterator that yields all lines from the file-like object `source`.
+    In contrast to `get_lines()`, the input is read in large blocks which are
+    split into lines all at once. This is much faster for large inputs.
+
+    `encoding` defines the codec for decoding the content of `source` if it is
+    a binary stream. Decoding is done once per block. If this is `None` then
+    the lines are yielded as byte strings. Text streams are not affected by
+    this argument.
+
+    `chars` defines the characters to be stripped from the end of each line.
+    If `None` is used then all trailing ASCII whitespace characters (see
+    `WHITESPACE`) are stripped. Note that the line separator ("\\n") is
+    always removed.
+
+    Setting `skip_empty` to `True` means that all lines, that have no content
+    after stripping was done (=empty strings), are *not* yielded.
+
+    `block_size` defines the number of bytes (or characters) per block.
+
+    If `source` refers to a regular file then its content is memory-mapped
+    instead of being read via `.read()`. This avoids copying the file into a
+    buffer and then again into each block.
+    """
+    record_lists = iter_record_lists(source, '\n', encoding, block_size)
+    stripped_lists = (
+        strip_lines(lines, chars, skip_empty) for lines in record_lists
+    )
+    return itertools.chain.from_iterable(
+        run_stage('split', iter, stripped_lists)
+    )
+
+def read_packed_lines(
+    source, encoding=config.ENCODING, chars=None, skip_empty=True,
+    block_size=BLOCK_SIZE
+):
+    """
+    Like `read_lines()` but return all lines as a `PackedItems`-instance. The
+    lines of each block are packed before the next block is read. Hence, no
+    string object is kept for each line. `encoding` must not be `None` if
+    `source` is a binary stream. See `PackedItems` for when
+    `NotImplementedError` is raised.
+    """
+    if encoding is None:
+        raise ValueError('packed lines must be decoded')
+    record_lists = iter_record_lists(source, '\n', encoding, block_size)
+    return PackedItems.from_batches(
+        strip_lines(lines, chars, skip_empty) for lines in record_lists
+    )
+
+def read_records(
+    source, sep='\0', encoding=None, skip_empty=True, block_size=BLOCK_SIZE
+):
+    """
+    Return an iterator that yields all records from the file-like object
+    `source`. Records are separated by `sep` (a NUL-character by default, as
+    written by ``find -print0``). In contrast to `read_lines()`, no characters
+    are stripped from the records.
+
+    Setting `skip_empty` to `True` means that empty records are *not* yielded.
+
+    See `read_lines()` for the meaning of the other arguments.
+    """
+    record_lists = iter_record_lists(source, sep, encoding, block_size)
+    if skip_empty:
+        record_lists = (filter(None, records) for records in record_lists)
+    return itertools.chain.from_iterable(record_lists)
+
+def strip_lines(lines, chars=None, skip_empty=True):
+    """
+    Return a list of `lines` where `chars` are stripped from the end of each
+    line. See `read_lines()` for details.
+    """
+    if not lines:
+        return lines
+    rstrip = type(lines[0]).rstrip
+    if chars is None:
+        chars = WHITESPACE
+    if isinstance(lines[0], bytes) and not isinstance(chars, bytes):
+        chars = chars.encode('ascii')
+    stripped = (rstrip(line, chars) for line in lines)
+    if skip_empty:
+        return [line for line in stripped if line]
+    return list(stripped)
+
+
+class IndexedLines(object):
+    """
+    A sequence of the lines of a regular file that only keeps the position and
+    the width of each line in memory. The file is memory-mapped and a line is
+    read from the map again when it is accessed.
+
+    This makes it possible to columnize huge files in two passes: The first
+    pass (done when the instance is created) measures the lines. The second
+    pass only reads the lines of the rows that are currently being written.
+
+    Lines are treated as `read_lines()` would do it, i.e. trailing ASCII
+    whitespace is stripped and empty lines are skipped. The file's encoding
+    must encode the newline character as a single "\\n"-byte that does not
+    occur in any multi-byte sequence. This is true for ASCII-compatible
+    encodings such as UTF-8 and Latin-1.
+    """
+    def __init__(
+        self, source, encoding=config.ENCODING, pattern=None,
+        make_unique=False, block_size=BLOCK_SIZE
+    ):
+        """
+        Initialize the sequence.
+
+        `source` should be a binary file object that refers to a regular file.
+        Lines are indexed from its current position on. `ValueError` is raised
+        if `source` is not a regular file. `NotImplementedError` is raised on
+        platforms without arrays of 64-bit integers (see
+        `misc.make_uint64_array()`).
+
+        `encoding` defines the codec used for decoding the file's content.
+
+        If `pattern` is not `None` then only lines matching it are indexed. See
+        `filter_names()` for the supported kinds of patterns.
+
+        If `make_unique` is `True` then only the first occurrence of a line is
+        indexed. Seen lines are tracked by a `DigestSet`.
+
+        `block_size` defines the number of bytes that are processed at once.
+        """
+        self.encoding = encoding
+        self.starts = make_uint64_array()
+        self.item_widths = array.array('L')
+        self._mapping = None
+        if not is_regular_file(source):
+            raise ValueError('source must be a regular file')
+        mapped = map_file(source)
+        if mapped is None:
+            # Nothing left to read
+            return
+        self._mapping, offset = mapped
+        if pattern is not None and not isinstance(pattern, NameMatcher):
+            pattern = get_name_matcher(pattern)
+        seen = None
+        if make_unique:
+            from .dedup import DigestSet
+            seen = DigestSet()
+        for base, block in self.iter_blocks(offset, block_size):
+            self.add_lines(base, block, pattern, seen)
+
+    def __repr__(self):
+        return '{}(<{} items>)'.format(type(self).__name__, len(self))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return len(self.item_widths)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('item index out of range')
+        mapping = self._mapping
+        start = self.starts[index]
+        end = mapping.find(b'\n', start)
+        if end < 0:
+            end = len(mapping)
+        line = mapping[start:end].decode(self.encoding)
+        return line.rstrip(WHITESPACE)
+
+    def iter_blocks(self, offset=0, block_size=BLOCK_SIZE):
+        """
+        Return an iterator that yields 2-element tuples of a block's position
+        in the file and the block's content. Each block ends with a newline
+        (except for the last one).
+        """
+        mapping = self._mapping
+        size = len(mapping)
+        while offset < size:
+            end = min(offset + block_size, size)
+            if end < size:
+                newline = mapping.rfind(b'\n', offset, end)
+                if newline < 0:
+                    newline = mapping.find(b'\n', end)
+                end = size if newline < 0 else newline + 1
+            yield offset, mapping[offset:end]
+            offset = end
+
+    def add_lines(self, base, block, pattern=None, seen=None):
+        """
+        Index the lines of `block`, which is located at position `base` in the
+        file. See `__init__()` for the meaning of `pattern` and `seen`.
+        """
+        byte_lines = block.split(b'\n')
+        lines = block.decode(self.encoding).split('\n')
+        if len(byte_lines) != len(lines):
+            raise ValueError('newlines must be encoded as single bytes')
+        if block.endswith(b'\n'):
+            byte_lines.pop()
+            lines.pop()
+        steps = (len(byte_line) + 1 for byte_line in byte_lines)
+        starts = accumulate(itertools.chain([base], steps))
+        lines = [line.rstrip(WHITESPACE) for line in lines]
+        if pattern is None and seen is None:
+            widths = list(map(len, lines))
+            self.starts.extend(itertools.compress(starts, widths))
+            self.item_widths.extend(filter(None, widths))
+            return
+        for start, line in zip(starts, lines):
+            if not line or pattern is not None and not pattern(line):
+                continue
+            if seen is not None:
+                if line in seen:
+                    continue
+                seen.add(line)
+            self.starts.append(start)
+            self.item_widths.append(len(line))
+
+    def close(self):
+        """
+        Close the underlying memory map.
+        """
+        if self._mapping is not None:
+            self._mapping.close()
+            self._mapping = None
+
+def is_regular_file(source):
+    """
+    Return `True` if the file-like object `source` refers to a regular file.
+    """
+    try:
+        return stat.S_ISREG(os.fstat(source.fileno()).st_mode)
+    except (AttributeError, EnvironmentError, ValueError):
+        return False
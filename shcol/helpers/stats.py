@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2013-2016, Sebastian Linke
+
+# Released under the Simplified BSD license
+# (see LICENSE file for details).
+
+"""
+Collect timings and counters while `shcol` is running.
+"""
+
+import collections
+import contextlib
+import sys
+import threading
+import time
+
+__all__ = [
+    'StatsCollector', 'get_stats_collector', 'collecting_stats', 'run_stage'
+]
+
+timer = getattr(time, 'perf_counter', time.time)
+
+_state = threading.local()
+
+
+class StatsCollector(object):
+    """
+    Record the wall time spent in each stage of processing (e.g. reading,
+    sorting or rendering) and some counters (e.g. the number of items).
+
+    Stages may be nested. The time of a stage does not include the time of the
+    stages that are run inside of it. Hence, the timings add up to the total
+    time (apart from the time spent outside of any stage).
+    """
+    def __init__(self):
+        self.timings = collections.OrderedDict()
+        self.counters = collections.OrderedDict()
+        self.start_time = timer()
+        self.stop_time = None
+        self._stack = []
+        self._last_switch = self.start_time
+
+    def __repr__(self):
+        return '{}(<{} stages>)'.format(type(self).__name__, len(self.timings))
+
+    def _switch(self):
+        now = timer()
+        if self._stack:
+            stage = self._stack[-1]
+            elapsed = now - self._last_switch
+            self.timings[stage] = self.timings.get(stage, 0.0) + elapsed
+        self._last_switch = now
+
+    def enter(self, name):
+        """
+        Start the stage `name`. The current stage is paused until `.leave()`
+        is called.
+        """
+        self._switch()
+        self._stack.append(name)
+
+    def leave(self):
+        """
+        Stop the current stage and resume the stage that was active before.
+        """
+        self._switch()
+        self._stack.pop()
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """
+        Return a context manager that runs its block as the stage `name`.
+        """
+        self.enter(name)
+        try:
+            yield
+        finally:
+            self.leave()
+
+    def iter_stage(self, name, iterable):
+        """
+        Return an iterator that yields the elements of `iterable`. Fetching an
+        element counts as the stage `name`. This is meant for lazy steps of
+        processing, which do their work when their result is consumed.
+        """
+        iterator = iter(iterable)
+        while True:
+            self.enter(name)
+            try:
+                element = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self.leave()
+            yield element
+
+    def run_stage(self, name, func, *args, **kwargs):
+        """
+        Return the result of calling `func` with given arguments as the stage
+        `name`. If the result is an iterator then consuming it is also counted
+        as that stage.
+        """
+        with self.stage(name):
+            result = func(*args, **kwargs)
+        if isinstance(result, collections.Iterator):
+            result = self.iter_stage(name, result)
+        return result
+
+    def count(self, name, value=1):
+        """
+        Add `value` to the counter `name`.
+        """
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def stop(self):
+        """
+        Stop measuring the total time.
+        """
+        self.stop_time = timer()
+
+    def get_results(self):
+        """
+        Return a dictionary containing the total time, the time per stage, the
+        counters and the peak memory usage.
+
+        The peak resident set size of the process is given if the `resource`-
+        module is available. The peak of traced allocations is only given if
+        `tracemalloc` is tracing (e.g. via ``python -X tracemalloc``).
+        """
+        stop_time = self.stop_time if self.stop_time is not None else timer()
+        results = collections.OrderedDict()
+        results['total_seconds'] = stop_time - self.start_time
+        results['stages'] = collections.OrderedDict(
+            (name, seconds) for name, seconds in self.timings.items()
+        )
+        results['counters'] = collections.OrderedDict(self.counters)
+        results['peak_rss_bytes'] = get_peak_rss()
+        results['peak_traced_bytes'] = get_peak_traced()
+        return results
+
+    def format(self):
+        """
+        Return the results as a human-readable string.
+        """
+        results = self.get_results()
+        total = results['total_seconds']
+        lines = ['{:<12} {:>10}  {:>6}'.format('stage', 'seconds', 'share')]
+        for name, seconds in results['stages'].items():
+            share = 100.0 * seconds / total if total else 0.0
+            lines.append('{:<12} {:>10.6f}  {:>5.1f}%'.format(
+                name, seconds, share
+            ))
+        lines.append('{:<12} {:>10.6f}'.format('total', total))
+        for name, value in results['counters'].items():
+            lines.append('{}: {}'.format(name, value))
+        for name in ('peak_rss_bytes', 'peak_traced_bytes'):
+            if results[name] is not None:
+                lines.append('{}: {}'.format(name, results[name]))
+        return '\n'.join(lines)
+
+    def to_json(self):
+        """
+        Return the results as a JSON-string.
+        """
+        import json
+        return json.dumps(self.get_results(), indent=2)
+
+def get_peak_rss():
+    """
+    Return the peak resident set size of the process in bytes or `None` if it
+    is not available.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+def get_peak_traced():
+    """
+    Return the peak size of memory blocks traced by `tracemalloc` or `None` if
+    tracing is not active.
+    """
+    try:
+        import tracemalloc
+    except ImportError:
+        return None
+    if not tracemalloc.is_tracing():
+        return None
+    return tracemalloc.get_traced_memory()[1]
+
+def get_stats_collector():
+    """
+    Return the `StatsCollector` that is active in the current thread or `None`
+    if no statistics are collected.
+    """
+    return getattr(_state, 'collector', None)
+
+@contextlib.contextmanager
+def collecting_stats(collector=None):
+    """
+    Return a context manager that activates `collector` for the current thread
+    while its block is running. A new `StatsCollector` is created if this is
+    `None`. The collector is returned by the context manager.
+
+    Example:
+
+    >>> with collecting_stats() as stats:
+    ...     shcol.columnize(items)
+    >>> print(stats.format())
+    """
+    if collector is None:
+        collector = StatsCollector()
+    previous = get_stats_collector()
+    _state.collector = collector
+    try:
+        yield collector
+    finally:
+        _state.collector = previous
+
+def run_stage(name, func, *args, **kwargs):
+    """
+    Return the result of calling `func` with given arguments. If statistics are
+    collected in the current thread then the call is recorded as the stage
+    `name`. See `StatsCollector.run_stage()` for details.
+    """
+    collector = get_stats_collector()
+    if collector is None:
+        return func(*args, **kwargs)
+    return collector.run_stage(name, func, *args, **kwargs)
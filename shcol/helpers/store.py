@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2013-2016, Sebastian Linke
+
+# Released under the Simplified BSD license
+# (see LICENSE file for details).
+
+"""
+Compact storage for huge amounts of items.
+"""
+
+import array
+import itertools
+import mmap
+
+from .. import config
+from .misc import make_uint64_array
+
+__all__ = ['ItemStore', 'PackedItems']
+
+BATCH_SIZE = 65536
+
+try:
+    accumulate = itertools.accumulate
+except AttributeError:
+    def accumulate(iterable):
+        total = 0
+        for value in iterable:
+            total += value
+            yield total
+
+
+class ItemStore(object):
+    """
+    A sequence of Unicode strings that keeps its items in a temporary file
+    instead of keeping one string object per item in memory.
+
+    Items are appended to the file in encoded form. Their offsets are stored
+    in an `array.array` of 64-bit integers and their widths are stored in a
+    separate array, which is exposed as `.item_widths`. Hence, memory usage
+    grows by about 16 bytes per item, no matter how long the items are.
+
+    Accessing an item decodes it from the memory-mapped file. Formatters only
+    do this for the items of the lines that are currently being written.
+    """
+    def __init__(self, items=(), encoding='utf-8', directory=None):
+        """
+        Initialize the store.
+
+        `items` may be an iterable of initial items. See `.extend()` for the
+        details.
+
+        `encoding` defines the codec used to store the items in the file.
+
+        `directory` defines where to create the temporary file. If this is
+        `None` then the system's default location is used.
+
+        `NotImplementedError` is raised on platforms without arrays of 64-bit
+        integers (see `misc.make_uint64_array()`).
+        """
+        import tempfile
+        self.encoding = encoding
+        self.item_widths = array.array('L')
+        self._offsets = make_uint64_array([0])
+        self._file = tempfile.TemporaryFile(dir=directory)
+        self._mapping = None
+        self._is_readable = False
+        self.extend(items)
+
+    def __repr__(self):
+        return '{}(<{} items>)'.format(type(self).__name__, len(self))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return len(self.item_widths)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('item index out of range')
+        mapping = self.get_mapping()
+        start, stop = self._offsets[index], self._offsets[index + 1]
+        if start == stop:
+            return config.UNICODE_TYPE()
+        return mapping[start:stop].decode(self.encoding)
+
+    def append(self, item):
+        """
+        Append `item` to the store. `item` may be a Unicode string or a byte
+        string that is encoded with the store's encoding.
+        """
+        self.extend([item])
+
+    def extend(self, items):
+        """
+        Append all elements of the iterable `items` to the store.
+        """
+        if self._is_readable:
+            raise ValueError('cannot append to a store that has been read')
+        encoding = self.encoding
+        write = self._file.write
+        offsets, widths = self._offsets, self.item_widths
+        end = offsets[-1]
+        for item in items:
+            if isinstance(item, bytes):
+                data = item
+                width = len(item.decode(encoding))
+            else:
+                item = config.UNICODE_TYPE(item)
+                data = item.encode(encoding)
+                width = len(item)
+            write(data)
+            end += len(data)
+            offsets.append(end)
+            widths.append(width)
+
+    def get_mapping(self):
+        """
+        Finish writing and return the memory map of the underlying file. Items
+        cannot be appended anymore after this method was called.
+        """
+        if not self._is_readable:
+            self._file.flush()
+            # Empty files cannot be mapped (but the store is empty then)
+            if self._offsets[-1] > 0:
+                self._mapping = mmap.mmap(
+                    self._file.fileno(), 0, access=mmap.ACCESS_READ
+                )
+            self._is_readable = True
+        return self._mapping
+
+    def close(self):
+        """
+        Close the store and remove its temporary file.
+        """
+        if self._mapping is not None:
+            self._mapping.close()
+            self._mapping = None
+        self._file.close()
+
+    @property
+    def nbytes(self):
+        """
+        Return the number of bytes used in memory for the offsets and widths.
+        """
+        return (
+            len(self._offsets) * self._offsets.itemsize
+            + len(self.item_widths) * self.item_widths.itemsize
+        )
+
+
+class PackedItems(object):
+    """
+    An immutable sequence of Unicode strings that are packed back to back into
+    one large string (the "arena"). The start of each item in the arena is
+    stored in an `array.array` of offsets and the widths are exposed as
+    `.item_widths`. Hence, no string object is kept per item.
+
+    Accessing an item slices it out of the arena. Formatters only do this for
+    the items of the line that is currently being written.
+
+    `NotImplementedError` is raised on platforms without arrays of 64-bit
+    integers (see `misc.make_uint64_array()`).
+    """
+    def __init__(self, items=()):
+        """
+        Initialize the sequence with the Unicode strings in the iterable
+        `items`.
+        """
+        items = iter(items)
+        batches = iter(lambda: list(itertools.islice(items, BATCH_SIZE)), [])
+        self._init_from_batches(batches)
+
+    @classmethod
+    def from_batches(cls, batches):
+        """
+        Return a new instance holding the items of all lists in the iterable
+        `batches`. This avoids keeping more than one batch of string objects in
+        memory at the same time.
+        """
+        self = cls.__new__(cls)
+        self._init_from_batches(batches)
+        return self
+
+    def _init_from_batches(self, batches):
+        # Fails before any batch is consumed if 64-bit arrays are unsupported
+        self.offsets = make_uint64_array([0])
+        parts = []
+        self.item_widths = array.array('L')
+        for batch in batches:
+            parts.append(config.UNICODE_TYPE().join(batch))
+            self.item_widths.extend(map(len, batch))
+        self.arena = config.UNICODE_TYPE().join(parts)
+        self.offsets.extend(accumulate(self.item_widths))
+
+    def __repr__(self):
+        return '{}(<{} items>)'.format(type(self).__name__, len(self))
+
+    def __len__(self):
+        return len(self.item_widths)
+
+    def __iter__(self):
+        arena, offsets = self.arena, self.offsets
+        for index in range(len(self)):
+            yield arena[offsets[index]:offsets[index + 1]]
+
+    def __getitem__(self, index):
+        arena, offsets = self.arena, self.offsets
+        if isinstance(index, slice):
+            return [
+                arena[offsets[i]:offsets[i + 1]]
+                for i in range(*index.indices(len(self)))
+            ]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('item index out of range')
+        return arena[offsets[index]:offsets[index + 1]]
+
+    @property
+    def nbytes(self):
+        """
+        Return the number of bytes used for the offsets and widths. Note that
+        the arena itself is not included.
+        """
+        return (
+            len(self.offsets) * self.offsets.itemsize
+            + len(self.item_widths) * self.item_widths.itemsize
+        )
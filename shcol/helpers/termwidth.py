@@ -9,19 +9,25 @@ Detect terminal width on different platforms.
 """
 
 import collections
-import ctypes
-import ctypes.util
 import os
+import signal
 
 from .. import config
+from .tracing import get_tracer
 
-try:
-    import ctypes.wintypes
-    HAVE_WINTYPES = True
-except (ImportError, ValueError):
-    HAVE_WINTYPES = False
+HAVE_WINTYPES = False
+if config.ON_WINDOWS:
+    try:
+        import ctypes
+        import ctypes.wintypes
+        HAVE_WINTYPES = True
+    except (ImportError, ValueError):
+        pass
 
-__all__ = ['get_terminal_width_info']
+__all__ = [
+    'get_terminal_width_info', 'clear_terminal_width_cache',
+    'install_sigwinch_handler'
+]
 
 TerminalWidthInfo = collections.namedtuple(
     'TerminalWidthInfo', 'window_width, is_line_width'
@@ -39,6 +45,15 @@ def make_width_info(window_width, is_line_width=True):
     """
     return TerminalWidthInfo(window_width, is_line_width)
 
+def trace_query(description):
+    """
+    Report the detection of the terminal width by the implementation named by
+    `description` to the tracer (if any).
+    """
+    tracer = get_tracer()
+    if tracer is not None:
+        tracer.terminal_width_queried(description)
+
 
 if config.ON_WINDOWS and HAVE_WINTYPES:
     class ConsoleScreenBufferInfo(ctypes.Structure):
@@ -75,7 +90,7 @@ if config.ON_WINDOWS and HAVE_WINTYPES:
         return csbi
 
     def terminal_width_impl(fd):
-        config.LOGGER.debug('running `terminal_width_impl()` on Windows')
+        trace_query('`terminal_width_impl()` on Windows')
         handle = get_std_handle(fd)
         csbi = get_console_screen_buffer_info(handle)
         window = csbi.srWindow
@@ -86,13 +101,14 @@ if config.ON_WINDOWS and HAVE_WINTYPES:
 
 elif not config.ON_WINDOWS and hasattr(os, 'get_terminal_size'):
     def terminal_width_impl(fd):
-        config.LOGGER.debug(
-            'running `os.get_terminal_size()`-based `terminal_width_impl()`'
-        )
+        trace_query('`os.get_terminal_size()`-based `terminal_width_impl()`')
         window_width = os.get_terminal_size(fd).columns
         return make_width_info(window_width)
 
 else:
+    import ctypes
+    import ctypes.util
+
     try:
         import termios
     except ImportError:
@@ -106,16 +122,30 @@ else:
             ('ws_ypixel', ctypes.c_ushort)
         ]
 
-    def terminal_width_impl(fd):
-        config.LOGGER.debug(
-            'running `terminal_width_impl()`-fallback on a non-Windows system'
-        )
+    def find_ioctl():
+        """
+        Return libc's `ioctl()`-function or `None` if it is not available.
+        """
+        if not hasattr(termios, 'TIOCGWINSZ'):
+            return None
+        try:
+            # Symbols of the running process (including libc)
+            return ctypes.CDLL(None).ioctl
+        except (AttributeError, OSError, TypeError):
+            pass
         libc_path = ctypes.util.find_library('c')
-        if libc_path is None or not hasattr(termios, 'TIOCGWINSZ'):
+        if libc_path is None:
+            return None
+        return ctypes.CDLL(libc_path).ioctl
+
+    ioctl = find_ioctl()
+
+    def terminal_width_impl(fd):
+        trace_query('`terminal_width_impl()`-fallback on a non-Windows system')
+        if ioctl is None:
             raise OSError('unsupported platform')
-        libc = ctypes.CDLL(libc_path)
         win_size = WinSize()
-        libc.ioctl(fd, termios.TIOCGWINSZ, ctypes.byref(win_size))
+        ioctl(fd, termios.TIOCGWINSZ, ctypes.byref(win_size))
         return make_width_info(win_size.ws_col)
 
 
@@ -133,11 +163,102 @@ def is_terminal(stream):
     return os.isatty(stream.fileno())
 
 
+_width_cache = {}
+_cache_generation = 0
+_previous_sigwinch_handler = None
+
 def get_terminal_width_info(stream=config.TERMINAL_STREAM):
     """
     Return the current width of the (pseudo-)terminal connected to `stream` as
     a `TerminalWidthInfo`-object.
+
+    The result is cached per file descriptor while the handler installed by
+    `install_sigwinch_handler()` is the current handler for the `SIGWINCH`
+    signal. It clears the cache whenever the terminal is resized. Hence,
+    repeated calls do not need to detect the width again. The handler is
+    installed on the first call if `SIGWINCH` still has its default handler
+    and if the call is made from the main thread. Otherwise (and on Windows)
+    the width is detected on each call.
     """
     if not is_terminal(stream):
         raise IOError('stream must be connected to a terminal')
-    return terminal_width_impl(stream.fileno())
+    fd = stream.fileno()
+    use_cache = (
+        is_sigwinch_handler_active() or install_default_sigwinch_handler()
+    )
+    if not use_cache:
+        # Cached widths may be outdated since resizing went unnoticed
+        clear_terminal_width_cache()
+    elif fd in _width_cache:
+        return _width_cache[fd]
+    generation = _cache_generation
+    width_info = terminal_width_impl(fd)
+    # Don't cache if the terminal was resized during detection
+    if use_cache and generation == _cache_generation:
+        _width_cache[fd] = width_info
+    return width_info
+
+def clear_terminal_width_cache():
+    """
+    Forget all cached terminal widths.
+    """
+    global _cache_generation
+    _cache_generation += 1
+    _width_cache.clear()
+
+def install_sigwinch_handler():
+    """
+    Install a handler that clears the terminal width cache when the `SIGWINCH`
+    signal is received. This enables caching in `get_terminal_width_info()`.
+    A previously installed handler is still called.
+
+    The handler is process-wide. `get_terminal_width_info()` only installs it
+    if no other handler was set. This function installs it in any case.
+    System calls interrupted by the signal are restarted.
+
+    Return `True` if the handler is installed. Installation is not possible
+    on platforms without `SIGWINCH` and when not running on the main thread.
+    """
+    global _previous_sigwinch_handler
+    if is_sigwinch_handler_active():
+        return True
+    if not hasattr(signal, 'SIGWINCH'):
+        return False
+    try:
+        # Fails with `ValueError` when not called from the main thread
+        previous_handler = signal.signal(signal.SIGWINCH, handle_sigwinch)
+    except (ValueError, OSError):
+        return False
+    _previous_sigwinch_handler = previous_handler
+    if hasattr(signal, 'siginterrupt'):
+        signal.siginterrupt(signal.SIGWINCH, False)
+    clear_terminal_width_cache()
+    return True
+
+def install_default_sigwinch_handler():
+    """
+    Call `install_sigwinch_handler()` if the `SIGWINCH` signal still has its
+    default handler. Return `True` if the handler is installed afterwards.
+    """
+    if not hasattr(signal, 'SIGWINCH'):
+        return False
+    if signal.getsignal(signal.SIGWINCH) != signal.SIG_DFL:
+        return False
+    return install_sigwinch_handler()
+
+def is_sigwinch_handler_active():
+    """
+    Return `True` if `handle_sigwinch()` is the current handler for the
+    `SIGWINCH` signal, otherwise `False`.
+    """
+    if not hasattr(signal, 'SIGWINCH'):
+        return False
+    return signal.getsignal(signal.SIGWINCH) is handle_sigwinch
+
+def handle_sigwinch(signum, frame):
+    """
+    Signal handler for `SIGWINCH` that clears the terminal width cache.
+    """
+    clear_terminal_width_cache()
+    if callable(_previous_sigwinch_handler):
+        _previous_sigwinch_handler(signum, frame)
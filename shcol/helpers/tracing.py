@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2013-2016, Sebastian Linke
+
+# Released under the Simplified BSD license
+# (see LICENSE file for details).
+
+"""
+Hooks to trace what `shcol` is doing internally.
+
+A tracer is installed via `set_tracer()` or `using_tracer()`. Code that calls
+the hooks fetches the tracer only once per call and skips all tracing if none
+is installed. Hence, tracing does not cost anything unless it is used.
+"""
+
+import contextlib
+
+from .. import config
+
+__all__ = [
+    'Tracer', 'LoggingTracer', 'get_tracer', 'set_tracer', 'using_tracer'
+]
+
+_tracer = None
+
+
+class Tracer(object):
+    """
+    Base class for tracers. Each hook does nothing by default. Subclasses may
+    override the hooks they are interested in.
+    """
+    def terminal_width_queried(self, description):
+        """
+        Called when the terminal width is detected. `description` names the
+        implementation in use.
+        """
+
+    def layout_candidate(self, column_widths, num_lines, fits):
+        """
+        Called for each column configuration that was tried when calculating a
+        layout. `fits` tells whether the configuration fits into the line
+        width.
+        """
+
+    def rendering_started(self, linesep, wrapsep):
+        """
+        Called before line breaks are added to the rendered lines.
+        """
+
+    def row_rendered(self, lineno, line):
+        """
+        Called for each rendered `line` (without its line break). `lineno`
+        starts at 1.
+        """
+
+    def line_break_added(self, lineno, wrapped):
+        """
+        Called when the line break was added to the line `lineno`. `wrapped`
+        is `True` if the line fills the whole line width and thus got the
+        formatter's wrap separator instead of its line separator.
+        """
+
+
+class LoggingTracer(Tracer):
+    """
+    A tracer that passes all events as messages to a logger.
+    """
+    def __init__(self, logger=None, level=None):
+        """
+        `logger` defaults to `config.LOGGER`. `level` defaults to
+        `logging.DEBUG`.
+        """
+        if logger is None:
+            logger = config.LOGGER
+        if level is None:
+            import logging
+            level = logging.DEBUG
+        self.logger = logger
+        self.level = level
+
+    def log(self, msg, *args):
+        self.logger.log(self.level, msg.format(*args))
+
+    def terminal_width_queried(self, description):
+        self.log('running {} to detect the terminal width', description)
+
+    def layout_candidate(self, column_widths, num_lines, fits):
+        msg = 'tried {} columns on {} lines (fits: {})'
+        self.log(msg, len(column_widths), num_lines, fits)
+
+    def rendering_started(self, linesep, wrapsep):
+        msg = 'adding line breaks (linesep: {!r}, wrapsep: {!r})'
+        self.log(msg, linesep, wrapsep)
+
+    def line_break_added(self, lineno, wrapped):
+        sep_name = 'wrapsep' if wrapped else 'linesep'
+        self.log('adding {} to line {}', sep_name, lineno)
+
+def get_tracer():
+    """
+    Return the installed tracer or `None` if no tracer is installed.
+    """
+    return _tracer
+
+def set_tracer(tracer):
+    """
+    Install `tracer` for all threads and return the tracer that was installed
+    before. Pass `None` to disable tracing.
+    """
+    global _tracer
+    previous = _tracer
+    _tracer = tracer
+    return previous
+
+@contextlib.contextmanager
+def using_tracer(tracer):
+    """
+    Return a context manager that installs `tracer` while its block is
+    running. The tracer is returned by the context manager.
+
+    Example:
+
+    >>> with using_tracer(LoggingTracer()):
+    ...     shcol.print_columnized(items)
+    """
+    previous = set_tracer(tracer)
+    try:
+        yield tracer
+    finally:
+        set_tracer(previous)
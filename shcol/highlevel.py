@@ -10,9 +10,14 @@ Highlevel functions to support some cases where columnizing can be useful.
 
 from __future__ import print_function
 
+import collections
+
 from . import config, core, helpers
 
-__all__ = ['print_columnized', 'print_sorted', 'print_filenames']
+__all__ = [
+    'print_columnized', 'print_file', 'print_records', 'print_sorted',
+    'print_filenames'
+]
 
 def print_columnized(items, output_stream=config.TERMINAL_STREAM, **options):
     """
@@ -28,9 +33,65 @@ def print_columnized(items, output_stream=config.TERMINAL_STREAM, **options):
 
     Additional `options` are passed as-is to the `columnize()`-function and are
     interpreted there. See `columnize()`-documentation for details.
+
+    If `items` is a `helpers.ItemStore` or `helpers.IndexedLines` then the lines
+    are written one after another instead of building the whole result string
+    first.
     """
+    if isinstance(items, (helpers.ItemStore, helpers.IndexedLines)):
+        lines = core.columnize_lines(
+            items, output_stream=output_stream, **options
+        )
+        helpers.run_stage('write', write_lines, lines, output_stream)
+        return
     result = core.columnize(items, output_stream=output_stream, **options)
-    print(result, file=output_stream)
+    helpers.run_stage('write', print, result, file=output_stream)
+
+def print_file(source, output_stream=config.TERMINAL_STREAM, **options):
+    """
+    Write the columnized lines of the regular file `source` (a path or a binary
+    file object) to `output_stream`. This uses `columnize_file()`, so memory
+    usage stays low even for huge files.
+
+    Additional `options` are passed as-is to the `columnize_file()`-function.
+    """
+    lines = core.columnize_file(source, output_stream=output_stream, **options)
+    write_lines(lines, output_stream)
+
+def write_lines(lines, output_stream):
+    """
+    Write each of `lines` to `output_stream`. The output will be terminated by
+    exactly one newline, as `print()` would do with the joined lines.
+    """
+    last_line = ''
+    for line in lines:
+        output_stream.write(line)
+        last_line = line
+    if not last_line.endswith('\n'):
+        output_stream.write('\n')
+
+def print_records(
+    items, sep='\0', pattern=None, make_unique=config.MAKE_UNIQUE,
+    sort_items=config.SORT_ITEMS, output_stream=config.TERMINAL_STREAM
+):
+    """
+    Write `items` to `output_stream` without columnizing them. Instead, each
+    item is terminated by `sep`. The default separator (a NUL-character) makes
+    the output suitable for tools like ``xargs -0``.
+
+    `items` must be a sequence. See `columnize()` for the meaning of the other
+    arguments.
+    """
+    if isinstance(items, collections.Mapping):
+        raise TypeError('items must be a sequence')
+    if make_unique:
+        items = helpers.make_unique(items)
+    if pattern is not None:
+        items = helpers.filter_names(items, pattern)
+    if sort_items:
+        items = helpers.get_sorted(items)
+    records = (item + sep for item in helpers.get_strings(items))
+    output_stream.write(''.join(records))
 
 def print_sorted(items, **options):
     """
@@ -38,10 +99,95 @@ def print_sorted(items, **options):
     """
     print_columnized(items, sort_items=True, **options)
 
-def print_filenames(path='.', **options):
+def print_filenames(
+    path='.', hide_dotted=False, dir_suffix=None, recursive=False,
+    shared_layout=False, cache=None, sort_by='name', show_size=False,
+    **options
+):
     """
     Like `print_columnized()` but columnizes the filenames living in given
     `path`.  Note that this function does shell-like expansion of symbols
     such as "*", "?" or even "~" (user's home directory).
+
+    `path` may also be a sequence of paths. Their contents are then printed
+    one after another, each of them preceded by a header line with the path.
+
+    If `hide_dotted` is `True` then names starting with a dot are not shown.
+
+    If `dir_suffix` is not `None` then it is appended to the names of all
+    directories (e.g. "/" as done by ``ls -p``).
+
+    If `recursive` is `True` then the contents of all subdirectories are
+    printed, too (similar to ``ls -R``).
+
+    If `shared_layout` is `True` then the columns of all printed directories
+    will line up. Otherwise, the layout is calculated for each of them.
+
+    `cache` may be a `helpers.ListingCache`-instance. Listings of unchanged
+    directories are then taken from that cache instead of reading them again.
+
+    `sort_by` may be "name", "size" (largest first, like ``ls -S``) or "mtime"
+    (newest first, like ``ls -t``). If `show_size` is `True` then the size of
+    each file is shown next to its name. Note that both options are only
+    supported for a single non-recursive path.
+    """
+    if sort_by != 'name' or show_size:
+        if recursive or not isinstance(path, (config.UNICODE_TYPE, str)):
+            msg = 'sort_by and show_size only work for a single path'
+            raise ValueError(msg)
+        file_infos = helpers.sort_file_infos(
+            helpers.get_file_infos(path, hide_dotted, dir_suffix), sort_by
+        )
+        if show_size:
+            items = collections.OrderedDict(
+                (info.name, helpers.format_size(info.size))
+                for info in file_infos
+            )
+        else:
+            items = [info.name for info in file_infos]
+        print_columnized(items, **options)
+        return
+    if isinstance(path, (config.UNICODE_TYPE, str)):
+        if not recursive:
+            if cache is not None:
+                filenames = cache.get_sorted_filenames(
+                    path, hide_dotted, dir_suffix
+                )
+                print_columnized(filenames, **options)
+            else:
+                filenames = helpers.get_filenames(path, hide_dotted, dir_suffix)
+                print_sorted(filenames, **options)
+            return
+        path = [path]
+    listings = helpers.get_listings(
+        path, recursive, hide_dotted, dir_suffix, cache=cache
+    )
+    print_listings(listings, shared_layout, **options)
+
+def print_listings(
+    listings, shared_layout=False, output_stream=config.TERMINAL_STREAM,
+    **options
+):
+    """
+    Print the sorted names of each `(path, names)`-tuple in `listings`. The
+    names are preceded by a header line with the path if there is more than
+    one listing.
+
+    If `shared_layout` is `True` then the columns of all listings will line up.
+    Otherwise, the layout is calculated for each listing on its own.
+
+    Additional `options` are passed as-is to the `columnize()`-function and are
+    interpreted there.
     """
-    print_sorted(helpers.get_filenames(path), **options)
+    options.update(sort_items=True, output_stream=output_stream)
+    if shared_layout:
+        results = core.columnize_groups(
+            [names for _, names in listings], **options
+        )
+    else:
+        results = [core.columnize(names, **options) for _, names in listings]
+    for i, ((path, _), result) in enumerate(zip(listings, results)):
+        if len(listings) > 1:
+            header = '{}{}:'.format('\n' if i else '', path)
+            print(header, file=output_stream)
+        print(result, file=output_stream)
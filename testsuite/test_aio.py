@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2013-2016, Sebastian Linke
+
+# Released under the Simplified BSD license
+# (see LICENSE file for details).
+
+from __future__ import unicode_literals
+
+import collections
+import shcol
+import unittest
+
+if shcol.config.PY_VERSION >= (3, 7):
+    import asyncio
+    import shcol.aio
+
+# Not using `async def` in order to keep this module importable on Python 2
+
+class PseudoWriter(object):
+    def __init__(self):
+        self.chunks = []
+        self.num_drains = 0
+
+    def write(self, data):
+        self.chunks.append(data)
+
+    def drain(self):
+        self.num_drains += 1
+        return asyncio.sleep(0)
+
+
+class AsyncIterator(object):
+    def __init__(self, items):
+        self.iterator = iter(items)
+
+    def __aiter__(self):
+        return self
+
+    def __anext__(self):
+        try:
+            item = next(self.iterator)
+        except StopIteration:
+            raise StopAsyncIteration
+        return asyncio.sleep(0, item)
+
+
+@unittest.skipIf(shcol.config.PY_VERSION < (3, 7), 'requires Python 3.7')
+class AsyncColumnizeTest(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+        self.items = ['späm', 'ham', 'eggs', 'spam', 'ham'] * 10
+        self.options = {'line_width': 40, 'make_unique': True}
+
+    def run_coroutine(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+    def test_columnize_async(self):
+        expected = shcol.columnize(self.items, sort_items=True, **self.options)
+        for threshold in (0, 10000):
+            result = self.run_coroutine(shcol.aio.columnize_async(
+                AsyncIterator(self.items), sort_items=True, threshold=threshold,
+                **self.options
+            ))
+            self.assertEqual(result, expected)
+
+    def test_write_columnized(self):
+        expected = shcol.columnize(self.items, pattern='*m', **self.options)
+        for threshold in (0, 10000):
+            writer = PseudoWriter()
+            self.run_coroutine(shcol.aio.write_columnized(
+                writer, AsyncIterator(self.items), pattern='*m',
+                threshold=threshold, **self.options
+            ))
+            result = b''.join(writer.chunks).decode('utf-8')
+            self.assertEqual(result, expected + '\n')
+            self.assertEqual(writer.num_drains, len(writer.chunks))
+            self.assertEqual(writer.num_drains, expected.count('\n') + 1)
+
+    def test_write_stages(self):
+        with shcol.helpers.collecting_stats() as stats:
+            self.run_coroutine(shcol.aio.write_columnized(
+                PseudoWriter(), self.items, pattern='*m', **self.options
+            ))
+        stages = stats.get_results()['stages']
+        for name in ('dedup', 'filter', 'decode', 'layout'):
+            self.assertIn(name, stages)
+
+    def test_write_mapping(self):
+        mapping = collections.OrderedDict([('spam', 'eggs'), ('ham', 'x')])
+        writer = PseudoWriter()
+        self.run_coroutine(shcol.aio.write_columnized(writer, mapping))
+        result = b''.join(writer.chunks).decode('utf-8')
+        self.assertEqual(result, shcol.columnize(mapping, line_width=80) + '\n')
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2013-2016, Sebastian Linke
+
+# Released under the Simplified BSD license
+# (see LICENSE file for details).
+
+from __future__ import unicode_literals
+
+import os
+import shcol
+import unittest
+
+if shcol.config.PY_VERSION >= (3, 3):
+    from benchmarks import corpora, gate
+
+if shcol.config.PY_VERSION >= (3, 9):
+    from benchmarks import memory
+
+@unittest.skipUnless(shcol.config.PY_VERSION >= (3, 3), 'requires Python 3.3')
+class BenchmarksTest(unittest.TestCase):
+    def test_corpora(self):
+        for name in corpora.CORPORA:
+            items = corpora.make_corpus(name, 100)
+            self.assertEqual(len(items), 100)
+            self.assertEqual(items, corpora.make_corpus(name, 100))
+
+    def test_operation_counter(self):
+        columncalc = shcol.core.columncalc
+        calculator = columncalc.ColumnWidthCalculator(line_width=10)
+        with gate.OperationCounter().installed() as counter:
+            calculator.calculate_columns([4, 3, 4])
+        self.assertEqual(counter.counts['get_unchecked_column_config'], 1)
+        self.assertGreater(counter.counts['max'], 0)
+        self.assertFalse(hasattr(columncalc, 'max'))
+
+    def test_operation_counts(self):
+        # Algorithmic regressions are caught regardless of the machine's speed
+        baseline = gate.load_baseline(gate.BASELINE_PATH)['operations']
+        operations = gate.count_operations(sizes=[10, 1000])
+        for result in gate.compare_operations(operations, baseline):
+            self.assertEqual(result['status'], 'ok', result['key'])
+
+    @unittest.skipUnless(
+        shcol.config.PY_VERSION >= (3, 9), 'requires Python 3.9'
+    )
+    def test_memory_scenarios(self):
+        path = memory.make_input(1000)
+        self.addCleanup(os.remove, path)
+        for name, func in memory.SCENARIOS:
+            _, peak, stage_peaks = memory.run_scenario(func, path)
+            self.assertEqual(peak, max(stage_peaks.values()))
+            self.assertIn('layout', stage_peaks, name)
@@ -4,7 +4,13 @@
 # Released under the Simplified BSD license
 # (see LICENSE file for details).
 
+from __future__ import unicode_literals
+
+import io
+import json
+import os
 import shcol
+import tempfile
 import unittest
 
 class CLITestMixin(object):
@@ -30,6 +36,12 @@ class CLITestMixin(object):
                 error = self.fetch_parser_output(args, 'stderr')
                 self.assertIn('invalid num value', error)
 
+    def use_utf8(self):
+        # The tests encode their input as UTF-8 no matter what the locale is
+        config = shcol.config
+        self.addCleanup(setattr, config, 'ENCODING', config.ENCODING)
+        config.ENCODING = 'utf-8'
+
     def set_stdin_content(self, data):
         pseudo_stream = shcol.helpers.StringIO()
         if data is not None:
@@ -110,8 +122,147 @@ class ArgumentParserTest(CLITestMixin, unittest.TestCase):
         with self.assertRaises(IndexError):
             self.parser.parse_args(['-c', '42'])
 
+    def test_multiple_columns(self):
+        self.set_stdin_content('xxx,spam,1\nzzz,ham\n~~~,eggs,3\n')
+        args = self.parser.parse_args(
+            ['-c', '1,2', '-d', ',', '--short-lines', 'skip']
+        )
+        expected = [('spam', '1'), ('eggs', '3')]
+        self.assertEqual(list(args.items.items()), expected)
+        for invalid in ('1,x', '1,', '0,-1'):
+            error = self.fetch_parser_output(['-c', invalid], 'stderr')
+            self.assertIn('invalid num value', error)
+        error = self.fetch_parser_output(['-c', '0,1,2'], 'stderr')
+        self.assertIn('more than two column indices', error)
+
+    def test_duplicate_keys(self):
+        self.set_stdin_content('spam,1\nham,2\nspam,3\n')
+        args = self.parser.parse_args(['-c', '0,1', '-d', ','])
+        expected = [('spam', '3'), ('ham', '2')]
+        self.assertEqual(list(args.items.items()), expected)
+
+    def test_delimiter_without_column(self):
+        result = self.fetch_parser_output(['-d', ',', 'spam'], 'stderr')
+        self.assertIn('can\'t use --delimiter', result)
+
+    def test_null_option(self):
+        self.use_utf8()
+        for option in ('-z', '--null'):
+            self.parser.stdin = io.BytesIO(
+                'spam\0häm \0\0e\nggs\0'.encode('utf-8')
+            )
+            args = self.parser.parse_args([option, '--exclude', 's*'])
+            self.assertEqual(args.items, ['häm ', 'e\nggs'])
+        error = self.fetch_parser_output(['-c0,1', '--print0'], 'stderr')
+        self.assertIn('can\'t use --print0', error)
+
+    def test_low_memory_option(self):
+        self.set_stdin_content('spam\nham\nspam\neggs\n')
+        args = self.parser.parse_args(['--low-memory', '-U', '-F', '*m'])
+        self.assertIsInstance(args.items, shcol.helpers.ItemStore)
+        self.assertEqual(list(args.items), ['spam', 'ham'])
+        self.assertFalse(args.unique)
+        self.assertIsNone(args.pattern)
+        args.items.close()
+        error = self.fetch_parser_output(['--low-memory', '-S'], 'stderr')
+        self.assertIn('can\'t use --sort', error)
+
+    def test_low_memory_unsupported(self):
+        # Like on Python 2 without a 64-bit array typecode
+        misc = shcol.helpers.misc
+        self.addCleanup(setattr, misc, 'UINT64_TYPECODE', misc.UINT64_TYPECODE)
+        misc.UINT64_TYPECODE = None
+        for option in (['--low-memory'], ['--low-memory', '-U']):
+            self.set_stdin_content('spam\nham\n')
+            error = self.fetch_parser_output(option, 'stderr')
+            self.assertIn('can\'t use --low-memory', error)
+
+    def test_two_pass_option(self):
+        fd, path = tempfile.mkstemp()
+        self.addCleanup(os.remove, path)
+        with os.fdopen(fd, 'wb') as stream:
+            stream.write(b'spam\nham\nspam\neggs\n')
+        args = self.parser.parse_args(
+            ['--two-pass', '-U', '-F', '*m', '--input', path]
+        )
+        self.assertIsInstance(args.items, shcol.helpers.IndexedLines)
+        self.assertEqual(list(args.items), ['spam', 'ham'])
+        args.items.close()
+        self.set_stdin_content('spam\n')
+        error = self.fetch_parser_output(['--two-pass'], 'stderr')
+        self.assertIn('can\'t use --two-pass', error)
+        error = self.fetch_parser_output(['--two-pass', '-S'], 'stderr')
+        self.assertIn('can\'t use --two-pass with --sort', error)
+
+    def test_two_pass_unsupported(self):
+        # Like on Python 2 without a 64-bit array typecode
+        misc = shcol.helpers.misc
+        self.addCleanup(setattr, misc, 'UINT64_TYPECODE', misc.UINT64_TYPECODE)
+        misc.UINT64_TYPECODE = None
+        fd, path = tempfile.mkstemp()
+        self.addCleanup(os.remove, path)
+        with os.fdopen(fd, 'wb') as stream:
+            stream.write(b'spam\nham\n')
+        error = self.fetch_parser_output(
+            ['--two-pass', '--input', path], 'stderr'
+        )
+        self.assertIn('can\'t use --two-pass', error)
+
+    def test_filter_options(self):
+        args = self.parser.parse_args(self.items + ['-F', '*m', '-F', 'e*'])
+        self.assertEqual(args.pattern.include, ('*m', 'e*'))
+        args = self.parser.parse_args(
+            self.items + ['--exclude', 'h*', '-i', '--regex']
+        )
+        self.assertEqual(args.pattern.exclude, ('h*',))
+        self.assertTrue(args.pattern.ignore_case)
+        self.assertTrue(args.pattern.use_regex)
+        args = self.parser.parse_args(self.items)
+        self.assertIsNone(args.pattern)
+
+    def test_filter_binary_stdin(self):
+        self.use_utf8()
+        self.parser.stdin = io.BytesIO('späm\nham\nspam\n'.encode('utf-8'))
+        args = self.parser.parse_args(['-F', 'sp*', '--exclude', 'spam'])
+        self.assertEqual(args.items, ['späm'])
+
+    def test_input_option(self):
+        self.use_utf8()
+        fd, path = tempfile.mkstemp()
+        try:
+            with os.fdopen(fd, 'wb') as stream:
+                stream.write('späm\nham\n\nspam\n'.encode('utf-8'))
+            args = self.parser.parse_args(['--input', path])
+            self.assertEqual(args.items, ['späm', 'ham', 'spam'])
+            args = self.parser.parse_args(['--input', path, '-F', 'sp*'])
+            self.assertEqual(args.items, ['späm', 'spam'])
+            with self.assertRaises(SystemExit):
+                self.parser.parse_args(['--input', path, 'foo'])
+        finally:
+            os.remove(path)
+        with self.assertRaises(SystemExit):
+            self.parser.parse_args(['--input', path])
+
 
 class MainFunctionTest(unittest.TestCase):
+    def test_print0_option(self):
+        pseudo_stream = shcol.helpers.StringIO()
+        args = ['--print0', '-S', '-U', '-F', '*m', 'spam', 'ham', 'spam']
+        shcol.cli.main(args, output_stream=pseudo_stream)
+        self.assertEqual(pseudo_stream.getvalue(), 'ham\0spam\0')
+
+    def test_stats_option(self):
+        pseudo_stream = shcol.helpers.StringIO()
+        error_stream = shcol.helpers.StringIO()
+        args = ['--stats-format', 'json', '-S', '-w50', 'spam', 'ham']
+        shcol.cli.main(
+            args, output_stream=pseudo_stream, error_stream=error_stream
+        )
+        self.assertEqual(pseudo_stream.getvalue(), 'ham  spam\n')
+        results = json.loads(error_stream.getvalue())
+        self.assertEqual(results['counters']['items'], 2)
+        self.assertIn('sort', results['stages'])
+
     def test_main_function(self):
         items = ['spam', 'ham', 'spam', 'eggs', 'ham']
         pseudo_stream = shcol.helpers.StringIO()
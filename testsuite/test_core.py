@@ -6,9 +6,16 @@
 
 from __future__ import unicode_literals
 
+import os
 import shcol
+import tempfile
 import unittest
 
+try:
+    from concurrent import futures
+except ImportError:
+    futures = None
+
 class ColumnizeTest(unittest.TestCase):
 
     @staticmethod
@@ -68,6 +75,53 @@ class ColumnizeTest(unittest.TestCase):
         expected = self.join(['eggs', 'ham', 'spam'])
         self.assertEqual(result, expected)
 
+    def test_columnize_groups(self):
+        groups = [['spam', 'ham', 'eggs'], ['x', 'yyyyyy', 'z']]
+        result = shcol.core.columnize_groups(groups, line_width=80)
+        self.assertEqual(
+            result, ['spam  ham     eggs', 'x     yyyyyy  z']
+        )
+        result = shcol.core.columnize_groups(
+            groups, line_width=80, sort_items=True, pattern='*s'
+        )
+        self.assertEqual(result, ['eggs', ''])
+        result = shcol.core.columnize_groups(
+            iter(groups + [['spam', 'x', 'spam']]), line_width=80,
+            make_unique=True
+        )
+        self.assertEqual(result[-1], 'spam  x')
+        with self.assertRaises(TypeError):
+            shcol.core.columnize_groups([{'spam': 'eggs'}], line_width=80)
+
+    def test_columnize_many(self):
+        item_lists = [
+            ['spam', 'ham', 'eggs', 'ham'], [], {'spam': 'eggs'}, ['x'] * 30
+        ] * 10
+        options = {'line_width': 20, 'make_unique': True, 'pattern': '*m'}
+        expected = [
+            shcol.columnize(items, **options) for items in item_lists
+        ]
+        result = shcol.core.columnize_many(item_lists, **options)
+        self.assertEqual(result, expected)
+        if futures is not None:
+            with futures.ThreadPoolExecutor(4) as executor:
+                result = shcol.core.columnize_many(
+                    item_lists, executor=executor, threshold=0, chunk_size=3,
+                    **options
+                )
+            self.assertEqual(result, expected)
+
+    def test_columnize_file(self):
+        items = ['spam', 'ham', 'eggs', 'ham'] * 20
+        fd, path = tempfile.mkstemp()
+        self.addCleanup(os.remove, path)
+        with os.fdopen(fd, 'wb') as stream:
+            stream.write('\n'.join(items).encode('utf-8'))
+        for options in [{}, {'pattern': '*m', 'make_unique': True}]:
+            expected = shcol.columnize(items, line_width=30, **options)
+            lines = shcol.core.columnize_file(path, line_width=30, **options)
+            self.assertEqual(''.join(lines).rstrip('\n'), expected)
+
     def test_invalid_values(self):
         with self.assertRaises(ValueError):
             items = ['spam']
@@ -150,6 +204,26 @@ class ColumnWidthCalculatorTest(unittest.TestCase):
                 self.calculator.calculate_max_columns(item_widths), result
             )
 
+    def test_calculate_shared_columns(self):
+        groups = [[5, 18, 3], [1, 21], []]
+        self.assertEqual(
+            self.calculator.calculate_shared_columns(groups),
+            [([5, 21, 3], 1), ([5, 21, 3], 1), ([5, 21, 3], 0)]
+        )
+        self.calculator.line_width = 30
+        self.assertEqual(
+            self.calculator.calculate_shared_columns(groups),
+            [([21], 3), ([21], 2), ([21], 0)]
+        )
+        self.calculator.line_width = 20
+        with self.assertRaises(shcol.core.columncalc.LineTooSmallError):
+            self.calculator.calculate_shared_columns(groups)
+        self.calculator.allow_exceeding = True
+        self.assertEqual(
+            self.calculator.calculate_shared_columns(groups),
+            [([20], 3), ([20], 2), ([20], 0)]
+        )
+
     def test_get_column_configs(self):
         item_widths = [2, 347, 65, 32, 345, 23]
         expected = [
@@ -0,0 +1,553 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2013-2016, Sebastian Linke
+
+# Released under the Simplified BSD license
+# (see LICENSE file for details).
+
+from __future__ import unicode_literals
+
+import array
+import io
+import os
+import shcol
+import signal
+import tempfile
+import threading
+import unittest
+
+class MakeUniqueTest(unittest.TestCase):
+    def setUp(self):
+        self.items = ['spam', 'ham', 'Spam', 'eggs', 'ham', 'SPAM', 'eggs']
+
+    def make_unique(self, **options):
+        return list(shcol.helpers.make_unique(self.items, **options))
+
+    def test_default(self):
+        expected = ['spam', 'ham', 'Spam', 'eggs', 'SPAM']
+        self.assertEqual(self.make_unique(), expected)
+
+    def test_unique_key(self):
+        result = self.make_unique(unique_key=lambda item: item.lower())
+        self.assertEqual(result, ['spam', 'ham', 'eggs'])
+
+    def test_digest_set(self):
+        expected = self.make_unique()
+        seen = shcol.helpers.DigestSet(capacity=1)
+        self.assertEqual(self.make_unique(seen=seen), expected)
+        self.assertEqual(len(seen), len(expected))
+        self.assertIn('SPAM', seen)
+        self.assertNotIn('bacon', seen)
+
+    def test_digest_set_growing(self):
+        seen = shcol.helpers.DigestSet(capacity=1)
+        items = [str(i) for i in range(1000)]
+        for item in items:
+            seen.add(item)
+        self.assertEqual(len(seen), 1000)
+        self.assertTrue(all(item in seen for item in items))
+        self.assertFalse(any(str(-i) in seen for i in range(1, 1000)))
+
+    def test_digest_set_typecodes(self):
+        misc = shcol.helpers.misc
+        typecode = misc.UINT64_TYPECODE
+        self.addCleanup(setattr, misc, 'UINT64_TYPECODE', typecode)
+        if array.array('L').itemsize >= 8:
+            # The fallback used by Python 2
+            misc.UINT64_TYPECODE = 'L'
+            seen = shcol.helpers.DigestSet(capacity=1)
+            self.assertEqual(self.make_unique(seen=seen), self.make_unique())
+        misc.UINT64_TYPECODE = None
+        with self.assertRaises(NotImplementedError):
+            shcol.helpers.DigestSet()
+
+    def test_bloom_filter(self):
+        seen = shcol.helpers.BloomFilter(capacity=100, error_rate=0.01)
+        items = [str(i) for i in range(100)]
+        for item in items + items:
+            seen.add(item)
+        self.assertTrue(all(item in seen for item in items))
+        self.assertLessEqual(len(seen), 100)
+        self.assertGreater(len(seen), 90)
+        with self.assertRaises(ValueError):
+            shcol.helpers.BloomFilter(100, error_rate=1)
+
+
+class FilterNamesTest(unittest.TestCase):
+    def setUp(self):
+        self.names = ['foo', 'bar', 'baz', 'Bar.py', 'spam.py', 'ham']
+
+    def filter_names(self, pattern):
+        return list(shcol.helpers.filter_names(self.names, pattern))
+
+    def matcher(self, *args, **kwargs):
+        return shcol.helpers.get_name_matcher(*args, **kwargs)
+
+    def test_single_pattern(self):
+        self.assertEqual(self.filter_names('ba?'), ['bar', 'baz'])
+        self.assertEqual(self.filter_names('*.py'), ['Bar.py', 'spam.py'])
+        self.assertEqual(self.filter_names('ham'), ['ham'])
+        self.assertEqual(self.filter_names('*'), self.names)
+
+    def test_multiple_patterns(self):
+        result = self.filter_names(['f*', '*m', 'b[a]r'])
+        self.assertEqual(result, ['foo', 'bar', 'ham'])
+
+    def test_exclude(self):
+        matcher = self.matcher(exclude=['*.py', 'ba?'])
+        self.assertEqual(self.filter_names(matcher), ['foo', 'ham'])
+        matcher = self.matcher('*a*', exclude='*.py')
+        self.assertEqual(self.filter_names(matcher), ['bar', 'baz', 'ham'])
+
+    def test_ignore_case(self):
+        matcher = self.matcher(['BAR*', 'FO?'], ignore_case=True)
+        self.assertEqual(self.filter_names(matcher), ['foo', 'bar', 'Bar.py'])
+
+    def test_regex(self):
+        matcher = self.matcher(r'a[rz]$', use_regex=True)
+        self.assertEqual(self.filter_names(matcher), ['bar', 'baz'])
+        matcher = self.matcher(r'\.py', exclude='^s', use_regex=True)
+        self.assertEqual(self.filter_names(matcher), ['Bar.py'])
+
+    def test_cached_matchers(self):
+        self.assertIs(self.matcher(['a*', 'b*']), self.matcher(('a*', 'b*')))
+
+    def test_bytes_matcher(self):
+        names = ['späm', 'spam.py', 'häm', 'eggs.py', 'spa']
+        encoded = [name.encode('utf-8') for name in names]
+        for include, exclude in [
+            ('sp*', None), (['*m', 'eggs.py'], None), (None, '*.py'),
+            ('*ä*', 's*'), ('sp*m*', None)
+        ]:
+            matcher = self.matcher(include, exclude)
+            bytes_matcher = matcher.get_bytes_matcher('utf-8')
+            self.assertIsNotNone(bytes_matcher)
+            result = [
+                name.decode('utf-8') for name in bytes_matcher.filter(encoded)
+            ]
+            self.assertEqual(result, list(matcher.filter(names)))
+
+    def test_unsafe_bytes_matcher(self):
+        for matcher, encoding in [
+            (self.matcher('sp?m'), 'utf-8'),
+            (self.matcher('[sh]*'), 'utf-8'),
+            (self.matcher('sp*', ignore_case=True), 'utf-8'),
+            (self.matcher('sp', use_regex=True), 'utf-8'),
+            (self.matcher('sp*'), 'utf-16'),
+            (self.matcher('spä*'), 'ascii'),
+        ]:
+            self.assertIsNone(matcher.get_bytes_matcher(encoding))
+        matcher = self.matcher('sp?m').get_bytes_matcher('latin-1')
+        self.assertEqual(list(matcher.filter([b'sp\xe4m'])), [b'sp\xe4m'])
+
+
+class GetColumnsTest(unittest.TestCase):
+    def setUp(self):
+        self.lines = ['a 1 x 10', 'b 2', 'c 3 y 30']
+
+    def get_columns(self, indices, lines=None, **options):
+        lines = self.lines if lines is None else lines
+        return list(shcol.helpers.get_columns(indices, lines, **options))
+
+    def test_multiple_columns(self):
+        result = self.get_columns([3, 0], short_lines='skip')
+        self.assertEqual(result, [('10', 'a'), ('30', 'c')])
+
+    def test_single_column(self):
+        result = self.get_columns([1])
+        self.assertEqual(result, [('1',), ('2',), ('3',)])
+
+    def test_separator(self):
+        lines = ['a,1 2,x', 'b,,y']
+        result = self.get_columns([1, 2], lines, sep=',')
+        self.assertEqual(result, [('1 2', 'x'), ('', 'y')])
+
+    def test_short_lines(self):
+        with self.assertRaises(IndexError):
+            self.get_columns([0, 2])
+        result = self.get_columns([0, 2], short_lines='pad', fill_value='-')
+        self.assertEqual(result, [('a', 'x'), ('b', '-'), ('c', 'y')])
+        result = shcol.helpers.get_column(2, self.lines, short_lines='skip')
+        self.assertEqual(list(result), ['x', 'y'])
+        with self.assertRaises(ValueError):
+            self.get_columns([0], short_lines='ignore')
+
+    def test_no_indices(self):
+        with self.assertRaises(ValueError):
+            self.get_columns([])
+
+
+class ReadLinesTest(unittest.TestCase):
+    def setUp(self):
+        self.text = 'spam  \n\nhäm\r\n   \neggs'
+        self.expected = ['spam', 'häm', 'eggs']
+
+    def read_lines(self, source, **options):
+        return list(shcol.helpers.read_lines(source, **options))
+
+    def test_text_stream(self):
+        result = self.read_lines(io.StringIO(self.text), block_size=3)
+        self.assertEqual(result, self.expected)
+
+    def test_decoding(self):
+        for block_size in (1, 2, 5, 1024):
+            stream = io.BytesIO(self.text.encode('utf-8'))
+            result = self.read_lines(
+                stream, encoding='utf-8', block_size=block_size
+            )
+            self.assertEqual(result, self.expected)
+
+    def test_raw_bytes(self):
+        stream = io.BytesIO(self.text.encode('utf-8'))
+        result = self.read_lines(stream, block_size=4)
+        self.assertEqual(result, [s.encode('utf-8') for s in self.expected])
+
+    def test_same_as_get_lines(self):
+        expected = list(shcol.helpers.get_lines(io.StringIO(self.text)))
+        self.assertEqual(self.read_lines(io.StringIO(self.text)), expected)
+        expected = list(
+            shcol.helpers.get_lines(io.StringIO(self.text), skip_emtpy=False)
+        )
+        result = self.read_lines(io.StringIO(self.text), skip_empty=False)
+        self.assertEqual(result, expected)
+
+    def test_chars(self):
+        result = self.read_lines(io.StringIO(self.text), chars=' ')
+        self.assertEqual(result, ['spam', 'häm\r', 'eggs'])
+
+    def test_empty_input(self):
+        self.assertEqual(self.read_lines(io.BytesIO()), [])
+
+    def test_unicode_whitespace(self):
+        text = 'spam\u00a0\n\u3000\neggs\x0c\n'
+        expected = ['spam\u00a0', '\u3000', 'eggs']
+        self.assertEqual(self.read_lines(io.StringIO(text)), expected)
+        stream = io.BytesIO(text.encode('utf-8'))
+        result = self.read_lines(stream, encoding='utf-8', block_size=2)
+        self.assertEqual(result, expected)
+
+    def test_long_record(self):
+        text = 'spam\n' + 'x' * 100 + '\nham\n' + 'y' * 50
+        result = self.read_lines(io.StringIO(text), block_size=7)
+        self.assertEqual(result, ['spam', 'x' * 100, 'ham', 'y' * 50])
+
+    def test_read_records(self):
+        data = 'spam \n\0\0häm\0eggs'
+        result = list(shcol.helpers.read_records(io.StringIO(data)))
+        self.assertEqual(result, ['spam \n', 'häm', 'eggs'])
+        stream = io.BytesIO(data.encode('utf-8'))
+        result = shcol.helpers.read_records(
+            stream, encoding='utf-8', skip_empty=False, block_size=3
+        )
+        self.assertEqual(list(result), ['spam \n', '', 'häm', 'eggs'])
+
+    def test_mapped_file(self):
+        text = self.text + '\n' + 'x' * 20 + '\nlast'
+        expected = self.expected + ['x' * 20, 'last']
+        fd, path = tempfile.mkstemp()
+        try:
+            with os.fdopen(fd, 'wb') as stream:
+                stream.write(text.encode('utf-8'))
+            with open(path, 'rb') as stream:
+                mapped = shcol.helpers.map_file(stream)
+                self.assertIsNotNone(mapped)
+                mapped[0].close()
+                result = self.read_lines(
+                    stream, encoding='utf-8', block_size=8
+                )
+                self.assertEqual(result, expected)
+            with open(path, 'rb') as stream:
+                stream.readline()
+                result = self.read_lines(stream, block_size=8)
+                expected = [line.encode('utf-8') for line in expected[1:]]
+                self.assertEqual(result, expected)
+        finally:
+            os.remove(path)
+        self.assertIsNone(shcol.helpers.map_file(io.BytesIO(b'spam')))
+
+
+class ItemStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.items = ['spam', '', 'häm', b'eggs']
+        self.store = shcol.helpers.ItemStore(self.items)
+        self.addCleanup(self.store.close)
+
+    def test_items(self):
+        expected = ['spam', '', 'häm', 'eggs']
+        self.assertEqual(len(self.store), 4)
+        self.assertEqual(list(self.store), expected)
+        self.assertEqual(self.store[-2], 'häm')
+        self.assertEqual(self.store[1::2], ['', 'eggs'])
+        self.assertEqual(list(self.store.item_widths), [4, 0, 3, 4])
+        with self.assertRaises(IndexError):
+            self.store[4]
+
+    def test_append_after_reading(self):
+        self.store.append('ham')
+        self.assertEqual(self.store[4], 'ham')
+        with self.assertRaises(ValueError):
+            self.store.append('eggs')
+
+    def test_columnize(self):
+        expected = shcol.columnize(self.items * 10, line_width=20)
+        store = shcol.helpers.ItemStore(self.items * 10)
+        self.addCleanup(store.close)
+        self.assertEqual(shcol.columnize(store, line_width=20), expected)
+
+    def test_empty_store(self):
+        with shcol.helpers.ItemStore() as store:
+            self.assertEqual(list(store), [])
+            self.assertEqual(shcol.columnize(store, line_width=80), '')
+
+
+class PackedItemsTest(unittest.TestCase):
+    def setUp(self):
+        self.items = ['spam', '', 'häm', 'eggs']
+        self.packed = shcol.helpers.PackedItems(self.items)
+
+    def test_items(self):
+        self.assertEqual(len(self.packed), 4)
+        self.assertEqual(list(self.packed), self.items)
+        self.assertEqual(self.packed.arena, 'spamhämeggs')
+        self.assertEqual(self.packed[-2], 'häm')
+        self.assertEqual(self.packed[::2], ['spam', 'häm'])
+        self.assertEqual(list(self.packed.item_widths), [4, 0, 3, 4])
+        with self.assertRaises(IndexError):
+            self.packed[4]
+
+    def test_columnize(self):
+        expected = shcol.columnize(self.items * 10, line_width=20)
+        packed = shcol.helpers.PackedItems(self.items * 10)
+        self.assertEqual(shcol.columnize(packed, line_width=20), expected)
+
+    def test_read_packed_lines(self):
+        stream = io.BytesIO('spam\n\nhäm  \neggs'.encode('utf-8'))
+        packed = shcol.helpers.read_packed_lines(
+            stream, encoding='utf-8', block_size=3
+        )
+        self.assertEqual(list(packed), ['spam', 'häm', 'eggs'])
+        self.assertEqual(len(shcol.helpers.read_packed_lines(io.BytesIO())), 0)
+
+
+    def test_unsupported_platform(self):
+        misc = shcol.helpers.misc
+        self.addCleanup(setattr, misc, 'UINT64_TYPECODE', misc.UINT64_TYPECODE)
+        misc.UINT64_TYPECODE = None
+        with self.assertRaises(NotImplementedError):
+            shcol.helpers.PackedItems(self.items)
+        stream = io.BytesIO(b'spam\nham\n')
+        with self.assertRaises(NotImplementedError):
+            shcol.helpers.read_packed_lines(stream)
+
+
+class IndexedLinesTest(unittest.TestCase):
+    def setUp(self):
+        self.text = 'spam  \n\nhäm\r\n' + 'x' * 30 + '\nspam\neggs'
+        fd, self.path = tempfile.mkstemp()
+        with os.fdopen(fd, 'wb') as stream:
+            stream.write(self.text.encode('utf-8'))
+        self.addCleanup(os.remove, self.path)
+
+    def index_lines(self, **options):
+        with open(self.path, 'rb') as stream:
+            return shcol.helpers.IndexedLines(stream, 'utf-8', **options)
+
+    def test_lines(self):
+        expected = ['spam', 'häm', 'x' * 30, 'spam', 'eggs']
+        for block_size in (4, 16, 1024):
+            with self.index_lines(block_size=block_size) as lines:
+                self.assertEqual(list(lines), expected)
+                self.assertEqual(lines[1::2], ['häm', 'spam'])
+                self.assertEqual(
+                    list(lines.item_widths), [len(s) for s in expected]
+                )
+
+    def test_unicode_whitespace(self):
+        with open(self.path, 'wb') as stream:
+            stream.write('spam\u00a0\n\u3000\neggs \n'.encode('utf-8'))
+        with self.index_lines() as lines:
+            self.assertEqual(list(lines), ['spam\u00a0', '\u3000', 'eggs'])
+            self.assertEqual(list(lines.item_widths), [5, 1, 4])
+
+    def test_pattern_and_unique(self):
+        with self.index_lines(pattern='*m', make_unique=True) as lines:
+            self.assertEqual(list(lines), ['spam', 'häm'])
+
+    def test_non_regular_file(self):
+        with self.assertRaises(ValueError):
+            shcol.helpers.IndexedLines(io.BytesIO(b'spam'))
+
+
+class TerminalWidthCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.termwidth = shcol.helpers.termwidth
+        self.calls = []
+        original_impl = self.termwidth.terminal_width_impl
+        def fake_impl(fd):
+            self.calls.append(fd)
+            return self.termwidth.make_width_info(42 + len(self.calls))
+        self.termwidth.terminal_width_impl = fake_impl
+        self.addCleanup(
+            setattr, self.termwidth, 'terminal_width_impl', original_impl
+        )
+        original_is_terminal = self.termwidth.is_terminal
+        self.termwidth.is_terminal = lambda stream: True
+        self.addCleanup(
+            setattr, self.termwidth, 'is_terminal', original_is_terminal
+        )
+        shcol.helpers.clear_terminal_width_cache()
+        self.addCleanup(shcol.helpers.clear_terminal_width_cache)
+        self.stream = io.BytesIO()
+        self.stream.fileno = lambda: 1
+
+        if hasattr(signal, 'SIGWINCH'):
+            handler = signal.getsignal(signal.SIGWINCH)
+            self.addCleanup(signal.signal, signal.SIGWINCH, handler)
+
+    def get_widths(self, num_calls=2):
+        return [
+            shcol.helpers.get_terminal_width_info(self.stream).window_width
+            for _ in range(num_calls)
+        ]
+
+    @unittest.skipUnless(hasattr(signal, 'SIGWINCH'), 'requires SIGWINCH')
+    def test_cache(self):
+        self.assertTrue(shcol.helpers.install_sigwinch_handler())
+        self.assertEqual(self.get_widths(), [43, 43])
+        self.assertEqual(self.calls, [1])
+        self.termwidth.handle_sigwinch(signal.SIGWINCH, None)
+        self.assertEqual(self.get_widths(), [44, 44])
+
+    @unittest.skipUnless(hasattr(signal, 'SIGWINCH'), 'requires SIGWINCH')
+    def test_automatic_handler(self):
+        signal.signal(signal.SIGWINCH, signal.SIG_DFL)
+        self.assertEqual(self.get_widths(), [43, 43])
+        self.assertTrue(self.termwidth.is_sigwinch_handler_active())
+
+    @unittest.skipUnless(hasattr(signal, 'SIGWINCH'), 'requires SIGWINCH')
+    def test_no_cache_with_other_handler(self):
+        handler = lambda signum, frame: None
+        signal.signal(signal.SIGWINCH, handler)
+        self.assertEqual(self.get_widths(), [43, 44])
+        self.assertIs(signal.getsignal(signal.SIGWINCH), handler)
+
+    @unittest.skipUnless(hasattr(signal, 'SIGWINCH'), 'requires SIGWINCH')
+    def test_replaced_handler(self):
+        shcol.helpers.install_sigwinch_handler()
+        self.assertEqual(self.get_widths(), [43, 43])
+        signal.signal(signal.SIGWINCH, lambda signum, frame: None)
+        self.assertEqual(self.get_widths(), [44, 45])
+
+    @unittest.skipUnless(hasattr(signal, 'SIGWINCH'), 'requires SIGWINCH')
+    def test_no_handler_from_other_threads(self):
+        signal.signal(signal.SIGWINCH, signal.SIG_DFL)
+        results = []
+        install = shcol.helpers.install_sigwinch_handler
+        thread = threading.Thread(
+            target=lambda: results.extend([install(), self.get_widths()])
+        )
+        thread.start()
+        thread.join()
+        self.assertEqual(results, [False, [43, 44]])
+        self.assertIs(signal.getsignal(signal.SIGWINCH), signal.SIG_DFL)
+
+
+class LazyNamesTest(unittest.TestCase):
+    def test_lazy_names(self):
+        for module_name, names in shcol.helpers.LAZY_NAMES.items():
+            module = getattr(shcol.helpers, module_name)
+            self.assertEqual(names, module.__all__)
+            for name in names:
+                value = getattr(shcol.helpers, name)
+                self.assertIs(value, getattr(module, name))
+        self.assertIn('ItemStore', dir(shcol.helpers))
+        with self.assertRaises(AttributeError):
+            shcol.helpers.spam
+
+    def test_lazy_attrs(self):
+        for name, (module_name, attr_name) in shcol.LAZY_ATTRS.items():
+            module = getattr(shcol, module_name)
+            value = getattr(shcol, name)
+            if attr_name is None:
+                self.assertIs(value, module)
+            else:
+                self.assertIs(value, getattr(module, attr_name))
+
+
+class StatsCollectorTest(unittest.TestCase):
+    def test_nested_stages(self):
+        stats = shcol.helpers.StatsCollector()
+        with stats.stage('outer'):
+            with stats.stage('inner'):
+                pass
+        stats.stop()
+        results = stats.get_results()
+        self.assertEqual(list(results['stages']), ['outer', 'inner'])
+        self.assertLessEqual(
+            sum(results['stages'].values()), results['total_seconds']
+        )
+
+    def test_run_stage(self):
+        stats = shcol.helpers.StatsCollector()
+        result = stats.run_stage('count', iter, [1, 2, 3])
+        self.assertEqual(list(result), [1, 2, 3])
+        self.assertIn('count', stats.get_results()['stages'])
+        self.assertEqual(
+            shcol.helpers.run_stage('count', sorted, [2, 1]), [1, 2]
+        )
+
+    def test_collecting_stats(self):
+        self.assertIsNone(shcol.helpers.get_stats_collector())
+        with shcol.helpers.collecting_stats() as stats:
+            self.assertIs(shcol.helpers.get_stats_collector(), stats)
+            shcol.columnize(['spam', 'ham', 'eggs'], line_width=80)
+        self.assertIsNone(shcol.helpers.get_stats_collector())
+        counters = stats.get_results()['counters']
+        self.assertEqual(counters['items'], 3)
+        self.assertEqual(counters['characters'], 11)
+        self.assertGreater(counters['layout_candidates'], 0)
+        self.assertIn('layout', stats.format())
+
+
+class TracerTest(unittest.TestCase):
+    class RecordingTracer(shcol.helpers.Tracer):
+        def __init__(self):
+            self.events = []
+
+        def layout_candidate(self, column_widths, num_lines, fits):
+            self.events.append(('layout', len(column_widths), fits))
+
+        def row_rendered(self, lineno, line):
+            self.events.append(('row', lineno, line))
+
+        def line_break_added(self, lineno, wrapped):
+            self.events.append(('break', lineno, wrapped))
+
+    def test_no_tracer(self):
+        self.assertIsNone(shcol.helpers.get_tracer())
+
+    def test_hooks(self):
+        tracer = self.RecordingTracer()
+        with shcol.helpers.using_tracer(tracer):
+            self.assertIs(shcol.helpers.get_tracer(), tracer)
+            result = shcol.columnize(['spam', 'ham', 'eggs'], line_width=10)
+        self.assertIsNone(shcol.helpers.get_tracer())
+        self.assertEqual(result, 'spam  eggs\nham')
+        self.assertEqual(tracer.events, [
+            ('layout', 2, True),
+            ('row', 1, 'spam  eggs'), ('break', 1, True),
+            ('row', 2, 'ham'), ('break', 2, False),
+        ])
+
+    def test_logging_tracer(self):
+        import logging
+        messages = []
+        class Handler(logging.Handler):
+            def emit(self, record):
+                messages.append(record.getMessage())
+        logger = logging.getLogger('shcol-test')
+        logger.addHandler(Handler())
+        logger.setLevel(logging.DEBUG)
+        tracer = shcol.helpers.LoggingTracer(logger)
+        with shcol.helpers.using_tracer(tracer):
+            shcol.columnize(['spam', 'ham'], line_width=80)
+        self.assertIn('adding linesep to line 1', messages)
@@ -7,6 +7,8 @@
 import functools
 import os
 import shcol
+import shutil
+import tempfile
 import unittest
 
 class PrintFunctionTestCase(unittest.TestCase):
@@ -69,3 +71,166 @@ class PrintFilenamesTest(PrintFunctionTestCase):
         expected = shcol.columnize(filenames, line_width=80, sort_items=True)
         self.print_filenames()
         self.assertEqual(expected, self.get_output())
+
+    def make_tree(self):
+        path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, path)
+        for dirname in ('spam', '.hidden_dir'):
+            os.mkdir(os.path.join(path, dirname))
+        for filename in ('ham', '.hidden_file'):
+            open(os.path.join(path, filename), 'w').close()
+        return path
+
+    def get_filenames(self, path, **options):
+        return sorted(shcol.helpers.get_filenames(path, **options))
+
+    def test_hide_dotted(self):
+        path = self.make_tree()
+        self.assertEqual(
+            self.get_filenames(path),
+            ['.hidden_dir', '.hidden_file', 'ham', 'spam']
+        )
+        self.assertEqual(
+            self.get_filenames(path, hide_dotted=True), ['ham', 'spam']
+        )
+
+    def test_dir_suffix(self):
+        path = self.make_tree()
+        self.assertEqual(
+            self.get_filenames(path, hide_dotted=True, dir_suffix='/'),
+            ['ham', 'spam/']
+        )
+        pattern = os.path.join(path, '*')
+        self.assertEqual(
+            self.get_filenames(pattern, dir_suffix='/'), ['ham', 'spam/']
+        )
+        pattern = os.path.join(path, '.*')
+        self.assertEqual(
+            self.get_filenames(pattern, dir_suffix='/'),
+            ['.hidden_dir/', '.hidden_file']
+        )
+        self.assertEqual(
+            self.get_filenames(pattern, hide_dotted=True, dir_suffix='/'), []
+        )
+        self.print_filenames(path, hide_dotted=True, dir_suffix='/')
+        self.assertEqual(self.get_output(), 'ham  spam/')
+
+    def test_no_directory(self):
+        path = self.make_tree()
+        for name in ('ham', 'nonexistent'):
+            filenames = shcol.helpers.get_filenames(os.path.join(path, name))
+            self.assertEqual(list(filenames), [])
+
+    def test_get_listings(self):
+        path = self.make_tree()
+        os.mkdir(os.path.join(path, 'spam', 'eggs'))
+        listings = shcol.helpers.get_listings(
+            [path, os.path.join(path, 'spam')], recursive=True,
+            hide_dotted=True, max_workers=4
+        )
+        self.assertEqual([
+            (path, ['ham', 'spam']),
+            (os.path.join(path, 'spam'), ['eggs']),
+            (os.path.join(path, 'spam', 'eggs'), []),
+            (os.path.join(path, 'spam'), ['eggs']),
+            (os.path.join(path, 'spam', 'eggs'), []),
+        ], [(lst.path, sorted(lst.names)) for lst in listings])
+
+    def test_print_multiple_paths(self):
+        path = self.make_tree()
+        open(os.path.join(path, 'spam', 'bacon'), 'w').close()
+        self.print_filenames(
+            [path, os.path.join(path, 'spam')], hide_dotted=True
+        )
+        expected = '{}:\nham  spam\n\n{}:\nbacon'.format(
+            path, os.path.join(path, 'spam')
+        )
+        self.assertEqual(self.get_output(), expected)
+
+    def test_shared_layout(self):
+        path = self.make_tree()
+        open(os.path.join(path, 'spam', 'bacon'), 'w').close()
+        self.print_filenames(
+            path, recursive=True, hide_dotted=True, shared_layout=True
+        )
+        expected = '{}:\nham    spam\n\n{}:\nbacon'.format(
+            path, os.path.join(path, 'spam')
+        )
+        self.assertEqual(self.get_output(), expected)
+
+    def test_listing_cache(self):
+        path = self.make_tree()
+        cache = shcol.helpers.ListingCache(max_entries=1)
+        names = cache.get_sorted_filenames(path, hide_dotted=True)
+        self.assertEqual(list(names), ['ham', 'spam'])
+        self.assertEqual(names.item_widths, [3, 4])
+        self.assertIs(cache.get_sorted_filenames(path, hide_dotted=True), names)
+        self.assertEqual(len(cache), 1)
+        # Touching the directory invalidates the cached listing
+        open(os.path.join(path, 'bacon'), 'w').close()
+        stat_result = os.stat(path)
+        os.utime(path, (stat_result.st_atime, stat_result.st_mtime + 10))
+        names = cache.get_sorted_filenames(path, hide_dotted=True)
+        self.assertEqual(list(names), ['bacon', 'ham', 'spam'])
+        self.print_filenames(path, hide_dotted=True, cache=cache)
+        self.assertEqual(self.get_output(), 'bacon  ham  spam')
+        cache.get_filenames(os.path.join(path, 'spam'))
+        self.assertEqual(len(cache), 1)
+
+    def make_sized_tree(self):
+        path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, path)
+        for i, (name, size) in enumerate([('b', 10), ('a', 2000), ('c', 10)]):
+            filename = os.path.join(path, name)
+            with open(filename, 'wb') as f:
+                f.write(size * b'x')
+            os.utime(filename, (1000000 + i, 1000000 + i))
+        return path
+
+    def test_get_file_infos(self):
+        path = self.make_sized_tree()
+        infos = shcol.helpers.get_file_infos(path, max_workers=2)
+        self.assertEqual(
+            sorted((info.name, info.size) for info in infos),
+            [('a', 2000), ('b', 10), ('c', 10)]
+        )
+        for sort_by, expected in [
+            ('name', 'abc'), ('size', 'abc'), ('mtime', 'cab')
+        ]:
+            sorted_infos = shcol.helpers.sort_file_infos(infos, sort_by)
+            result = ''.join(info.name for info in sorted_infos)
+            self.assertEqual(result, expected)
+        with self.assertRaises(ValueError):
+            shcol.helpers.sort_file_infos(infos, 'bogus')
+
+    def test_vanished_file(self):
+        listing = shcol.helpers.listing
+        if listing.scandir is None:
+            self.skipTest('requires `os.scandir()`')
+        tree_path = self.make_sized_tree()
+        class VanishedEntry(object):
+            name = 'gone'
+            path = os.path.join(tree_path, 'gone')
+            def stat(self):
+                raise OSError(2, 'No such file or directory')
+        original_scandir = listing.scandir
+        listing.scandir = lambda path: (
+            list(original_scandir(path)) + [VanishedEntry()]
+        )
+        self.addCleanup(setattr, listing, 'scandir', original_scandir)
+        infos = shcol.helpers.get_file_infos(tree_path, max_workers=2)
+        self.assertEqual(sorted(info.name for info in infos), ['a', 'b', 'c'])
+
+    def test_format_size(self):
+        for num_bytes, expected in [
+            (0, '0'), (1023, '1023'), (1024, '1.0K'), (3584, '3.5K'),
+            (12 * 1024 ** 2, '12M'), (5 * 1024 ** 5, '5.0P')
+        ]:
+            self.assertEqual(shcol.helpers.format_size(num_bytes), expected)
+
+    def test_show_size(self):
+        path = self.make_sized_tree()
+        self.print_filenames(path, sort_by='mtime', show_size=True)
+        self.assertEqual(self.get_output(), 'c  10\na  2.0K\nb  10')
+        with self.assertRaises(ValueError):
+            self.print_filenames([path], show_size=True)
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2013-2016, Sebastian Linke
+
+# Released under the Simplified BSD license
+# (see LICENSE file for details).
+
+from __future__ import unicode_literals
+
+import shcol
+import unittest
+
+if shcol.config.PY_VERSION >= (3, 3):
+    from benchmarks import oracle
+
+
+class SpacingIgnoringCalculator(shcol.core.columncalc.ColumnWidthCalculator):
+    def fits_in_line(self, column_widths):
+        return sum(column_widths) <= self.line_width
+
+
+@unittest.skipUnless(shcol.config.PY_VERSION >= (3, 3), 'requires Python 3.3')
+class OracleTest(unittest.TestCase):
+    def register(self, name, kind, func):
+        if kind == 'calculator':
+            oracle.register_calculator(name, func)
+        else:
+            oracle.register_renderer(name, func)
+        self.addCleanup(oracle.unregister, name)
+
+    def test_registered_engines(self):
+        for result in oracle.run(2000, seed=1):
+            self.assertEqual(result['status'], 'ok', result)
+            self.assertEqual(result['num_cases'], 2000)
+
+    def test_failing_calculator(self):
+        self.register('broken', 'calculator', SpacingIgnoringCalculator)
+        result = oracle.check_engine('broken', 2000, seed=1)
+        self.assertEqual(result['status'], 'failed')
+        case = result['minimal_case']
+        self.assertLessEqual(len(case['item_widths']), 3)
+        self.assertGreater(case['spacing'], 0)
+        self.assertNotEqual(result['outcome'], result['expected'])
+
+    def test_renderers(self):
+        self.register('same', 'renderer', oracle.render_reference)
+        self.register(
+            'wide', 'renderer',
+            lambda items, spacing, line_width: shcol.columnize(
+                items, spacing=spacing + 1, line_width=line_width
+            )
+        )
+        results = oracle.run(200, names=['same', 'wide'])
+        self.assertEqual(
+            [result['status'] for result in results], ['ok', 'failed']
+        )
+
+    def test_shrink(self):
+        case = {
+            'item_widths': [3, 5, 7, 5, 9], 'spacing': 3, 'line_width': 80,
+            'num_columns': 4, 'allow_exceeding': True, 'min_shrink_width': 6,
+        }
+        is_failing = lambda case: 5 in case['item_widths']
+        self.assertEqual(oracle.shrink(case, is_failing), {
+            'item_widths': [5], 'spacing': 0, 'line_width': 1,
+            'num_columns': None, 'allow_exceeding': False,
+            'min_shrink_width': None,
+        })
@@ -4,11 +4,30 @@
 # Released under the Simplified BSD license
 # (see LICENSE file for details).
 
+import io
 import os
 import shcol
+import shutil
+import signal
+import socket
 import subprocess
+import sys
+import tempfile
+import time
 import unittest
 
+def get_subprocess_env(**variables):
+    """
+    Return a copy of the environment with `shcol` on the module search path
+    and with the given `variables` set.
+    """
+    package_dir = os.path.dirname(os.path.dirname(shcol.__file__))
+    env = dict(os.environ, **variables)
+    env['PYTHONPATH'] = os.pathsep.join(
+        [package_dir] + env.get('PYTHONPATH', '').split(os.pathsep)
+    )
+    return env
+
 class ScriptTest(unittest.TestCase):
     def setUp(self):
         self.starter = shcol.config.STARTER
@@ -28,3 +47,212 @@ class ScriptTest(unittest.TestCase):
         parser = shcol.cli.ArgumentParser('shcol', shcol.__version__)
         result = self.check_output([self.starter, '--help'])
         self.assertEqual(result, parser.format_help())
+
+
+@unittest.skipIf(shcol.config.PY_VERSION < (3, 7), 'requires PEP 562')
+class ImportsTest(unittest.TestCase):
+    # Timings are measured by `benchmarks.imports`
+    SLOW_MODULES = [
+        'argparse', 'ctypes', 'hashlib', 'locale', 'logging', 'tempfile',
+        'shcol.cli', 'shcol.highlevel', 'shcol.helpers.termwidth'
+    ]
+
+    def get_module_names(self, code):
+        code += '\nimport sys; print("\\n".join(sys.modules))'
+        output = subprocess.check_output(
+            [sys.executable, '-c', code], env=get_subprocess_env(),
+            universal_newlines=True
+        )
+        return set(output.splitlines())
+
+    def get_imports(self, code):
+        """
+        Return the names of the modules imported by running `code`. Modules
+        that are imported at interpreter startup are not included.
+        """
+        return self.get_module_names(code) - self.get_module_names('')
+
+    def test_import(self):
+        imports = self.get_imports('import shcol')
+        self.assertIn('shcol', imports)
+        for name in self.SLOW_MODULES:
+            self.assertNotIn(name, imports)
+
+    def test_columnize_imports(self):
+        code = 'import shcol; shcol.columnize(["spam"], line_width=80)'
+        imports = self.get_imports(code)
+        for name in ['argparse', 'ctypes', 'logging', 'shcol.cli']:
+            self.assertNotIn(name, imports)
+
+    def test_cli_startup(self):
+        code = 'import shcol; shcol.cli.main(["-w80", "spam", "ham"])'
+        imports = self.get_imports(code)
+        self.assertIn('shcol.cli', imports)
+        self.assertNotIn('ctypes', imports)
+
+
+@unittest.skipUnless(
+    hasattr(socket, 'AF_UNIX') and hasattr(os, 'fork'), 'requires Unix'
+)
+class DaemonTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.socket_path = os.path.join(directory, 'shcol.sock')
+        # The daemon decodes the input with the encoding of its stdout
+        self.env = get_subprocess_env(
+            SHCOL_SOCKET=self.socket_path, PYTHONIOENCODING='utf-8'
+        )
+        self.starter = shcol.config.STARTER
+        if not os.path.isfile(self.starter):
+            self.starter = os.path.join('..', self.starter)
+        process = subprocess.Popen(
+            [sys.executable, '-m', 'shcol', '--serve'], env=self.env
+        )
+        self.addCleanup(process.wait)
+        self.addCleanup(process.send_signal, signal.SIGINT)
+        for _ in range(100):
+            sock = shcol.client.connect(self.socket_path)
+            if sock is not None:
+                sock.close()
+                break
+            time.sleep(.05)
+        else:
+            self.fail('daemon did not start')
+
+    def run_client(self, args, stdin_data=b''):
+        sock = shcol.client.connect(self.socket_path)
+        stdout, stderr = io.BytesIO(), io.BytesIO()
+        exit_code = shcol.client.run(
+            sock, args, io.BytesIO(stdin_data), stdout, stderr
+        )
+        return (
+            exit_code, stdout.getvalue().decode('utf-8'),
+            stderr.getvalue().decode('utf-8')
+        )
+
+    def test_item_args(self):
+        items = ['spam', 'ham', 'eggs']
+        result = self.run_client(['-w80'] + items)
+        expected = shcol.columnize(items, line_width=80) + '\n'
+        self.assertEqual(result, (0, expected, ''))
+
+    def test_stdin(self):
+        # The client requests the encoding of its stdout for the output
+        self.addCleanup(setattr, sys, 'stdout', sys.stdout)
+        sys.stdout = io.TextIOWrapper(io.BytesIO(), encoding='utf-8')
+        result = self.run_client(['-w80', '-S'], 'späm\nham\n'.encode('utf-8'))
+        self.assertEqual(result, (0, 'ham  späm\n', ''))
+
+    def test_error(self):
+        exit_code, output, error = self.run_client(['-c', 'x'])
+        self.assertEqual(exit_code, 2)
+        self.assertEqual(output, '')
+        self.assertIn('invalid num value', error)
+
+    def test_refused(self):
+        sock = shcol.client.connect(self.socket_path)
+        self.assertIsNone(shcol.client.run(sock, ['--serve']))
+
+    def test_script(self):
+        args = [self.starter, '-w80', 'spam', 'ham']
+        result = subprocess.check_output(
+            args, env=self.env, universal_newlines=True
+        )
+        self.assertEqual(result, 'spam  ham\n')
+
+
+@unittest.skipUnless(
+    hasattr(socket, 'AF_UNIX') and hasattr(os, 'fork'), 'requires Unix'
+)
+class DaemonSocketTest(unittest.TestCase):
+    def setUp(self):
+        from shcol import daemon
+        self.daemon_class = daemon.Daemon
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.socket_path = os.path.join(directory, 'shcol.sock')
+
+    def test_left_over_socket(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.bind(self.socket_path)
+        sock.close()
+        daemon = self.daemon_class(self.socket_path)
+        daemon.server_close()
+        self.assertFalse(os.path.exists(self.socket_path))
+
+    def test_no_socket(self):
+        with open(self.socket_path, 'w') as stream:
+            stream.write('spam')
+        with self.assertRaises(IOError):
+            self.daemon_class(self.socket_path)
+        self.assertTrue(os.path.isfile(self.socket_path))
+
+
+@unittest.skipUnless(hasattr(socket, 'socketpair'), 'requires socketpair()')
+class ClientTest(unittest.TestCase):
+    def run_client(self, frames):
+        """
+        Run the client against a fake daemon that sends `frames` and then
+        closes its side of the connection.
+        """
+        sock, daemon_sock = socket.socketpair()
+        self.addCleanup(daemon_sock.close)
+        for kind, payload in frames:
+            daemon_sock.sendall(shcol.client.HEADER.pack(kind, len(payload)))
+            daemon_sock.sendall(payload)
+        daemon_sock.shutdown(socket.SHUT_WR)
+        self.stdout, self.stderr = io.BytesIO(), io.BytesIO()
+        exit_code = shcol.client.run(
+            sock, ['spam'], io.BytesIO(), self.stdout, self.stderr
+        )
+        return exit_code, self.stdout.getvalue(), self.stderr.getvalue()
+
+    def test_exit(self):
+        frames = [(shcol.client.STDOUT, b'spam\n'), (shcol.client.EXIT, b'0')]
+        self.assertEqual(self.run_client(frames), (0, b'spam\n', b''))
+
+    def test_lost_before_answer(self):
+        self.assertEqual(self.run_client([]), (None, b'', b''))
+
+    def test_lost_after_output(self):
+        with self.assertRaises(SystemExit) as context:
+            self.run_client([(shcol.client.STDOUT, b'spam\n')])
+        self.assertEqual(context.exception.code, 1)
+        self.assertEqual(self.stdout.getvalue(), b'spam\n')
+        self.assertIn(b'lost connection', self.stderr.getvalue())
+
+
+@unittest.skipUnless(hasattr(os, 'openpty'), 'requires a pseudo terminal')
+class ClientTerminalWidthTest(unittest.TestCase):
+    def open_terminal(self, width):
+        import fcntl
+        import struct
+        import termios
+        master_fd, slave_fd = os.openpty()
+        self.addCleanup(os.close, master_fd)
+        win_size = struct.pack('HHHH', 24, width, 0, 0)
+        fcntl.ioctl(slave_fd, termios.TIOCSWINSZ, win_size)
+        stream = os.fdopen(slave_fd, 'wb')
+        self.addCleanup(stream.close)
+        return stream
+
+    def test_width(self):
+        stream = self.open_terminal(100)
+        self.assertEqual(shcol.client.get_terminal_width(stream), 100)
+
+    def test_width_via_ioctl(self):
+        # Like on Python 2, which lacks `os.get_terminal_size()`
+        get_terminal_size = getattr(os, 'get_terminal_size', None)
+        if get_terminal_size is not None:
+            del os.get_terminal_size
+            self.addCleanup(setattr, os, 'get_terminal_size', get_terminal_size)
+        stream = self.open_terminal(100)
+        self.assertEqual(shcol.client.get_terminal_width(stream), 100)
+
+    def test_unknown_width(self):
+        stream = self.open_terminal(0)
+        self.assertIsNone(shcol.client.get_terminal_width(stream))
+        sock, daemon_sock = socket.socketpair()
+        self.addCleanup(daemon_sock.close)
+        self.assertIsNone(shcol.client.run(sock, ['spam'], stdout=stream))